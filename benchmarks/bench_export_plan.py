@@ -0,0 +1,223 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'shotgun'))
+
+import export_plan  # noqa: E402
+
+SHOW, SEQ, REV = 'show', 'seq010', 12
+
+
+class fs_probe:
+    """fs_probe counts the filesystem metadata calls made in its block, and
+    adds a latency to each of them to behave like a network filesystem
+    """
+
+    CALLS = ['stat', 'lstat', 'mkdir', 'scandir']
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self.saved = {}
+
+    def __enter__(self) -> 'fs_probe':
+        for name in self.CALLS:
+            self.saved[name] = getattr(os, name)
+            setattr(os, name, self.__wrap(self.saved[name]))
+        return self
+
+    def __exit__(self, *args):
+        for name, fn in self.saved.items():
+            setattr(os, name, fn)
+
+    def __wrap(self, fn: Callable) -> Callable:
+        def call(*args, **kwargs):
+            self.calls += 1
+            if self.latency > 0:
+                time.sleep(self.latency)
+            return fn(*args, **kwargs)
+        return call
+
+
+def make_shots(files: int, shots: int) -> Dict:
+    """make_shots will generate the media objects per shots of a sequence
+    revision, half artworks and half thumbnails, and a quicktime per shot
+
+    Arguments:
+        files {int} -- Number of artworks and thumbnails
+
+        shots {int} -- Number of shots
+
+    Returns:
+        Dict -- Media objects per shots
+    """
+    mo_per_shots = {}
+    panels = files // 2
+    for s in range(shots):
+        mo_per_shots['shot{0:04d}'.format(s * 10)] = {
+            'mov': 100000 + s, 'artwork': [], 'thumbnails': []}
+    names = sorted(mo_per_shots)
+    for pos in range(panels):
+        shot = mo_per_shots[names[pos * shots // panels]]
+        for kind, ext, mo in (('artwork', 'psd', 2 * pos),
+                              ('thumbnails', 'png', 2 * pos + 1)):
+            shot[kind].append({'pos': pos, 'id': 1000 + pos,
+                               'revision_number': 1 + pos % 3,
+                               'name': 'panel.{0}'.format(ext), 'mo': mo})
+    return mo_per_shots
+
+
+def create_folder(path: str):
+    """create_folder will create a folder if it does not exist, as the
+    export did for every folder before the planner
+
+    Arguments:
+        path {str} -- Path to create the folder
+    """
+    if not os.path.exists(path):
+        os.makedirs(path)
+
+
+def legacy(mo_per_shots: Dict, root: str) -> int:
+    """legacy will compute the paths of the export as local_export did
+    before the planner: the folders of the revision, then the folders of
+    every shot, each checked before being created, then the name of every
+    file formatted from scratch
+
+    Arguments:
+        mo_per_shots {Dict} -- Media objects per shots
+
+        root {str} -- Export path
+
+    Returns:
+        int -- Number of files
+    """
+    seq_rev_path = root
+    for p in (SHOW, SEQ, 'v{0}'.format(REV)):
+        seq_rev_path = os.path.join(seq_rev_path, p)
+        create_folder(seq_rev_path)
+    paths = []
+    for shot, mos in mo_per_shots.items():
+        show_path = os.path.join(seq_rev_path, shot)
+        art_path = os.path.join(show_path, 'artwork')
+        thumb_path = os.path.join(show_path, 'thumbnail')
+        for folder in (show_path, art_path, thumb_path):
+            create_folder(folder)
+        paths.append(os.path.join(show_path, '{0}_v{1}_{2}.mov'.format(
+            SEQ, REV, shot)))
+        for kind, base in (('artwork', art_path), ('thumbnails', thumb_path)):
+            for mo in mos[kind]:
+                name = export_plan.image_name(
+                    SHOW, SEQ, REV, mo['pos'], mo['id'],
+                    mo['revision_number'])
+                paths.append(os.path.join(base, name + os.path.splitext(
+                    mo['name'])[1]))
+    return len(paths)
+
+
+def planned(mo_per_shots: Dict, root: str) -> int:
+    """planned will compute the paths of the export with the planner
+
+    Arguments:
+        mo_per_shots {Dict} -- Media objects per shots
+
+        root {str} -- Export path
+
+    Returns:
+        int -- Number of files
+    """
+    plan = export_plan.export_plan(mo_per_shots, root, SHOW, SEQ, REV)
+    plan.create_folders()
+    return len(plan.files)
+
+
+STRATEGIES = {
+    'legacy': legacy,
+    'plan': planned,
+}
+
+
+def run(name: str, mo_per_shots: Dict, root: str, args) -> Dict:
+    """run will time a strategy on a new export tree and on the tree
+    already exported, the tree is removed before every run
+
+    Arguments:
+        name {str} -- Strategy name
+
+        mo_per_shots {Dict} -- Media objects per shots
+
+        root {str} -- Folder of the export trees
+
+        args {Namespace} -- Command line arguments
+
+    Returns:
+        Dict -- Median time and metadata calls, for new and existing trees
+    """
+    results = {}
+    for _ in range(args.runs):
+        export_path = tempfile.mkdtemp(prefix='bench_export_plan_', dir=root)
+        try:
+            for scenario in ('new', 'existing'):
+                with fs_probe(args.fs_latency) as probe:
+                    start = time.perf_counter()
+                    files = STRATEGIES[name](mo_per_shots, export_path)
+                    elapsed = time.perf_counter() - start
+                res = results.setdefault(scenario, {'time': [], 'calls': []})
+                res['time'].append(elapsed)
+                res['calls'].append(probe.calls)
+        finally:
+            shutil.rmtree(export_path, ignore_errors=True)
+    return {scenario: {'files': files,
+                       'median': round(statistics.median(r['time']), 4),
+                       'calls': int(statistics.median(r['calls']))}
+            for scenario, r in results.items()}
+
+
+def parse_cli():
+    parser = argparse.ArgumentParser(
+        description='Compare the folders creation and the file names of a '
+        'local export before and with the export planner')
+    parser.add_argument('--files', type=int, default=10000,
+                        help='Artworks and thumbnails of the sequence '
+                        'revision (default: 10000)')
+    parser.add_argument('--shots', type=int, default=100,
+                        help='Shots of the sequence revision (default: 100)')
+    parser.add_argument('--root', default=tempfile.gettempdir(),
+                        help='Folder the exports are created in, e.g. on a '
+                        'network filesystem (default: the temp folder)')
+    parser.add_argument('--fs-latency', type=float, default=0.0,
+                        help='Seconds added to every stat, mkdir and scandir, '
+                        'to behave like a network filesystem')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Runs per strategy, the median is reported')
+    parser.add_argument('--json', metavar='JSON',
+                        help='Write the results to a JSON file')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_cli()
+    mo_per_shots = make_shots(args.files, args.shots)
+    results = {}
+    for name in STRATEGIES:
+        results[name] = run(name, mo_per_shots, args.root, args)
+        for scenario, res in results[name].items():
+            print('{0:<7s}| {1:<9s}| {2:>6d} files | {3:>8.4f}s | '
+                  '{4:>6d} metadata calls'.format(
+                      name, scenario, res['files'], res['median'],
+                      res['calls']))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
@@ -0,0 +1,233 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'shotgun'))
+
+import flix as flix_api  # noqa: E402
+import handoff  # noqa: E402
+from mock_flix import mock_flix  # noqa: E402
+
+# Errors of a run when the server answers with an injected error
+FAILURES = (handoff.handoff_error, RuntimeError)
+
+
+def noop(*args):
+    pass
+
+
+def suite_media_objects_per_shots(
+        api: handoff.handoff, seq: Dict, work_dir: str) -> Callable:
+    """suite_media_objects_per_shots will get the media objects per shots
+    and export a quicktime per shot
+    """
+    def run():
+        api.get_media_object_per_shots(
+            seq['show_id'], seq['id'], seq['revisions_count'], None, noop)
+    return run
+
+
+def suite_local_export(
+        api: handoff.handoff, seq: Dict, work_dir: str) -> Callable:
+    """suite_local_export will do a local export of a sequence revision,
+    the media objects per shots are retrieved once before the runs
+    """
+    mo_per_shots = api.get_media_object_per_shots(
+        seq['show_id'], seq['id'], seq['revisions_count'], None, noop)
+
+    def run():
+        api.local_export(mo_per_shots, work_dir, 'show', seq['tracking_code'],
+                         seq['revisions_count'], None, noop)
+    return run
+
+
+def suite_hiero_pull(
+        api: handoff.handoff, seq: Dict, work_dir: str) -> Callable:
+    """suite_hiero_pull will do the requests of a Hiero Pull Latest:
+    dialogues, sequence revision (markers), panels and the first
+    thumbnail of every panel.
+    The Hiero client runs on the Python 2 interpreter of Hiero, the same
+    requests are done here with the Python 3 client
+    """
+    flix = api.flix_api
+    show_id, seq_id, rev = seq['show_id'], seq['id'], seq['revisions_count']
+
+    def run():
+        flix.get_dialogues(show_id, seq_id, rev)
+        flix.get_sequence_rev(show_id, seq_id, rev)
+        panels = flix.get_panels(show_id, seq_id, rev)
+        if panels is None:
+            raise RuntimeError('Could not retrieve panels')
+        for p in panels:
+            thumb = p['asset']['media_objects']['thumbnail'][0]
+            flix.download_media_object(
+                os.path.join(work_dir, '{0}_{1}_{2}_.png'.format(
+                    seq['tracking_code'], p['panel_id'],
+                    p['revision_counter'])),
+                thumb['id'])
+    return run
+
+
+SUITES = {
+    'media_objects_per_shots': suite_media_objects_per_shots,
+    'local_export': suite_local_export,
+    'hiero_pull': suite_hiero_pull,
+}
+
+
+def run_suite(server: mock_flix,
+              name: str,
+              runs: int,
+              api: handoff.handoff,
+              seq: Dict) -> Dict:
+    """run_suite will run a suite several times and measure it
+
+    Arguments:
+        server {mock_flix} -- Mock Flix server
+
+        name {str} -- Suite name
+
+        runs {int} -- Number of runs
+
+        api {handoff.handoff} -- Handoff with an authenticated Flix api
+
+        seq {Dict} -- Sequence to use
+
+    Returns:
+        Dict -- Wall times, requests and bytes of the suite, and the runs
+        failed because of the errors injected by the server. The wall times
+        are None when every run failed
+    """
+    times = []
+    failed = 0
+    with tempfile.TemporaryDirectory() as work_dir:
+        # The clients print the errors injected by the server
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn = SUITES[name](api, seq, work_dir)
+        except FAILURES as err:
+            print('{0}: could not prepare the suite: {1}'.format(name, err),
+                  file=sys.stderr)
+            fn, failed = None, runs
+        for _ in range(runs if fn is not None else 0):
+            server.reset_stats()
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    fn()
+            except FAILURES:
+                failed += 1
+                continue
+            times.append(time.perf_counter() - start)
+    stats = server.stats()
+    return {
+        'wall_time_median': (round(statistics.median(times), 4)
+                             if len(times) > 0 else None),
+        'wall_time_min': round(min(times), 4) if len(times) > 0 else None,
+        'failed': failed,
+        'requests': stats['total_requests'],
+        'connections': stats['connections'],
+        'errors': stats['errors'],
+        'bytes': stats['bytes_sent'],
+    }
+
+
+def compare(results: Dict, baseline: Dict):
+    """compare will print the difference of the results with a baseline
+
+    Arguments:
+        results {Dict} -- Results of the suites
+
+        baseline {Dict} -- Baseline of the suites
+    """
+    for name, res in sorted(results['suites'].items()):
+        base = baseline.get('suites', {}).get(name)
+        if (base is None or base['wall_time_median'] is None or
+                res['wall_time_median'] is None):
+            continue
+        delta = ((res['wall_time_median'] - base['wall_time_median']) /
+                 max(base['wall_time_median'], 1e-9) * 100)
+        print('{:<26s}| {:>9.3f}s -> {:>9.3f}s | {:>+8.1f}% | '
+              'requests {} -> {}'.format(
+                  name, base['wall_time_median'], res['wall_time_median'],
+                  delta, base['requests'], res['requests']))
+
+
+def parse_cli():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Flix handoff against a mock Flix server')
+    parser.add_argument('--suites', nargs='*', default=sorted(SUITES),
+                        choices=sorted(SUITES), help='Suites to run')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Runs per suite, the median is reported')
+    parser.add_argument('--panels', type=int, default=100)
+    parser.add_argument('--shots', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds added to every request')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Ratio of requests answered with a 500')
+    parser.add_argument('--render-time', type=float, default=0.0,
+                        help='Seconds to render a quicktime export')
+    parser.add_argument('--record', metavar='JSON',
+                        help='Record the results as a baseline JSON file')
+    parser.add_argument('--compare', metavar='JSON',
+                        help='Compare the results with a baseline JSON file')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_cli()
+    config = {
+        'panels': args.panels,
+        'shots': args.shots,
+        'latency': args.latency,
+        'error_rate': args.error_rate,
+        'render_time': args.render_time,
+        'runs': args.runs,
+    }
+    server = mock_flix(sequences=1,
+                       panels=args.panels,
+                       shots=args.shots,
+                       latency=args.latency,
+                       error_rate=args.error_rate,
+                       render_time=args.render_time)
+    hostname = server.start()
+    flix = flix_api.flix()
+    if flix.authenticate(hostname, 'admin', 'admin') is None:
+        print('could not authenticate to the mock Flix server')
+        sys.exit(1)
+    seq = dict(next(iter(server.sequences.values())))
+    seq['tracking_code'] = 'seq1'
+    api = handoff.handoff(flix)
+
+    results = {'config': config, 'suites': {}}
+    for name in args.suites:
+        res = run_suite(server, name, args.runs, api, seq)
+        results['suites'][name] = res
+        if res['wall_time_median'] is None:
+            print('{:<26s}| all {:d} runs failed'.format(name, res['failed']))
+            continue
+        print('{:<26s}| {:>9.3f}s | {:>6d} requests | {:>5d} connections | '
+              '{:>12d} bytes | {:>3d} failed'.format(
+                  name, res['wall_time_median'], res['requests'],
+                  res['connections'], res['bytes'], res['failed']))
+    server.stop()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    if args.record:
+        with open(args.record, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
@@ -0,0 +1,175 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+# Runs on Python 2, like the Flix client of the Hiero panel
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'hiero'))
+
+import flix as flix_api  # noqa: E402
+import pool  # noqa: E402
+import revision_snapshot  # noqa: E402
+import transport  # noqa: E402
+
+TRANSPORTS = {
+    'keep-alive': transport.transport,
+    'urlopen': transport.urlopen_transport,
+}
+
+
+def start_mock(python3, args):
+    """start_mock will start the mock Flix server on a free port
+
+    Arguments:
+        python3 {str} -- Python 3 interpreter of the mock server
+
+        args {Namespace} -- Command line arguments
+
+    Returns:
+        Tuple[subprocess.Popen, str] -- Server process, hostname
+    """
+    s = socket.socket()
+    s.bind(('127.0.0.1', 0))
+    port = s.getsockname()[1]
+    s.close()
+    proc = subprocess.Popen(
+        [python3, os.path.join(HERE, 'mock_flix.py'), '--port', str(port),
+         '--sequences', '1', '--panels', str(args.panels),
+         '--shots', str(args.shots), '--latency', str(args.latency),
+         '--user', args.user, '--password', args.password],
+        stdout=subprocess.PIPE)
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.1).close()
+            break
+        except socket.error:
+            time.sleep(0.1)
+    return proc, 'http://127.0.0.1:{0}'.format(port)
+
+
+def pull(flix, show_id, seq, work_dir):
+    """pull will do the requests of a Hiero Pull Latest as the panel does:
+    the sequence revision, panels and dialogues concurrently, then the
+    thumbnails from 8 threads
+
+    Arguments:
+        flix {flix_api.flix} -- Authenticated Flix api
+
+        show_id {int} -- Show ID
+
+        seq {Dict} -- Sequence
+
+        work_dir {str} -- Folder of the thumbnails
+    """
+    workers = pool.pool()
+    data = revision_snapshot.revision_snapshot(
+        flix, show_id, seq['id'], seq['revisions_count'], workers)
+    tasks = []
+    for p in data.get_panels():
+        thumb = p['asset']['media_objects']['thumbnail'][0]
+        path = os.path.join(work_dir, '{0}_{1}.png'.format(
+            p['panel_id'], p['revision_counter']))
+        tasks.append(workers.submit(
+            flix.download_media_object, path, thumb['id']))
+    for t in tasks:
+        if t.result() is None:
+            raise RuntimeError('Could not download a thumbnail')
+    workers.shutdown()
+
+
+def run(name, hostname, args):
+    """run will time the pull with a transport, the connections are opened
+    again for every run
+
+    Arguments:
+        name {str} -- Transport name
+
+        hostname {str} -- Flix server
+
+        args {Namespace} -- Command line arguments
+
+    Returns:
+        Dict -- Median, min and max time of a pull
+    """
+    samples = []
+    for _ in range(args.runs):
+        flix = flix_api.flix()
+        flix.transport = TRANSPORTS[name]()
+        if flix.authenticate(hostname, args.user, args.password) is None:
+            raise RuntimeError('Could not authenticate to ' + hostname)
+        shows = flix.get_shows()
+        show_id = shows[0]['id']
+        seq = flix.get_sequences(show_id)[0]
+        work_dir = tempfile.mkdtemp()
+        try:
+            start = time.time()
+            pull(flix, show_id, seq, work_dir)
+            samples.append(time.time() - start)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            flix.transport.close()
+    samples.sort()
+    return {'median': round(samples[len(samples) // 2], 4),
+            'min': round(samples[0], 4),
+            'max': round(samples[-1], 4)}
+
+
+def parse_cli():
+    parser = argparse.ArgumentParser(
+        description='Compare the pull times of the Hiero Flix client with '
+        'kept alive connections and with a connection per request')
+    parser.add_argument('--server',
+                        help='Flix server to pull from (default: start the '
+                        'mock Flix server)')
+    parser.add_argument('--user', default='admin', help='Flix username')
+    parser.add_argument('--password', default='admin', help='Flix password')
+    parser.add_argument('--python3', default='python3',
+                        help='Python 3 interpreter of the mock Flix server')
+    parser.add_argument('--panels', type=int, default=100,
+                        help='Panels of the mock sequence revision')
+    parser.add_argument('--shots', type=int, default=10,
+                        help='Shots of the mock sequence revision')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds added to every mock request')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Pulls per transport, the median is reported')
+    parser.add_argument('--transports', nargs='*',
+                        default=sorted(TRANSPORTS), choices=sorted(TRANSPORTS),
+                        help='Transports to measure')
+    parser.add_argument('--json', metavar='JSON',
+                        help='Write the results to a JSON file')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_cli()
+    proc = None
+    hostname = args.server
+    if hostname is None:
+        proc, hostname = start_mock(args.python3, args)
+    try:
+        results = {}
+        for name in args.transports:
+            res = run(name, hostname, args)
+            results[name] = res
+            print('{0:<12s}| pull {1:>7.3f}s (min {2:.3f}s, max {3:.3f}s)'
+                  .format(name, res['median'], res['min'], res['max']))
+    finally:
+        if proc is not None:
+            proc.terminate()
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
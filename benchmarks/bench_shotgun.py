@@ -0,0 +1,125 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'shotgun'))
+
+import handoff  # noqa: E402
+import shotgun as shotgun_api  # noqa: E402
+from fake_shotgun import fake_shotgun  # noqa: E402
+
+
+class fake_flix:
+    """fake_flix stands in for the Flix api during the Shotgun benchmark,
+    every download writes a quicktime of a fixed size
+    """
+
+    def __init__(self, movie_size: int):
+        self.movie_size = movie_size
+        self.bytes_downloaded = 0
+
+    def download_media_object(
+            self, temp_filepath: str, media_object_id: int) -> str:
+        with open(temp_filepath, 'wb') as f:
+            f.write(b'\0' * self.movie_size)
+        self.bytes_downloaded += self.movie_size
+        return temp_filepath
+
+
+def run(shots: int,
+        latency: float,
+        upload_bandwidth: float,
+        movie_size: int,
+        repeat: bool) -> Dict:
+    """run will push a sequence of shots to a fake Shotgun through the
+    same handoff the UI uses
+
+    Arguments:
+        shots {int} -- Number of shots in the sequence
+
+        latency {float} -- Latency of every Shotgun call
+
+        upload_bandwidth {float} -- Upload bandwidth in bytes per second
+
+        movie_size {int} -- Size of every quicktime
+
+        repeat {bool} -- Push the same sequence a second time
+
+    Returns:
+        Dict -- Calls, wall time and bytes
+    """
+    sg = fake_shotgun(latency, upload_bandwidth)
+    flix = fake_flix(movie_size)
+    shotgun = shotgun_api.shotgun('https://fake', 'bench', 'bench', sg=sg)
+    api = handoff.handoff(flix, shotgun)
+    mo_per_shots = {
+        'shot_{0:04d}'.format(i): {'mov': i, 'artwork': [], 'thumbnails': []}
+        for i in range(shots)}
+
+    results = {}
+    passes = ['first', 'repeat'] if repeat else ['first']
+    with tempfile.TemporaryDirectory() as temp_folder:
+        for name in passes:
+            sg.reset_stats()
+            flix.bytes_downloaded = 0
+            start = time.perf_counter()
+            # The shotgun api prints every entity it could not find
+            with contextlib.redirect_stdout(io.StringIO()):
+                api.shotgun_export(mo_per_shots, 'show', 1, 'seq',
+                                   lambda *args: None, temp_folder)
+            wall = time.perf_counter() - start
+            stats = sg.stats()
+            stats['wall_time'] = round(wall, 4)
+            stats['bytes_downloaded'] = flix.bytes_downloaded
+            results[name] = stats
+    return results
+
+
+def parse_cli():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Shotgun export against a fake Shotgun')
+    parser.add_argument('--shots', type=int, nargs='*',
+                        default=[10, 100, 1000],
+                        help='Sequence sizes to run')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds added to every Shotgun call')
+    parser.add_argument('--upload-bandwidth', type=float, default=None,
+                        help='Upload bandwidth in bytes per second')
+    parser.add_argument('--movie-size', type=int, default=64 * 1024,
+                        help='Size of every quicktime in bytes')
+    parser.add_argument('--repeat', action='store_true',
+                        help='Push the same sequence a second time')
+    parser.add_argument('--json', help='Write the results to a JSON file')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_cli()
+    report = {}
+    for shots in args.shots:
+        report[shots] = run(shots,
+                            args.latency,
+                            args.upload_bandwidth,
+                            args.movie_size,
+                            args.repeat)
+        for name, stats in report[shots].items():
+            print('{:>6d} shots {:<7s}| {:>6d} calls | {:>9.3f}s | '
+                  '{:>12d} bytes up | {}'.format(
+                      shots, name, stats['total_calls'], stats['wall_time'],
+                      stats['bytes_uploaded'],
+                      ', '.join('{}={}'.format(k, v) for k, v in
+                                sorted(stats['calls'].items()))))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
@@ -0,0 +1,178 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Entry points: tool folder, module to import and window class to show
+ENTRY_POINTS = {
+    'shotgun': ('shotgun', 'main', 'main_dialogue'),
+    'shotgun_cli': ('shotgun', 'cli', None),
+    'license_management': ('license_management', 'main', None),
+    # The Hiero panel needs a running Hiero, only its Flix client is measured
+    'hiero_flix': ('hiero', 'flix', None),
+}
+
+# Modules that are expensive to import, reported when they got loaded
+HEAVY_MODULES = ['PySide2', 'shotgun_api3', 'urllib3', 'urllib2']
+
+# Runs in a fresh interpreter, Python 2 compatible for the Hiero client
+SNIPPET = '''
+import json
+import sys
+import time
+start = time.time()
+sys.path.insert(0, {path!r})
+sys.argv = [{module!r}]
+import {module}
+res = {{'import_time': time.time() - start}}
+if {window!r} is not None:
+    try:
+        from PySide2.QtWidgets import QApplication
+    except ImportError:
+        res['first_window_time'] = None
+    else:
+        app = QApplication.instance() or QApplication(sys.argv)
+        w = getattr({module}, {window!r})()
+        w.show()
+        app.processEvents()
+        res['first_window_time'] = time.time() - start
+res['modules'] = len(sys.modules)
+res['heavy_modules'] = [m for m in {heavy!r}
+                        if getattr(sys.modules.get(m), '__file__', None)]
+sys.stdout.write(json.dumps(res))
+'''
+
+
+def measure(name: str, python: str) -> Dict:
+    """measure will start an interpreter and import an entry point in it
+
+    Arguments:
+        name {str} -- Entry point name
+
+        python {str} -- Python interpreter
+
+    Returns:
+        Dict -- Process, import and first window times
+    """
+    folder, module, window = ENTRY_POINTS[name]
+    code = SNIPPET.format(path=os.path.abspath(os.path.join(ROOT, folder)),
+                          module=module, window=window, heavy=HEAVY_MODULES)
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    start = time.perf_counter()
+    proc = subprocess.run([python, '-c', code], env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        return {'error': proc.stderr.strip().splitlines()[-1]}
+    res = json.loads(proc.stdout.strip().splitlines()[-1])
+    res['process_time'] = elapsed
+    return res
+
+
+def run(name: str, python: str, runs: int) -> Dict:
+    """run will measure an entry point several times
+
+    Arguments:
+        name {str} -- Entry point name
+
+        python {str} -- Python interpreter
+
+        runs {int} -- Number of cold starts
+
+    Returns:
+        Dict -- Median times and the heavy modules imported
+    """
+    samples = [measure(name, python) for _ in range(runs)]
+    if 'error' in samples[0]:
+        return samples[0]
+    res = {'heavy_modules': samples[0]['heavy_modules'],
+           'modules': samples[0]['modules']}
+    for key in ['process_time', 'import_time', 'first_window_time']:
+        values = [s[key] for s in samples if s.get(key) is not None]
+        if len(values) > 0:
+            res[key] = round(statistics.median(values), 4)
+    return res
+
+
+def compare(results: Dict, baseline: Dict):
+    """compare will print the difference of the results with a baseline
+
+    Arguments:
+        results {Dict} -- Results of the entry points
+
+        baseline {Dict} -- Baseline of the entry points
+    """
+    for name, res in sorted(results['entry_points'].items()):
+        base = baseline.get('entry_points', {}).get(name)
+        if base is None or 'import_time' not in base or 'error' in res:
+            continue
+        delta = ((res['import_time'] - base['import_time']) /
+                 max(base['import_time'], 1e-9) * 100)
+        print('{:<20s}| import {:>7.3f}s -> {:>7.3f}s | {:>+8.1f}%'.format(
+            name, base['import_time'], res['import_time'], delta))
+
+
+def fmt(value: float) -> str:
+    return '      -' if value is None else '{:>6.3f}s'.format(value)
+
+
+def parse_cli():
+    parser = argparse.ArgumentParser(
+        description='Measure the cold start of the handoff tools')
+    parser.add_argument('--entry-points', nargs='*',
+                        default=[e for e in ENTRY_POINTS if e != 'hiero_flix'],
+                        choices=sorted(ENTRY_POINTS),
+                        help='Entry points to measure')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Cold starts per entry point, the median is '
+                        'reported')
+    parser.add_argument('--python', default=sys.executable,
+                        help='Interpreter of the shotgun and '
+                        'license_management tools')
+    parser.add_argument('--python2',
+                        help='Python 2 interpreter for hiero_flix')
+    parser.add_argument('--record', metavar='JSON',
+                        help='Record the results as a baseline JSON file')
+    parser.add_argument('--compare', metavar='JSON',
+                        help='Compare the results with a baseline JSON file')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_cli()
+    results = {'config': {'runs': args.runs}, 'entry_points': {}}
+    for name in args.entry_points:
+        python = args.python
+        if name == 'hiero_flix':
+            if args.python2 is None:
+                print('{:<20s}| skipped, needs --python2'.format(name))
+                continue
+            python = args.python2
+        res = run(name, python, args.runs)
+        results['entry_points'][name] = res
+        if 'error' in res:
+            print('{:<20s}| {}'.format(name, res['error']))
+            continue
+        print('{:<20s}| process {} | import {} | first window {} | '
+              '{}'.format(name, fmt(res.get('process_time')),
+                          fmt(res.get('import_time')),
+                          fmt(res.get('first_window_time')),
+                          ', '.join(res['heavy_modules']) or '-'))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    if args.record:
+        with open(args.record, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
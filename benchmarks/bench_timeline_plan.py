@@ -0,0 +1,119 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'hiero'))
+
+import timeline_plan  # noqa: E402
+
+
+def make_revision(panels: int, shots: int,
+                  seed: int = 0) -> Tuple[List, Dict, Dict]:
+    """make_revision will generate the panels, markers and dialogues of a
+    sequence revision as returned by Flix
+
+    Arguments:
+        panels {int} -- Number of panels
+
+        shots {int} -- Number of markers
+
+        seed {int} -- Random seed (default: {0})
+
+    Returns:
+        Tuple[List, Dict, Dict] -- Panels, markers mapping, dialogues
+    """
+    rnd = random.Random(seed)
+    revision_panels = []
+    starts = []
+    panel_in = 0
+    for i in range(panels):
+        duration = rnd.randint(6, 48)
+        revision_panels.append({
+            'panel_id': 1000 + i,
+            'revision_number': rnd.randint(1, 5),
+            'revision_counter': rnd.randint(1, 5),
+            'duration': duration,
+            'asset': {'asset_id': 5000 + i},
+            'dialogue': '<p>Line {0} &amp; more</p>'.format(i),
+            'latest_open_note': {
+                'body': '<p>Note <b>{0}</b>&nbsp;to fix</p>'.format(i)},
+        })
+        starts.append(panel_in)
+        panel_in += duration
+    markers = {}
+    for n, start in enumerate(sorted(rnd.sample(starts, min(shots, panels)))):
+        markers[start] = 'shot{0:03d}'.format(n * 10)
+    dialogues = {}
+    for p in revision_panels:
+        dialogues[p['panel_id']] = timeline_plan.sanitize(
+            p['dialogue'].replace('</p>', '\n'))
+    return revision_panels, markers, dialogues
+
+
+def run(panels: int, shots: int, runs: int) -> Dict:
+    """run will build the timeline plan of a sequence revision several times
+
+    Arguments:
+        panels {int} -- Number of panels
+
+        shots {int} -- Number of markers
+
+        runs {int} -- Number of builds, the median is reported
+
+    Returns:
+        Dict -- Build time, time per panel and size of the plan
+    """
+    revision_panels, markers, dialogues = make_revision(panels, shots)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        plan = timeline_plan.timeline_plan(
+            'seq', 1, revision_panels, markers, dialogues)
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples)
+    return {'build_time': round(median, 6),
+            'per_panel_us': round(median / panels * 1e6, 2),
+            'items': len(plan.items),
+            'markers': len(plan.markers),
+            'burnins': len(plan.burnins)}
+
+
+def parse_cli():
+    parser = argparse.ArgumentParser(
+        description='Measure the timeline plan of the Hiero Pull Latest, '
+        'without Hiero')
+    parser.add_argument('--panels', type=int, nargs='*',
+                        default=[100, 1000, 10000],
+                        help='Sequence revision sizes to run')
+    parser.add_argument('--shots', type=int, default=20,
+                        help='Markers per sequence revision')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Builds per size, the median is reported')
+    parser.add_argument('--json', metavar='JSON',
+                        help='Write the results to a JSON file')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_cli()
+    results = {}
+    for n in args.panels:
+        res = run(n, args.shots, args.runs)
+        results[n] = res
+        print('{:>6d} panels | build {:>8.4f}s | {:>7.2f}us/panel | '
+              '{} markers, {} burnins'.format(
+                  n, res['build_time'], res['per_panel_us'],
+                  res['markers'], res['burnins']))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
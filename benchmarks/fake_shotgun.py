@@ -0,0 +1,292 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import itertools
+import os
+import threading
+import time
+from typing import Dict, List
+
+
+class fake_shotgun:
+    """fake_shotgun is an in-process stand-in for shotgun_api3.Shotgun,
+    it implements find, find_one, create, batch and upload on an in memory
+    database and counts every call and every byte uploaded.
+    A latency can be added to every call to simulate a remote site
+    """
+
+    def __init__(self,
+                 latency: float = 0.0,
+                 upload_bandwidth: float = None):
+        """
+        Arguments:
+            latency {float} -- Seconds added to every call (default: {0.0})
+
+            upload_bandwidth {float} -- Bytes per second for the uploads,
+            unlimited if None (default: {None})
+        """
+        self.latency = latency
+        self.upload_bandwidth = upload_bandwidth
+        self.entities = {}
+        self.calls = {}
+        self.bytes_uploaded = 0
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def find(self,
+             entity_type: str,
+             filters: List,
+             fields: List = None,
+             order: List = None,
+             filter_operator: str = None,
+             limit: int = 0,
+             *args, **kwargs) -> List:
+        """find will return the entities matching all the filters
+
+        Arguments:
+            entity_type {str} -- Entity type
+
+            filters {List} -- List of [field, 'is', value] filters
+
+            fields {List} -- Fields to return (default: {None})
+
+            order {List} -- Ordering of the results (default: {None})
+
+            filter_operator {str} -- 'all' or 'any' (default: {None})
+
+            limit {int} -- Maximum number of results (default: {0})
+
+        Returns:
+            List -- Entities
+        """
+        self.__call('find')
+        return self.__find(
+            entity_type, filters, fields, order, filter_operator, limit)
+
+    def find_one(self,
+                 entity_type: str,
+                 filters: List,
+                 fields: List = None,
+                 order: List = None,
+                 filter_operator: str = None,
+                 *args, **kwargs) -> Dict:
+        """find_one will return the first entity matching all the filters
+
+        Arguments:
+            entity_type {str} -- Entity type
+
+            filters {List} -- List of [field, 'is', value] filters
+
+            fields {List} -- Fields to return (default: {None})
+
+            order {List} -- Ordering of the results (default: {None})
+
+            filter_operator {str} -- 'all' or 'any' (default: {None})
+
+        Returns:
+            Dict -- Entity or None
+        """
+        self.__call('find_one')
+        res = self.__find(
+            entity_type, filters, fields, order, filter_operator, 1)
+        if len(res) < 1:
+            return None
+        return res[0]
+
+    def create(self,
+               entity_type: str,
+               data: Dict,
+               return_fields: List = None) -> Dict:
+        """create will create an entity
+
+        Arguments:
+            entity_type {str} -- Entity type
+
+            data {Dict} -- Fields of the entity
+
+            return_fields {List} -- Extra fields to return (default: {None})
+
+        Returns:
+            Dict -- Created entity
+        """
+        self.__call('create')
+        return self.__create(entity_type, data)
+
+    def batch(self, requests: List) -> List:
+        """batch will run a list of create / update / delete requests
+        as a single call
+
+        Arguments:
+            requests {List} -- List of requests
+
+        Returns:
+            List -- Result of every request
+        """
+        self.__call('batch')
+        results = []
+        for req in requests:
+            request_type = req.get('request_type')
+            entity_type = req.get('entity_type')
+            if request_type == 'create':
+                results.append(self.__create(entity_type, req.get('data')))
+            elif request_type == 'update':
+                with self.lock:
+                    entity = self.entities[entity_type][req['entity_id']]
+                    entity.update(req.get('data', {}))
+                results.append(dict(entity))
+            elif request_type == 'delete':
+                with self.lock:
+                    deleted = self.entities.get(entity_type, {}).pop(
+                        req['entity_id'], None)
+                results.append(deleted is not None)
+            else:
+                raise ValueError(
+                    'Unknown request type {0}'.format(request_type))
+        return results
+
+    def upload(self,
+               entity_type: str,
+               entity_id: int,
+               path: str,
+               field_name: str = None,
+               display_name: str = None,
+               tag_list: str = None) -> int:
+        """upload will read a file and attach it to an entity
+
+        Arguments:
+            entity_type {str} -- Entity type
+
+            entity_id {int} -- Entity ID
+
+            path {str} -- Path of the file to upload
+
+            field_name {str} -- Field to attach the file to (default: {None})
+
+            display_name {str} -- Display name (default: {None})
+
+            tag_list {str} -- Tags (default: {None})
+
+        Returns:
+            int -- Attachment ID
+        """
+        self.__call('upload')
+        size = 0
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                size += len(chunk)
+        if self.upload_bandwidth:
+            time.sleep(size / self.upload_bandwidth)
+        attachment = self.__create('Attachment', {
+            'this_file': {'name': display_name or os.path.basename(path)},
+            'attachment_links': [{'type': entity_type, 'id': entity_id}],
+            'file_size': size,
+        })
+        with self.lock:
+            self.bytes_uploaded += size
+            if field_name is not None:
+                entity = self.entities.get(entity_type, {}).get(entity_id)
+                if entity is not None:
+                    entity[field_name] = {'type': 'Attachment',
+                                          'id': attachment['id']}
+        return attachment['id']
+
+    def stats(self) -> Dict:
+        """stats will return the number of calls per method and the bytes
+        uploaded
+
+        Returns:
+            Dict -- Stats
+        """
+        with self.lock:
+            return {
+                'calls': dict(self.calls),
+                'total_calls': sum(self.calls.values()),
+                'bytes_uploaded': self.bytes_uploaded,
+            }
+
+    def reset_stats(self):
+        """reset_stats will reset the counters but keep the entities
+        """
+        with self.lock:
+            self.calls = {}
+            self.bytes_uploaded = 0
+
+    def __call(self, method: str):
+        """__call will count a call and wait for the latency
+
+        Arguments:
+            method {str} -- Name of the method called
+        """
+        with self.lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def __create(self, entity_type: str, data: Dict) -> Dict:
+        """__create will store a new entity
+
+        Arguments:
+            entity_type {str} -- Entity type
+
+            data {Dict} -- Fields of the entity
+
+        Returns:
+            Dict -- Created entity
+        """
+        with self.lock:
+            entity = dict(data)
+            entity['type'] = entity_type
+            entity['id'] = next(self.ids)
+            self.entities.setdefault(entity_type, {})[entity['id']] = entity
+            return dict(entity)
+
+    def __find(self,
+               entity_type: str,
+               filters: List,
+               fields: List,
+               order: List,
+               filter_operator: str,
+               limit: int) -> List:
+        """__find will filter, order and limit the entities of a type
+
+        Returns:
+            List -- Entities
+        """
+        with self.lock:
+            entities = list(self.entities.get(entity_type, {}).values())
+        match = all if filter_operator in (None, 'all', 'and') else any
+        res = [e for e in entities
+               if match(self.__match(e, f) for f in filters)]
+        for o in reversed(order or []):
+            res.sort(key=lambda e: (e.get(o['field_name']) is None,
+                                    e.get(o['field_name'])),
+                     reverse=o.get('direction') == 'desc')
+        if limit:
+            res = res[:limit]
+        keep = ['type', 'id'] + list(fields or [])
+        return [{k: e.get(k) for k in keep} for e in res]
+
+    def __match(self, entity: Dict, f: List) -> bool:
+        """__match will check an entity against a filter
+
+        Arguments:
+            entity {Dict} -- Entity
+
+            f {List} -- [field, relation, value]
+
+        Returns:
+            bool -- Matching or not
+        """
+        field, relation, value = f[0], f[1], f[2]
+        current = entity.get(field)
+        if isinstance(value, dict) and isinstance(current, dict):
+            value = (value.get('type'), value.get('id'))
+            current = (current.get('type'), current.get('id'))
+        if relation == 'is':
+            return current == value
+        if relation == 'is_not':
+            return current != value
+        if relation == 'in':
+            return current in value
+        raise ValueError('Unsupported filter relation {0}'.format(relation))
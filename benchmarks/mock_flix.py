@@ -0,0 +1,690 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import argparse
+import base64
+import hashlib
+import hmac
+import itertools
+import json
+import random
+import re
+import secrets
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+
+class mock_flix:
+    """mock_flix is a local stand-in for the Flix REST API, it serves a
+    generated dataset of shows, sequences, panels, assets and media objects.
+    Every request but /authenticate has to be signed with FNAUTH, latency,
+    errors and quicktime render times can be injected
+    """
+
+    def __init__(self,
+                 shows: int = 1,
+                 episodes: int = 0,
+                 sequences: int = 2,
+                 revisions: int = 1,
+                 panels: int = 100,
+                 shots: int = 10,
+                 changed_panels: int = 0,
+                 thumbnail_size: int = 16 * 1024,
+                 artwork_size: int = 256 * 1024,
+                 movie_size: int = 1024 * 1024,
+                 latency: float = 0.0,
+                 error_rate: float = 0.0,
+                 render_time: float = 0.0,
+                 user: str = 'admin',
+                 password: str = 'admin',
+                 access_keys: int = 0,
+                 max_seats: int = 0,
+                 seed: int = 0):
+        """
+        Arguments:
+            shows {int} -- Number of shows (default: {1})
+
+            episodes {int} -- Episodes per show, 0 for non episodic shows
+            (default: {0})
+
+            sequences {int} -- Sequences per show or episode (default: {2})
+
+            revisions {int} -- Revisions per sequence (default: {1})
+
+            panels {int} -- Panels per sequence revision (default: {100})
+
+            shots {int} -- Shots (markers) per sequence revision
+            (default: {10})
+
+            changed_panels {int} -- Panels getting a new revision and
+            asset in every sequence revision (default: {0})
+
+            thumbnail_size {int} -- Size of the thumbnails in bytes
+
+            artwork_size {int} -- Size of the artworks in bytes
+
+            movie_size {int} -- Size of the quicktimes in bytes
+
+            latency {float} -- Seconds added to every request
+            (default: {0.0})
+
+            error_rate {float} -- Ratio of signed requests answered with a
+            500 (default: {0.0})
+
+            render_time {float} -- Seconds to render a quicktime export
+            (default: {0.0})
+
+            user {str} -- Login accepted by /authenticate
+            (default: {'admin'})
+
+            password {str} -- Password accepted by /authenticate
+            (default: {'admin'})
+
+            access_keys {int} -- Access keys of logged in users, served by
+            /users/current and /info (default: {0})
+
+            max_seats {int} -- Seats of the license, 0 for as many as the
+            access keys (default: {0})
+
+            seed {int} -- Seed for the error injection (default: {0})
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.render_time = render_time
+        self.user = user
+        self.password = password
+        self.thumbnail_size = thumbnail_size
+        self.artwork_size = artwork_size
+        self.movie_size = movie_size
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.tokens = {}
+        self.chains = {}
+        self.media_objects = {}
+        self.assets = {}
+        self.shows = []
+        self.episodes = {}
+        self.sequences = {}
+        self.revisions = {}
+        self.httpd = None
+        self.thread = None
+        self.reset_stats()
+        self.__generate(shows, episodes, sequences, revisions, panels,
+                        shots, changed_panels)
+        self.max_seats = max_seats or access_keys
+        self.access_keys = self.__generate_access_keys(access_keys)
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """start will serve the API from a background thread
+
+        Arguments:
+            host {str} -- Host to bind (default: {'127.0.0.1'})
+
+            port {int} -- Port to bind, 0 for any free port (default: {0})
+
+        Returns:
+            str -- Hostname to give to the Flix clients
+        """
+        self.httpd = ThreadingHTTPServer((host, port), mock_flix_handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self.thread = threading.Thread(target=self.httpd.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self.url()
+
+    def serve_forever(self, host: str = '127.0.0.1', port: int = 1234):
+        """serve_forever will serve the API from the current thread
+
+        Arguments:
+            host {str} -- Host to bind (default: {'127.0.0.1'})
+
+            port {int} -- Port to bind (default: {1234})
+        """
+        self.httpd = ThreadingHTTPServer((host, port), mock_flix_handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self.httpd.serve_forever()
+
+    def stop(self):
+        """stop will stop serving the API
+        """
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def url(self) -> str:
+        """url will return the hostname of the server
+
+        Returns:
+            str -- Hostname
+        """
+        host, port = self.httpd.server_address[:2]
+        return 'http://{0}:{1}'.format(host, port)
+
+    def stats(self) -> Dict:
+        """stats will return the requests, connections and bytes sent
+
+        Returns:
+            Dict -- Stats
+        """
+        with self.lock:
+            return {
+                'requests': dict(self.requests),
+                'total_requests': sum(self.requests.values()),
+                'connections': self.connections,
+                'errors': self.errors,
+                'bytes_sent': self.bytes_sent,
+            }
+
+    def reset_stats(self):
+        """reset_stats will reset the counters
+        """
+        with self.lock:
+            self.requests = {}
+            self.connections = 0
+            self.errors = 0
+            self.bytes_sent = 0
+
+    def handle(self,
+               method: str,
+               path: str,
+               headers: Dict,
+               body: bytes) -> Tuple[int, str, bytes]:
+        """handle will route a request
+
+        Arguments:
+            method {str} -- Http method
+
+            path {str} -- Path of the request
+
+            headers {Dict} -- Headers of the request
+
+            body {bytes} -- Content of the request
+
+        Returns:
+            Tuple[int, str, bytes] -- Status, Content type, Content
+        """
+        if self.latency > 0:
+            time.sleep(self.latency)
+        url = path.split('?')[0]
+        for route_method, route, name, fn in self.__routes():
+            m = route.match(url)
+            if m is None or route_method != method:
+                continue
+            self.__count(name)
+            if name == 'authenticate':
+                return fn(headers)
+            if not self.__check_signature(method, path, headers, body):
+                return self.__json(401, {'message': 'invalid signature'})
+            if self.error_rate > 0 and self.random.random() < self.error_rate:
+                with self.lock:
+                    self.errors += 1
+                return self.__json(500, {'message': 'injected error'})
+            args = [int(a) if a.isdigit() else a for a in m.groups()]
+            if method == 'POST':
+                args.append(json.loads(body.decode('utf-8') or '{}'))
+            return fn(*args)
+        self.__count('not_found')
+        return self.__json(404, {'message': 'not found'})
+
+    def __routes(self) -> List:
+        """__routes will return the routes of the API
+
+        Returns:
+            List -- Method, Path regex, Name, Handler
+        """
+        rev = r'/show/(\d+)/sequence/(\d+)/revision/(\d+)'
+        return [
+            ('POST', re.compile(r'^/authenticate$'), 'authenticate',
+             self.__authenticate),
+            ('GET', re.compile(r'^/shows$'), 'shows', self.__get_shows),
+            ('GET', re.compile(r'^/show/(\d+)/episodes$'), 'episodes',
+             self.__get_episodes),
+            ('GET', re.compile(r'^/show/(\d+)/sequences$'), 'sequences',
+             self.__get_sequences),
+            ('GET', re.compile(r'^/show/(\d+)/episode/(\d+)/sequences$'),
+             'sequences', self.__get_episode_sequences),
+            ('GET', re.compile('^' + rev + '$'), 'sequence_revision',
+             self.__get_revision),
+            ('GET', re.compile('^' + rev + '/panels$'), 'panels',
+             self.__get_panels),
+            ('GET', re.compile('^' + rev + '/dialogues$'), 'dialogues',
+             self.__get_dialogues),
+            ('POST', re.compile('^' + rev + '/export/quicktime$'),
+             'export_quicktime', self.__export_quicktime),
+            ('POST', re.compile(
+                r'^/show/(\d+)/episode/\d+/sequence/(\d+)/revision/(\d+)'
+                r'/export/quicktime$'),
+             'export_quicktime', self.__export_quicktime),
+            ('POST', re.compile(r'^/show/(\d+)/sequence/(\d+)/revision$'),
+             'new_sequence_revision', self.__new_revision),
+            ('POST', re.compile(r'^/show/(\d+)/sequence/(\d+)/panel$'),
+             'new_panel', self.__new_panel),
+            ('GET', re.compile(r'^/asset/(\d+)$'), 'asset', self.__get_asset),
+            ('GET', re.compile(r'^/file/(\d+)/data$'), 'file_data',
+             self.__get_file_data),
+            ('GET', re.compile(r'^/chain/(\d+)$'), 'chain', self.__get_chain),
+            ('GET', re.compile(r'^/info$'), 'info', self.__get_info),
+            ('GET', re.compile(r'^/users/current$'), 'users_current',
+             self.__get_users_current),
+            ('DELETE', re.compile(r'^/authenticate/key/(\w+)$'),
+             'revoke_access_key', self.__revoke_access_key),
+        ]
+
+    def __authenticate(self, headers: Dict) -> Tuple[int, str, bytes]:
+        auth = headers.get('Authorization', '')
+        expected = base64.b64encode('{0}:{1}'.format(
+            self.user, self.password).encode('utf-8')).decode('utf-8')
+        if auth != 'Basic ' + expected:
+            return self.__json(401, {'message': 'invalid credentials'})
+        key = secrets.token_hex(10)
+        secret = secrets.token_hex(20)
+        expiry = datetime.utcnow() + timedelta(days=1)
+        with self.lock:
+            self.tokens[key] = (secret, expiry)
+        return self.__json(200, {
+            'id': key,
+            'secret_access_key': secret,
+            'expiry_date': expiry.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+        })
+
+    def __get_info(self) -> Tuple[int, str, bytes]:
+        with self.lock:
+            seats = len(set(ak['owner']['id']
+                            for ak in self.access_keys.values()))
+        return self.__json(200, {'current_seats': seats,
+                                 'max_seats': self.max_seats})
+
+    def __get_users_current(self) -> Tuple[int, str, bytes]:
+        with self.lock:
+            access_keys = list(self.access_keys.values())
+        return self.__json(200, {'access_keys': access_keys})
+
+    def __revoke_access_key(self, key: str) -> Tuple[int, str, bytes]:
+        with self.lock:
+            if self.access_keys.pop(key, None) is None:
+                return self.__json(404, {'message': 'access key not found'})
+        return self.__json(200, {})
+
+    def __get_shows(self) -> Tuple[int, str, bytes]:
+        return self.__json(200, {'shows': self.shows})
+
+    def __get_episodes(self, show_id: int) -> Tuple[int, str, bytes]:
+        return self.__json(200, {'episodes': self.episodes.get(show_id, [])})
+
+    def __get_sequences(self, show_id: int) -> Tuple[int, str, bytes]:
+        return self.__json(200, {'sequences': [
+            s for s in self.sequences.values() if s['show_id'] == show_id]})
+
+    def __get_episode_sequences(
+            self, show_id: int, episode_id: int) -> Tuple[int, str, bytes]:
+        return self.__json(200, {'sequences': [
+            s for s in self.sequences.values()
+            if s['show_id'] == show_id and s['episode_id'] == episode_id]})
+
+    def __get_revision(
+            self, show_id: int, seq_id: int, rev: int) -> Tuple[int, str, bytes]:
+        revision = self.revisions.get((seq_id, rev))
+        if revision is None:
+            return self.__json(404, {'message': 'revision not found'})
+        return self.__json(200, {
+            'revision': rev,
+            'comment': revision['comment'],
+            'meta_data': {'markers': revision['markers']},
+        })
+
+    def __get_panels(
+            self, show_id: int, seq_id: int, rev: int) -> Tuple[int, str, bytes]:
+        revision = self.revisions.get((seq_id, rev))
+        if revision is None:
+            return self.__json(404, {'message': 'revision not found'})
+        return self.__json(200, {'panels': revision['panels']})
+
+    def __get_dialogues(
+            self, show_id: int, seq_id: int, rev: int) -> Tuple[int, str, bytes]:
+        revision = self.revisions.get((seq_id, rev))
+        if revision is None:
+            return self.__json(404, {'message': 'revision not found'})
+        return self.__json(200, {'dialogues': [
+            {'panel_id': p['panel_id'], 'text': '<p>{0}</p>'.format(
+                p['dialogue'])}
+            for p in revision['panels'] if p['dialogue']]})
+
+    def __export_quicktime(self, show_id: int, seq_id: int, rev: int,
+                           content: Dict) -> Tuple[int, str, bytes]:
+        asset = self.__new_asset({'artwork': ('mov', self.movie_size)})
+        chain_id = next(self.ids)
+        with self.lock:
+            self.chains[chain_id] = (time.monotonic() + self.render_time,
+                                     asset['asset_id'])
+        return self.__json(200, chain_id)
+
+    def __get_chain(self, chain_id: int) -> Tuple[int, str, bytes]:
+        chain = self.chains.get(chain_id)
+        if chain is None:
+            return self.__json(404, {'message': 'chain not found'})
+        ready, asset_id = chain
+        if time.monotonic() < ready:
+            return self.__json(200, {'id': chain_id, 'status': 'in progress'})
+        return self.__json(200, {'id': chain_id,
+                                 'status': 'completed',
+                                 'results': {'assetID': asset_id}})
+
+    def __new_revision(self, show_id: int, seq_id: int,
+                       content: Dict) -> Tuple[int, str, bytes]:
+        with self.lock:
+            sequence = self.sequences[seq_id]
+            sequence['revisions_count'] += 1
+            rev = sequence['revisions_count']
+        panels = []
+        for p in content.get('revisioned_panels', []):
+            panel = dict(self.__find_panel(p.get('id'),
+                                           p.get('revision_number')) or {})
+            panel.update({'panel_id': p.get('id'),
+                          'revision_number': p.get('revision_number'),
+                          'duration': p.get('duration'),
+                          'dialogue': p.get('dialogue') or ''})
+            panels.append(panel)
+        self.revisions[(seq_id, rev)] = {
+            'comment': content.get('comment', ''),
+            'markers': content.get('meta_data', {}).get('markers', []),
+            'panels': panels,
+        }
+        return self.__json(200, {'revision': rev})
+
+    def __new_panel(self, show_id: int, seq_id: int,
+                    content: Dict) -> Tuple[int, str, bytes]:
+        asset_id = content.get('asset', {}).get('asset_id')
+        asset = self.assets.get(asset_id)
+        if asset is None:
+            asset = self.__new_asset({
+                'thumbnail': ('png', self.thumbnail_size),
+                'artwork': ('psd', self.artwork_size)})
+        panel_id = next(self.ids)
+        return self.__json(200, {
+            'id': panel_id,
+            'panel_id': panel_id,
+            'revision_number': 1,
+            'revision_counter': 1,
+            'duration': content.get('duration', 12),
+            'asset': asset,
+        })
+
+    def __get_asset(self, asset_id: int) -> Tuple[int, str, bytes]:
+        asset = self.assets.get(asset_id)
+        if asset is None:
+            return self.__json(404, {'message': 'asset not found'})
+        return self.__json(200, asset)
+
+    def __get_file_data(self, mo_id: int) -> Tuple[int, str, bytes]:
+        mo = self.media_objects.get(mo_id)
+        if mo is None:
+            return self.__json(404, {'message': 'media object not found'})
+        # Deterministic content, different for every media object
+        pattern = hashlib.sha256(str(mo_id).encode('utf-8')).digest()
+        data = (pattern * (mo['size'] // len(pattern) + 1))[:mo['size']]
+        return 200, 'application/octet-stream', data
+
+    def __check_signature(self,
+                          method: str,
+                          path: str,
+                          headers: Dict,
+                          body: bytes) -> bool:
+        """__check_signature will verify the FNAUTH signature of a request
+        the same way the Flix server does
+
+        Returns:
+            bool -- Valid signature or not
+        """
+        auth = headers.get('Authorization', '')
+        if not auth.startswith('FNAUTH ') or ':' not in auth:
+            return False
+        key, signature = auth[len('FNAUTH '):].split(':', 1)
+        with self.lock:
+            token = self.tokens.get(key)
+        if token is None or token[1] < datetime.utcnow():
+            return False
+        try:
+            dt = datetime.strptime(headers.get('Date', ''),
+                                   '%a, %d %b %Y %H:%M:%S GMT')
+        except ValueError:
+            return False
+        raw_string = method.upper() + '\n'
+        if body:
+            raw_string += hashlib.md5(body).hexdigest() + '\n'
+            raw_string += headers.get('Content-Type', '') + '\n'
+        else:
+            raw_string += '\n\n'
+        raw_string += dt.isoformat() + 'Z' + '\n'
+        raw_string += path.split('?')[0]
+        expected = base64.b64encode(
+            hmac.new(token[0].encode('utf-8'),
+                     raw_string.encode('utf-8'),
+                     digestmod=hashlib.sha256).digest()).decode('utf-8')
+        return hmac.compare_digest(expected, signature)
+
+    def __count(self, name: str):
+        with self.lock:
+            self.requests[name] = self.requests.get(name, 0) + 1
+
+    def __json(self, status: int, content: object) -> Tuple[int, str, bytes]:
+        return status, 'application/json', json.dumps(content).encode('utf-8')
+
+    def __new_asset(self, media_objects: Dict) -> Dict:
+        """__new_asset will create an asset and its media objects
+
+        Arguments:
+            media_objects {Dict} -- kind -> (extension, size)
+
+        Returns:
+            Dict -- Asset
+        """
+        with self.lock:
+            asset_id = next(self.ids)
+            asset = {'asset_id': asset_id, 'id': asset_id,
+                     'media_objects': {}}
+            for kind, (ext, size) in media_objects.items():
+                mo_id = next(self.ids)
+                self.media_objects[mo_id] = {'size': size}
+                asset['media_objects'][kind] = [{
+                    'id': mo_id,
+                    'name': '{0}_{1}.{2}'.format(kind, mo_id, ext)}]
+            self.assets[asset_id] = asset
+        return asset
+
+    def __new_panel_revision(self, panel_id: int, revision: int) -> Dict:
+        asset = self.__new_asset({
+            'thumbnail': ('png', self.thumbnail_size),
+            'artwork': ('psd', self.artwork_size)})
+        return {
+            'panel_id': panel_id,
+            'revision_number': revision,
+            'revision_counter': revision,
+            'duration': 12,
+            'dialogue': 'dialogue of panel {0}'.format(panel_id),
+            'latest_open_note': {'body': 'note of panel {0}'.format(panel_id)},
+            'asset': asset,
+        }
+
+    def __find_panel(self, panel_id: int, revision: int) -> Dict:
+        for r in self.revisions.values():
+            for p in r['panels']:
+                if (p['panel_id'] == panel_id and
+                        p['revision_number'] == revision):
+                    return p
+        return None
+
+    def __generate(self, shows: int, episodes: int, sequences: int,
+                   revisions: int, panels: int, shots: int,
+                   changed_panels: int):
+        """__generate will generate the dataset
+        """
+        for s in range(shows):
+            show_id = next(self.ids)
+            self.shows.append({'id': show_id,
+                               'tracking_code': 'show{0}'.format(s + 1),
+                               'episodic': episodes > 0,
+                               'hidden': False})
+            episode_ids = [None]
+            if episodes > 0:
+                self.episodes[show_id] = [
+                    {'id': next(self.ids),
+                     'tracking_code': 'ep{0}'.format(e + 1)}
+                    for e in range(episodes)]
+                episode_ids = [e['id'] for e in self.episodes[show_id]]
+            for episode_id in episode_ids:
+                for q in range(sequences):
+                    self.__generate_sequence(show_id, episode_id, q,
+                                             revisions, panels, shots,
+                                             changed_panels)
+
+    def __generate_access_keys(self, access_keys: int) -> Dict:
+        """__generate_access_keys will generate the access keys of the
+        logged in users, some users have several keys
+        """
+        keys = {}
+        users = max(1, access_keys * 3 // 4)
+        now = datetime.utcnow()
+        for i in range(access_keys):
+            user_id = i % users + 1
+            key = 'ak{0:018d}'.format(i + 1)
+            expiry = now + timedelta(minutes=self.random.randint(1, 60 * 24))
+            keys[key] = {
+                'id': key,
+                'owner': {'id': user_id,
+                          'username': 'user{0}'.format(user_id)},
+                'created_date': (expiry - timedelta(days=1)).strftime(
+                    '%Y-%m-%dT%H:%M:%SZ'),
+                'expiry_date': expiry.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            }
+        return keys
+
+    def __generate_sequence(self, show_id: int, episode_id: int, q: int,
+                            revisions: int, panels: int, shots: int,
+                            changed_panels: int):
+        seq_id = next(self.ids)
+        self.sequences[seq_id] = {'id': seq_id,
+                                  'show_id': show_id,
+                                  'episode_id': episode_id,
+                                  'tracking_code': 'seq{0}'.format(q + 1),
+                                  'revisions_count': revisions}
+        current = [self.__new_panel_revision(next(self.ids), 1)
+                   for _ in range(panels)]
+        panels_per_shot = max(1, panels // max(1, shots))
+        markers = [{'name': 'shot_{0:03d}'.format(i + 1),
+                    'start': i * panels_per_shot * 12}
+                   for i in range(min(shots, panels))]
+        for rev in range(1, revisions + 1):
+            if rev > 1:
+                current = list(current)
+                for i in range(min(changed_panels, panels)):
+                    current[i] = self.__new_panel_revision(
+                        current[i]['panel_id'], rev)
+            self.revisions[(seq_id, rev)] = {
+                'comment': 'revision {0}'.format(rev),
+                'markers': markers,
+                'panels': current,
+            }
+
+
+class mock_flix_handler(BaseHTTPRequestHandler):
+    """mock_flix_handler will forward the requests to the mock_flix of
+    the server, connections are kept alive
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Like production servers, do not wait to fill a packet
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        mock = self.server.mock
+        with mock.lock:
+            mock.connections += 1
+
+    def do_GET(self):
+        self.__reply('GET')
+
+    def do_POST(self):
+        self.__reply('POST')
+
+    def do_DELETE(self):
+        self.__reply('DELETE')
+
+    def log_message(self, format, *args):
+        pass
+
+    def __reply(self, method: str):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length > 0 else b''
+        status, content_type, data = self.server.mock.handle(
+            method, self.path, self.headers, body)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        mock = self.server.mock
+        with mock.lock:
+            mock.bytes_sent += len(data)
+
+
+def parse_cli():
+    parser = argparse.ArgumentParser(
+        description='Local stand-in for the Flix REST API')
+    parser.add_argument('--host', default='127.0.0.1', help='Host to bind')
+    parser.add_argument('--port', type=int, default=1234, help='Port to bind')
+    parser.add_argument('--shows', type=int, default=1)
+    parser.add_argument('--episodes', type=int, default=0,
+                        help='Episodes per show, 0 for non episodic shows')
+    parser.add_argument('--sequences', type=int, default=2)
+    parser.add_argument('--revisions', type=int, default=1)
+    parser.add_argument('--panels', type=int, default=100)
+    parser.add_argument('--shots', type=int, default=10)
+    parser.add_argument('--changed-panels', type=int, default=0,
+                        help='Panels changing in every sequence revision')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds added to every request')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Ratio of requests answered with a 500')
+    parser.add_argument('--render-time', type=float, default=0.0,
+                        help='Seconds to render a quicktime export')
+    parser.add_argument('--user', default='admin')
+    parser.add_argument('--password', default='admin')
+    parser.add_argument('--access-keys', type=int, default=0,
+                        help='Access keys of logged in users')
+    parser.add_argument('--max-seats', type=int, default=0,
+                        help='Seats of the license (default: as many as the '
+                        'access keys)')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_cli()
+    server = mock_flix(shows=args.shows,
+                       episodes=args.episodes,
+                       sequences=args.sequences,
+                       revisions=args.revisions,
+                       panels=args.panels,
+                       shots=args.shots,
+                       changed_panels=args.changed_panels,
+                       latency=args.latency,
+                       error_rate=args.error_rate,
+                       render_time=args.render_time,
+                       user=args.user,
+                       password=args.password,
+                       access_keys=args.access_keys,
+                       max_seats=args.max_seats)
+    print('Serving mock Flix on http://{0}:{1}'.format(args.host, args.port))
+    try:
+        server.serve_forever(args.host, args.port)
+    except KeyboardInterrupt:
+        pass
@@ -7,9 +7,12 @@ import binascii
 import hashlib
 import hmac
 import json
-import urllib2
+import threading
 from datetime import datetime, timedelta
 
+import pool
+import transport
+
 
 class flix:
     """Flix will handle the login and expose functions to get shows,
@@ -17,6 +20,9 @@ class flix:
     """
 
     def __init__(self):
+        self.token_lock = threading.Lock()
+        # Connections are kept open between requests
+        self.transport = transport.create()
         self.reset()
 
     def authenticate(self, hostname, login, password):
@@ -39,9 +45,8 @@ class flix:
             'Authorization': 'Basic ' + authdata.decode('UTF-8'),
         }
         try:
-            req = urllib2.Request(hostname + '/authenticate',
-                                  headers=header, data='')
-            response = urllib2.urlopen(req).read()
+            response = self.transport.request(
+                'POST', hostname + '/authenticate', '', header)
             response = json.loads(response)
             self.hostname = hostname
             self.login = login
@@ -60,8 +65,8 @@ class flix:
         headers = self.__get_headers(None, '/shows', 'GET')
         response = None
         try:
-            req = urllib2.Request(self.hostname + '/shows', headers=headers)
-            response = urllib2.urlopen(req).read()
+            response = self.transport.request(
+                'GET', self.hostname + '/shows', headers=headers)
             response = json.loads(response)
             response = response.get('shows')
         except BaseException:
@@ -82,8 +87,8 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            req = urllib2.Request(self.hostname + url, headers=headers)
-            response = urllib2.urlopen(req).read()
+            response = self.transport.request(
+                'GET', self.hostname + url, headers=headers)
             response = json.loads(response)
             response = response.get('episodes')
         except BaseException:
@@ -108,8 +113,8 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            req = urllib2.Request(self.hostname + url, headers=headers)
-            response = urllib2.urlopen(req).read()
+            response = self.transport.request(
+                'GET', self.hostname + url, headers=headers)
             response = json.loads(response)
             response = response.get('sequences')
         except BaseException:
@@ -135,8 +140,8 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            req = urllib2.Request(self.hostname + url, headers=headers)
-            response = urllib2.urlopen(req).read()
+            response = self.transport.request(
+                'GET', self.hostname + url, headers=headers)
             response = json.loads(response)
             response = response.get('panels')
         except BaseException:
@@ -162,8 +167,8 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            req = urllib2.Request(self.hostname + url, headers=headers)
-            response = urllib2.urlopen(req).read()
+            response = self.transport.request(
+                'GET', self.hostname + url, headers=headers)
             response = json.loads(response)
             response = response.get('dialogues')
         except BaseException:
@@ -189,8 +194,8 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            req = urllib2.Request(self.hostname + url, headers=headers)
-            response = urllib2.urlopen(req).read()
+            response = self.transport.request(
+                'GET', self.hostname + url, headers=headers)
             response = json.loads(response)
         except BaseException:
             print('Could not retrieve sequence revision')
@@ -212,8 +217,8 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            req = urllib2.Request(self.hostname + url, headers=headers)
-            response = urllib2.urlopen(req).read()
+            response = self.transport.request(
+                'GET', self.hostname + url, headers=headers)
             file = open(temp_filepath, 'wb')
             file.write(response)
             file.close()
@@ -254,9 +259,8 @@ class flix:
         headers = self.__get_headers(content, url, 'POST')
         response = None
         try:
-            req = urllib2.Request(self.hostname + url,
-                                  headers=headers, data=json.dumps(content))
-            response = urllib2.urlopen(req).read()
+            response = self.transport.request(
+                'POST', self.hostname + url, json.dumps(content), headers)
             response = json.loads(response)
         except BaseException:
             print('Could not create sequence revision')
@@ -287,15 +291,42 @@ class flix:
         headers = self.__get_headers(content, url, 'POST')
         response = None
         try:
-            req = urllib2.Request(self.hostname + url,
-                                  headers=headers, data=json.dumps(content))
-            response = urllib2.urlopen(req).read()
+            response = self.transport.request(
+                'POST', self.hostname + url, json.dumps(content), headers)
             response = json.loads(response)
         except BaseException:
             print('Could not create blank panel')
             return None
         return response
 
+    def new_panels(self, show_id, sequence_id, panels, workers=8):
+        """new_panels will create several panels concurrently, Flix has no
+        endpoint to create them in one request
+
+        Arguments:
+            show_id {int} -- Show ID
+
+            sequence_id {int} -- Sequence ID
+
+            panels {List} -- (asset_id, duration) of every panel to create,
+            asset_id is None for a blank panel
+
+            workers {int} -- Number of concurrent requests (default: {8})
+
+        Returns:
+            List -- Panels in the same order, None for the ones not created
+        """
+        if len(panels) < 1:
+            return []
+        self.check_token()
+        requests = pool.pool(min(workers, len(panels)))
+        tasks = [requests.submit(self.new_panel, show_id, sequence_id,
+                                 asset_id, duration)
+                 for asset_id, duration in panels]
+        created = [t.result() for t in tasks]
+        requests.shutdown()
+        return created
+
     def reset(self):
         """reset will reset the user info
         """
@@ -326,6 +357,12 @@ class flix:
             })
         return revisioned_panels
 
+    def check_token(self):
+        """check_token will request a token if needed, to call before
+        sending requests from several threads so they do not wait for it
+        """
+        self.__get_token()
+
     def __get_token(self):
         """__get_token will request a token and will reset it
         if it is too close to the expiry date
@@ -333,17 +370,19 @@ class flix:
         Returns:
             Tuple[str, str] -- Key and Secret
         """
-        if (self.key is None or self.secret is None or self.expiry is None or
-                datetime.now() + timedelta(hours=2) > self.expiry):
-            authentificationToken = self.authenticate(
-                self.hostname, self.login, self.password)
-            self.key = authentificationToken['id']
-            self.secret = authentificationToken['secret_access_key']
-            self.expiry = datetime.strptime(
-                authentificationToken
-                ['expiry_date'].split('.')[0],
-                '%Y-%m-%dT%H:%M:%S')
-        return self.key, self.secret
+        with self.token_lock:
+            if (self.key is None or self.secret is None or
+                    self.expiry is None or
+                    datetime.now() + timedelta(hours=2) > self.expiry):
+                authentificationToken = self.authenticate(
+                    self.hostname, self.login, self.password)
+                self.key = authentificationToken['id']
+                self.secret = authentificationToken['secret_access_key']
+                self.expiry = datetime.strptime(
+                    authentificationToken
+                    ['expiry_date'].split('.')[0],
+                    '%Y-%m-%dT%H:%M:%S')
+            return self.key, self.secret
 
     def __fn_sign(
             self, access_key_id, secret_access_key, url, content, http_method,
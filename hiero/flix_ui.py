@@ -2,10 +2,9 @@
 # Copyright (C) Foundry 2020
 #
 
-import os
 import re
 import sys
-import tempfile
+import threading
 from collections import OrderedDict
 
 from PySide2.QtCore import Signal
@@ -14,6 +13,9 @@ from PySide2.QtWidgets import (QApplication, QComboBox, QDialog, QErrorMessage,
                                QSizePolicy, QVBoxLayout, QWidget)
 
 import flix as flix_api
+import pool
+import revision_snapshot
+import thumb_cache
 
 
 class flix_ui(QWidget):
@@ -45,6 +47,10 @@ class flix_ui(QWidget):
     def __init__(self, *args, **kwargs):
         super(flix_ui, self).__init__(*args, **kwargs)
         self.flix_api = flix_api.flix()
+        self.thumb_cache = thumb_cache.thumb_cache()
+        self.pool = pool.pool()
+        self.snapshots = {}
+        self.snapshots_lock = threading.Lock()
         self.authenticated = False
         self.setSizePolicy(
             QSizePolicy.MinimumExpanding,
@@ -154,6 +160,55 @@ class flix_ui(QWidget):
         episode_id = self.episode_tracking_code[etc]
         return episode_id, etc
 
+    def get_snapshot(self, show_id, seq_id, seq_rev_number):
+        """get_snapshot will retrieve a sequence revision with its panels and
+        dialogues once, and reuse it until clear_snapshots is called
+
+        Arguments:
+            show_id {int} -- Show ID
+
+            seq_id {int} -- Sequence ID
+
+            seq_rev_number {int} -- Sequence revision number
+
+        Raises:
+            RuntimeError: Sequence revision, dialogues or panels not found
+
+        Returns:
+            revision_snapshot.revision_snapshot -- Sequence revision snapshot
+        """
+        key = (show_id, seq_id, seq_rev_number)
+        with self.snapshots_lock:
+            snapshot = self.snapshots.get(key)
+        if snapshot is None:
+            self.flix_api.check_token()
+            snapshot = revision_snapshot.revision_snapshot(
+                self.flix_api, show_id, seq_id, seq_rev_number, self.pool)
+            with self.snapshots_lock:
+                self.snapshots[key] = snapshot
+        return snapshot
+
+    def get_selected_snapshot(self):
+        """get_selected_snapshot will call get_snapshot for the selected
+        sequence
+
+        Raises:
+            RuntimeError: Sequence revision, dialogues or panels not found
+
+        Returns:
+            revision_snapshot.revision_snapshot -- Sequence revision snapshot
+        """
+        show_id, _, _ = self.get_selected_show()
+        seq_id, seq_rev_number, _ = self.get_selected_sequence()
+        return self.get_snapshot(show_id, seq_id, seq_rev_number)
+
+    def clear_snapshots(self):
+        """clear_snapshots will forget the retrieved sequence revisions,
+        to call at the start of an operation
+        """
+        with self.snapshots_lock:
+            self.snapshots = {}
+
     def get_markers_by_name(self):
         """get_markers will get the sequence_revision to have a
         mapping of markers: start -> marker_name
@@ -161,18 +216,11 @@ class flix_ui(QWidget):
         Returns:
             Dict -- Mapping start -> marker_name
         """
-        seq_id, seq_rev_number, _ = self.get_selected_sequence()
-        show_id, _, _ = self.get_selected_show()
-        sequence_revision = self.flix_api.get_sequence_rev(
-            show_id, seq_id, seq_rev_number)
-        if sequence_revision is None:
-            self.__error('Could not retreive sequence revision')
+        try:
+            return self.get_selected_snapshot().get_markers_by_name()
+        except RuntimeError as e:
+            self.__error(str(e))
             return []
-        markers_mapping = {}
-        markers = sequence_revision.get('meta_data', {}).get('markers', [])
-        for m in markers:
-            markers_mapping[m.get('start')] = m.get('name')
-        return OrderedDict(sorted(markers_mapping.items()))
 
     def get_dialogues_by_panel_id(self):
         """get_dialogues_by_panel_id will get the dialogues to have
@@ -181,17 +229,60 @@ class flix_ui(QWidget):
         Returns:
             Dict -- Mapping panel_id to dialogue
         """
-        seq_id, seq_rev_number, _ = self.get_selected_sequence()
+        try:
+            return self.get_selected_snapshot().get_dialogues_by_panel_id()
+        except RuntimeError as e:
+            self.__error(str(e))
+            return {}
+
+    def fetch_sequence(self, show_id, seq_id, seq_rev_number, seq_tc):
+        """fetch_sequence will retrieve what is needed to pull a sequence
+        revision, start the download of the thumbnails and plan the
+        timeline. It does not use Qt and can run in the background
+
+        Arguments:
+            show_id {int} -- Show ID
+
+            seq_id {int} -- Sequence ID
+
+            seq_rev_number {int} -- Sequence revision number
+
+            seq_tc {str} -- Sequence tracking code
+
+        Raises:
+            RuntimeError: Sequence revision, dialogues or panels not found
+
+        Returns:
+            revision_snapshot.revision_snapshot -- Sequence revision snapshot
+        """
+        snapshot = self.get_snapshot(show_id, seq_id, seq_rev_number)
+        snapshot.thumbs = self.prefetch_thumbs(snapshot.get_panels(), seq_tc)
+        snapshot.get_plan(seq_tc)
+        return snapshot
+
+    def fetch_selected_sequence(self):
+        """fetch_selected_sequence will call fetch_sequence for the
+        selected sequence
+
+        Raises:
+            RuntimeError: Sequence revision, dialogues or panels not found
+
+        Returns:
+            revision_snapshot.revision_snapshot -- Sequence revision snapshot
+        """
         show_id, _, _ = self.get_selected_show()
-        dialogues = self.get_flix_api().get_dialogues(
-            show_id, seq_id, seq_rev_number)
+        seq_id, seq_rev_number, seq_tc = self.get_selected_sequence()
+        return self.fetch_sequence(show_id, seq_id, seq_rev_number, seq_tc)
 
-        mapped_dialogues = {}
-        cleanr = re.compile('<.*?>|&([a-z0-9]+|#[0-9]{1,6}|#x[0-9a-f]{1,6});')
-        for d in dialogues:
-            t = d.get('text', '').replace('</p>', '\n')
-            mapped_dialogues[d.get('panel_id')] = re.sub(cleanr, '', t)
-        return mapped_dialogues
+    def get_sequences_to_pull(self):
+        """get_sequences_to_pull will return every sequence of the list,
+        to pull all the sequences
+
+        Returns:
+            List -- (tracking code, sequence ID, seq rev number) per sequence
+        """
+        return [(tc, s[0], s[1])
+                for tc, s in self.sequence_tracking_code.items()]
 
     def get_default_image_name(
             self,
@@ -223,37 +314,95 @@ class flix_ui(QWidget):
             panel_id,
             panel_revision)
 
-    def download_first_thumb(self, p):
-        temp_path = tempfile.mkdtemp()
+    def fetch_first_thumb(self, p, seq_tracking_code):
+        """fetch_first_thumb will return the path of the first thumbnail
+        of a panel, downloaded only if it is not in the thumbnail cache.
+        It does not use Qt and can run in the background
+
+        Arguments:
+            p {Dict} -- Panel entity
+
+            seq_tracking_code {str} -- Sequence tracking code
+
+        Raises:
+            RuntimeError: Thumbnail not found or not downloaded
+
+        Returns:
+            str -- Path of the thumbnail
+        """
         thumb_mo = p.get(
             'asset', {}).get(
             'media_objects', {}).get(
             'thumbnail', [])
         thumb_mo_id = None if len(thumb_mo) < 1 else thumb_mo[0].get('id')
         if thumb_mo_id is None:
-            self.__error('Could not retrieve thumbnail ID')
-            return None
-        _, _, seq_tracking_code = self.get_selected_sequence()
-        temp_filepath = os.path.join(
-            temp_path,
-            '{0}_{1}_{2}_.png'.format(
-                seq_tracking_code,
-                p.get('panel_id'),
-                p.get('revision_counter')))
+            raise RuntimeError('Could not retrieve thumbnail ID')
+        name = '{0}_{1}_{2}_.png'.format(
+            seq_tracking_code,
+            p.get('panel_id'),
+            p.get('revision_counter'))
+        temp_filepath = self.thumb_cache.fetch(
+            p.get('panel_id'),
+            p.get('revision_counter'),
+            thumb_mo_id,
+            name,
+            lambda path: self.flix_api.download_media_object(
+                path, thumb_mo_id))
+        if temp_filepath is None:
+            raise RuntimeError('Could not download thumbnail')
         if sys.platform == 'win32' or sys.platform == 'cygwin':
             temp_filepath = temp_filepath.replace('\\', '\\\\')
-        if self.flix_api.download_media_object(
-                temp_filepath, thumb_mo_id) is None:
-            self.__error('Could not download thumbnail')
-            return None
         return temp_filepath
 
+    def prefetch_thumbs(self, panels, seq_tracking_code):
+        """prefetch_thumbs will download the first thumbnail of the panels
+        in the background
+
+        Arguments:
+            panels {List} -- List of panels
+
+            seq_tracking_code {str} -- Sequence tracking code
+
+        Returns:
+            Dict -- Mapping (panel_id, revision_counter) -> task
+        """
+        self.flix_api.check_token()
+        tasks = {}
+        for p in panels:
+            key = (p.get('panel_id'), p.get('revision_counter'))
+            if key not in tasks:
+                tasks[key] = self.pool.submit(
+                    self.fetch_first_thumb, p, seq_tracking_code)
+        return tasks
+
+    def download_first_thumb(self, p, thumb_task=None):
+        """download_first_thumb will return the path of the first thumbnail
+        of a panel
+
+        Arguments:
+            p {Dict} -- Panel entity
+
+            thumb_task {pool.task} -- Prefetch of the thumbnail
+            (default: {None})
+
+        Returns:
+            str -- Path of the thumbnail
+        """
+        try:
+            if thumb_task is not None:
+                return thumb_task.result()
+            _, _, seq_tracking_code = self.get_selected_sequence()
+            return self.fetch_first_thumb(p, seq_tracking_code)
+        except RuntimeError as e:
+            self.__error(str(e))
+            return None
+
     def get_panels(self):
-        show_id, _, _ = self.get_selected_show()
-        seq_id, seq_rev_number, _ = self.get_selected_sequence()
-        return self.get_flix_api().get_panels(show_id,
-                                              seq_id,
-                                              seq_rev_number)
+        try:
+            return self.get_selected_snapshot().get_panels()
+        except RuntimeError as e:
+            self.__error(str(e))
+            return None
 
     def handle_duplicate_panels(self, panels):
         """handle_duplicate_panels will handle duplicate panels
@@ -262,25 +411,67 @@ class flix_ui(QWidget):
         Arguments:
             panels {List} -- List of Panels
 
+        Raises:
+            RuntimeError: Panels not created
+
         Returns:
             List -- List of panels
         """
         show_id, _, _ = self.get_selected_show()
         seq_id, _, _ = self.get_selected_sequence()
         uniq_p = {}
+        duplicates = []
         for i, p in enumerate(panels):
             uid = '{0}-{1}'.format(p.get('panel_id'), p.get('revision_number'))
             if uid in uniq_p:
-                panels[i] = self.duplicate_panel(show_id, seq_id, p)
+                duplicates.append(i)
                 continue
             uniq_p[uid] = True
+        created = self.flix_api.new_panels(
+            show_id, seq_id,
+            [(panels[i]['asset']['asset_id'], panels[i]['duration'])
+             for i in duplicates])
+        for i, new_panel in zip(duplicates, created):
+            panels[i] = self.__format_new_panel(new_panel,
+                                                panels[i]['duration'])
         return panels
 
-    def create_blank_panel(self):
-        blank_panel = self.flix_api.new_panel(show_id, sequence_id)
-        blank_panel['panel_id'] = blank_panel.get('id')
-        blank_panel['revision_number'] = 1
-        return blank_panel
+    def create_blank_panel(self, show_id, sequence_id):
+        """create_blank_panel will create a panel without asset
+
+        Arguments:
+            show_id {int} -- Show ID
+
+            sequence_id {int} -- Sequence ID
+
+        Raises:
+            RuntimeError: Panel not created
+
+        Returns:
+            Dict -- New blank Panel
+        """
+        return self.create_blank_panels(show_id, sequence_id, 1)[0]
+
+    def create_blank_panels(self, show_id, sequence_id, count):
+        """create_blank_panels will create several panels without asset
+        concurrently
+
+        Arguments:
+            show_id {int} -- Show ID
+
+            sequence_id {int} -- Sequence ID
+
+            count {int} -- Number of panels
+
+        Raises:
+            RuntimeError: Panels not created
+
+        Returns:
+            List -- New blank Panels
+        """
+        created = self.flix_api.new_panels(
+            show_id, sequence_id, [(None, 12)] * count)
+        return [self.__format_new_panel(p) for p in created]
 
     def duplicate_panel(self, show_id, sequence_id, p):
         """duplicate_panel wil duplicate a panel and reuse his asset
@@ -292,14 +483,37 @@ class flix_ui(QWidget):
 
             p {Dict} -- Panel to duplicate
 
+        Raises:
+            RuntimeError: Panel not created
+
         Returns:
             Dict -- New Duplicated Panel
         """
         new_panel = self.flix_api.new_panel(
             show_id, sequence_id, p['asset']['asset_id'], p['duration'])
+        return self.__format_new_panel(new_panel, p['duration'])
+
+    def __format_new_panel(self, new_panel, duration=None):
+        """__format_new_panel will format a created panel like the panels
+        of a sequence revision
+
+        Arguments:
+            new_panel {Dict} -- Panel created in Flix
+
+            duration {int} -- Duration to keep (default: {None})
+
+        Raises:
+            RuntimeError: Panel not created
+
+        Returns:
+            Dict -- Panel
+        """
+        if new_panel is None:
+            raise RuntimeError('Could not create panel')
         new_panel['panel_id'] = new_panel.get('id')
         new_panel['revision_number'] = 1
-        new_panel['duration'] = p['duration']
+        if duration is not None:
+            new_panel['duration'] = duration
         return new_panel
 
     def get_media_object_per_shots(self, fn_progress):
@@ -2,9 +2,7 @@
 # Copyright (C) Foundry 2020
 #
 
-import re
-
-from hiero.core import (Bin, BinItem, Format, Sequence, Tag, VideoTrack,
+from hiero.core import (Bin, BinItem, Format, Sequence, VideoTrack,
                         findProjectTags, newProject, project)
 from hiero.ui import activeSequence, windowManager
 
@@ -14,11 +12,24 @@ class hiero_c:
     """
 
     def __init__(self):
-        self.preset_comment_tag = self.get_project_tag('Comment')
-        self.preset_fr_tag_tag = self.get_project_tag('France')
-        self.preset_ready_to_start_tag = self.get_project_tag(
-            'Ready To Start')
-        self.preset_ref_tag = self.get_project_tag('Reference')
+        # Preset tags are looked up on first use, not when the plugin loads
+        self.preset_tags = {}
+        # Revision bins and clips per sequence bin, updated as they are
+        # created: (project name, bin name) -> {'bin', 'bins', 'clips'}
+        self.bin_index = {}
+
+    def get_preset_tag(self, tag_name):
+        """get_preset_tag will retrieve a preset tag once and reuse it
+
+        Arguments:
+            tag_name {str} -- tag name
+
+        Returns:
+            Dict -- Hiero Tag
+        """
+        if tag_name not in self.preset_tags:
+            self.preset_tags[tag_name] = self.get_project_tag(tag_name)
+        return self.preset_tags[tag_name]
 
     def get_project_tag(self, tag_name):
         """get_project_tag will retreive a preset tag
@@ -59,7 +70,8 @@ class hiero_c:
             source_clip,
             duration=12,
             tags=[],
-            last_track_item=None):
+            last_track_item=None,
+            timeline_in=None):
         """add_track_item will add a trackitem to a track, it will
         add a source and tags
 
@@ -76,6 +88,9 @@ class hiero_c:
 
             last_track_item {[type]} -- previous track item (default: {None})
 
+            timeline_in {int} -- First frame of the track item, instead of
+            after the previous track item (default: {None})
+
         Returns:
             Dict -- New Track Item
         """
@@ -83,7 +98,10 @@ class hiero_c:
         track_item.setSource(source_clip)
         for t in tags:
             track_item.addTag(t)
-        if last_track_item:
+        if timeline_in is not None:
+            track_item.setTimelineIn(timeline_in)
+            track_item.setTimelineOut(timeline_in + duration - 1)
+        elif last_track_item:
             track_item.setTimelineIn(last_track_item.timelineOut() + 1)
             track_item.setTimelineOut(last_track_item.timelineOut() + duration)
         else:
@@ -123,40 +141,112 @@ class hiero_c:
         Returns:
             Dict -- Hiero Bin
         """
-        b = host_b.bins()
-        for seq_bin in b:
-            if seq_bin.name() == bin_name:
-                return seq_bin, True
-        return Bin(bin_name), False
+        bins = self.__get_index(host_b)['bins']
+        seq_bin = bins.get(bin_name)
+        if seq_bin is not None and self.is_alive(seq_bin):
+            return seq_bin, True
+        bins[bin_name] = Bin(bin_name)
+        return bins[bin_name], False
 
     def get_clips(self, seq_bin):
-        """get_clips will retrieve all the clips from the bin
+        """get_clips will retrieve all the clips from the bin, the bin is
+        only scanned the first time. The returned mapping is kept in the
+        index, clips added to it are found by the next pulls
+
+        Arguments:
+            seq_bin {Dict} -- bin of the sequence
+
+        Returns:
+            Dict -- Mapping clip name -> clip
+        """
+        return self.__get_index(seq_bin)['clips']
+
+    def find_latest_sequence(self, seq_bin, seq_tracking_code, max_rev):
+        """find_latest_sequence will find the sequence of the latest
+        revision pulled before in the sequence bin
+
+        Arguments:
+            seq_bin {Dict} -- bin of the sequence
+
+            seq_tracking_code {str} -- Sequence tracking code
+
+            max_rev {int} -- Highest sequence revision number to consider
+
+        Returns:
+            Tuple[Dict, int, Dict] -- Sequence, revision number, bin
+        """
+        bins = self.__get_index(seq_bin)['bins']
+        for rev in range(max_rev, 0, -1):
+            b = bins.get('v{0}'.format(rev))
+            if b is None or not self.is_alive(b):
+                continue
+            name = 'Flix_{0}_v{1}'.format(seq_tracking_code, rev)
+            for item in b.sequences():
+                if item.name() == name:
+                    return item.activeItem(), rev, b
+        return None, None, None
+
+    def get_effects(self, track):
+        """get_effects will return all the effects of a track
+
+        Arguments:
+            track {Dict} -- Hiero Track
+
+        Returns:
+            List -- Effects
+        """
+        effects = []
+        for sub_track in track.subTrackItems():
+            effects.extend(sub_track)
+        return effects
+
+    def is_alive(self, item):
+        """is_alive will check that a bin or a clip has not been deleted
+
+        Arguments:
+            item {Dict} -- Hiero bin or clip
+
+        Returns:
+            bool -- Still in the project or not
+        """
+        try:
+            item.name()
+        except RuntimeError:
+            return False
+        return True
+
+    def __get_index(self, seq_bin):
+        """__get_index will return the index of a sequence bin, it is built
+        with one scan of the bin the first time
 
         Arguments:
             seq_bin {Dict} -- bin of the sequence
 
         Returns:
-            [type] -- [description]
+            Dict -- bin, revision bins by name and clips by name
         """
-        clips = {}
+        key = (seq_bin.project().name(), seq_bin.name())
+        index = self.bin_index.get(key)
+        if index is not None and self.is_alive(index['bin']):
+            return index
+        index = {'bin': seq_bin, 'bins': {}, 'clips': {}}
         for b in seq_bin.bins():
+            index['bins'][b.name()] = b
             for c in b.clips():
-                clips[c.name()] = c.activeItem()
-        return clips
+                index['clips'][c.name()] = c.activeItem()
+        self.bin_index[key] = index
+        return index
 
     def create_comment_tag(self, comment):
         """create_comment_tag will create a comment tag
 
         Arguments:
-            comment {str} -- Comment
+            comment {str} -- Comment, without html (see timeline_plan)
 
         Returns:
             Dict -- Hiero Tag
         """
-        t = self.preset_comment_tag.copy()
-        cleanr = re.compile(
-            '<.*?>|&([a-z0-9]+|#[0-9]{1,6}|#x[0-9a-f]{1,6});')
-        comment = re.sub(cleanr, '', comment)
+        t = self.get_preset_tag('Comment').copy()
         t.setNote(comment)
         return t
 
@@ -171,7 +261,7 @@ class hiero_c:
         Returns:
             Dict -- Hiero Tag
         """
-        t = self.preset_ready_to_start_tag.copy()
+        t = self.get_preset_tag('Ready To Start').copy()
         t.setNote(marker_name)
         t.metadata().setValue('tag.start', '{0}'.format(in_time))
         t.metadata().setValue('tag.length', '{0}'.format(1))
@@ -190,7 +280,7 @@ class hiero_c:
         Returns:
             Dict -- Hiero Tags
         """
-        t = self.preset_fr_tag_tag.copy()
+        t = self.get_preset_tag('France').copy()
         t.setNote(note)
         t.setVisible(False)
         return t
@@ -256,6 +346,22 @@ class hiero_c:
         """
         return Sequence(name)
 
+    def clone_sequence(self, sequence, name):
+        """clone_sequence will copy a sequence with its tracks, track items,
+        effects and tags
+
+        Arguments:
+            sequence {Dict} -- Hiero Sequence to copy
+
+            name {str} -- Name of the copy
+
+        Returns:
+            Dict -- Hiero Sequence
+        """
+        clone = sequence.clone()
+        clone.setName(name)
+        return clone
+
     def sequence_to_bin_item(self, seq):
         """sequence_to_bin_item will make an Sequence as bin item
 
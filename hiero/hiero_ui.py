@@ -7,10 +7,12 @@ import sys
 import uuid
 
 from PySide2.QtCore import Signal
-from PySide2.QtWidgets import (QApplication, QHBoxLayout, QPushButton,
-                               QSizePolicy, QWidget)
+from PySide2.QtWidgets import (QApplication, QCheckBox, QHBoxLayout,
+                               QPushButton, QSizePolicy, QWidget)
 
 import hiero_c as hiero_api
+import timeline_diff
+import timeline_plan
 
 
 class hiero_ui(QWidget):
@@ -31,10 +33,24 @@ class hiero_ui(QWidget):
         pull.clicked.connect(self.on_pull_latest)
         update = QPushButton("Update in Flix")
         update.clicked.connect(self.on_update_in_flix)
+        self.incremental = QCheckBox('Update existing sequence')
+        self.incremental.setToolTip(
+            'Pull Latest updates the sequence of the previous revision '
+            'instead of creating a new one')
         h_action.addWidget(pull)
         h_action.addWidget(update)
+        h_action.addWidget(self.incremental)
         self.setLayout(h_action)
 
+    def is_incremental(self):
+        """is_incremental will return if Pull Latest should update the
+        sequence of the previous revision
+
+        Returns:
+            bool -- Update the existing sequence or not
+        """
+        return self.incremental.isChecked()
+
     def on_pull_latest(self):
         """on_pull_latest callback of the pull latest event
         """
@@ -63,91 +79,41 @@ class hiero_ui(QWidget):
             shot = self.hiero_api.create_video_track('Shots')
         return track, shot
 
-    def add_dialogue(self, mapped_dialogue, panel_id, track, prev):
+    def add_dialogue(self, track, track_item, panel_id, message):
         """add_dialogue will create a dialogue and add it to the track
 
         Arguments:
-            mapped_dialogue {Dict} -- mapping of dialogue to ensure there is a
-            dialogue for the panel
-
-            panel_id {int} -- Panel ID
-
             track {dict} -- Track to add the dialogue
 
-            prev {Dict} -- Previous trackitem
-        """
-        if panel_id in mapped_dialogue:
-            settings = {
-                'name': 'dialogue-[{0}]'.format(uuid.uuid4()),
-                'message': mapped_dialogue[panel_id],
-                'opacity': .6,
-                'global_font_scale': .3,
-                'enable_background': True,
-                'background_opacity': .6,
-                'box': (0, 0, 1000, 562),
-                'xjustify': 1,
-                'yjustify': 2
-            }
-            self.hiero_api.add_dialogue_track_effect(track, prev, settings)
-
-    def add_burnin(
-            self,
-            panels,
-            panel_in,
-            markers_map,
-            current_marker,
-            marker_in,
-            shots,
-            p,
-            i):
-        """add_burnin will add a burnin in a VideoTrack
-
-        Arguments:
-            panels {List} -- List of Panels
-
-            panel_in {int} -- First frame of the panel (from whole timeline)
+            track_item {Dict} -- Track item of the panel
 
-            markers_map {Dict} -- Mapping of markers
-
-            current_marker {str} -- Current Marker
-
-            marker_in {int} -- First frame of the marker to add as burnin
-
-            shots {Dict} -- Video track to add the burnin
-
-            p {Dict} -- Panel
-
-            i {int} -- Posiion of the panel
+            panel_id {int} -- Panel ID
 
-        Returns:
-            int -- Value of the panel marker in
+            message {str} -- Dialogue without html
         """
-        if panel_in in markers_map and markers_map[panel_in] != current_marker:
-            if marker_in is not None:
-                self.create_burnin(
-                    shots,
-                    marker_in,
-                    panel_in - 1,
-                    markers_map[panel_in])
-            marker_in = panel_in
-        if len(panels) - 1 == i and marker_in is not None:
-            self.create_burnin(
-                shots,
-                marker_in,
-                panel_in +
-                p.get('duration') -
-                1,
-                current_marker)
-        return marker_in
+        settings = {
+            'name': 'dialogue-{0}-[{1}]'.format(panel_id, uuid.uuid4()),
+            'message': message,
+            'opacity': .6,
+            'global_font_scale': .3,
+            'enable_background': True,
+            'background_opacity': .6,
+            'box': (0, 0, 1000, 562),
+            'xjustify': 1,
+            'yjustify': 2
+        }
+        self.hiero_api.add_dialogue_track_effect(track, track_item, settings)
 
     def get_panels_from_sequence(
             self,
             sequence,
             show_id,
             sequence_id,
-            blank_panel):
+            blank_panels,
+            sidecar=None):
         """get_panels_from_sequence will retrieve all the clips and format
-        them as panels from a hiero sequence
+        them as panels from a hiero sequence, with their duration.
+        The clips without panel get blank panels, created together
 
         Arguments:
             sequence {Dict} -- Video Track Sequence
@@ -156,40 +122,91 @@ class hiero_ui(QWidget):
 
             sequence_id {int} -- Sequence ID
 
-            blank_panel {Callable[[], None]} -- Callback to create blank panel
+            blank_panels {Callable[[int, int, int], List]} -- Callback to
+            create blank panels: show ID, sequence ID, count
+
+            sidecar {Dict} -- Sidecar index of the sequence, see get_sidecar
+            (default: {None})
 
         Returns:
             List -- List of panels
         """
         panels = []
+        blanks = []
         for track_item in sequence.items():
-            panel_info = None
-            tags_note = self.hiero_api.get_item_tags_note(track_item, 'France')
-            if len(tags_note) > 0:
-                panel_info = tags_note[0]
-            if panel_info is None:
-                panels.append(json.dumps(blank_panel()))
-            else:
-                panels.append(panel_info)
+            panel = None
+            for tag in track_item.tags():
+                if tag.name() == 'France':
+                    panel = timeline_plan.read_panel_info(
+                        tag.note(), sidecar or {})
+                    break
+            if panel is None:
+                panel = {}
+                blanks.append(len(panels))
+            panel['duration'] = int(track_item.duration())
+            panels.append(panel)
+        if len(blanks) > 0:
+            created = blank_panels(show_id, sequence_id, len(blanks))
+            for i, blank_panel in zip(blanks, created):
+                blank_panel['duration'] = panels[i]['duration']
+                panels[i] = blank_panel
         return panels
 
-    def update_panel_from_sequence(self, sequence, panels):
-        """update_panel_from_sequence will update panels depending
-        on hiero sequence
+    def add_sidecar_tag(self, sequence, note):
+        """add_sidecar_tag will add a hidden tag to the sequence holding
+        what the panel info tags do not: the dialogue of every panel
 
         Arguments:
-            sequence {Dict} -- Video Track Sequence
+            sequence {Dict} -- Hiero Sequence
+
+            note {str} -- Sidecar note, see timeline_plan.sidecar_note
+        """
+        for tag in sequence.tags():
+            if tag.name() == 'France' and '"sidecar"' in tag.note():
+                sequence.removeTag(tag)
+        sequence.addTag(self.hiero_api.create_info_tag(note))
+
+    def get_panel_uid(self, track_item):
+        """get_panel_uid will return the panel revision of a track item
 
-            panels {List} -- List of Panels
+        Arguments:
+            track_item {Dict} -- Hiero Track Item
 
         Returns:
-            List -- List of Panels
+            str -- panel_id-revision_number, None without panel info tag
         """
-        for i, track_item in enumerate(sequence.items()):
-            panel = json.loads(panels[i])
-            panel['duration'] = int(track_item.duration())
-            panels[i] = panel
-        return panels
+        for tag in track_item.tags():
+            if tag.name() == 'France':
+                return timeline_diff.panel_uid(json.loads(tag.note()))
+        return None
+
+    def clear_markers(self, sequence):
+        """clear_markers will remove the markers added to a sequence
+
+        Arguments:
+            sequence {Dict} -- Hiero Sequence
+        """
+        for tag in sequence.tags():
+            if tag.name() == 'Ready To Start':
+                sequence.removeTag(tag)
+
+    def get_sidecar(self, sequence):
+        """get_sidecar will retrieve the sidecar index of a sequence
+
+        Arguments:
+            sequence {Dict} -- Hiero Sequence
+
+        Returns:
+            Dict -- Mapping panel_id-revision_number -> panel info
+        """
+        for note in self.hiero_api.get_item_tags_note(sequence, 'France'):
+            try:
+                info = json.loads(note)
+            except ValueError:
+                continue
+            if 'sidecar' in info:
+                return info['sidecar']
+        return {}
 
     def get_markers_from_sequence(self, sequence):
         """get_markers_from_sequence will retrieve all the
@@ -213,69 +230,35 @@ class hiero_ui(QWidget):
                 })
         return markers
 
-    def get_comment_tag(self, p):
-        """get_comment_tag will make a copy of a comment tag and set
-        his comment as a note
+    def get_track_item_tags(self, item):
+        """get_track_item_tags will create the tags of a track item: its
+        comment and the tag referencing the panel
 
         Arguments:
-            p {Dict} -- Panel
-
-        Returns:
-            Dict -- Hiero Tag
-        """
-        comment = p.get('latest_open_note', {}).get('body', None)
-        t = None
-        if comment is not None:
-            t = self.hiero_api.create_comment_tag(comment)
-        return t
-
-    def add_panel_info_tag(self, p, tags):
-        """add_panel_info_tag will add a tag of the panel info
-
-        Arguments:
-            p {Dict} -- Panel
-
-            tags {List} -- List of all tags
+            item {Dict} -- Track item of a timeline_plan
 
         Returns:
             List -- List of all tags
         """
-        t = self.hiero_api.create_info_tag(json.dumps(p))
-        tags.append(t)
+        tags = []
+        if item['comment'] is not None:
+            tags.append(self.hiero_api.create_comment_tag(item['comment']))
+        tags.append(self.hiero_api.create_info_tag(item['info']))
         return tags
 
-    def add_marker(self, markers_mapping, panel_in, sequence):
+    def add_marker(self, sequence, marker_in, marker_name):
         """add_marker will add a marker in the sequence
 
         Arguments:
-            markers_mapping {Dict} -- Mapping of markers
-
-            panel_in {int} -- First frame of the panel
-            (from the whole sequence)
-
             sequence {Dict} -- Hiero Sequence
-        """
-        if panel_in in markers_mapping:
-            tag = self.hiero_api.create_marker_tag(
-                panel_in,
-                markers_mapping[panel_in])
-            sequence.addTagToRange(tag, panel_in, panel_in + 1)
-
-    def add_comment(self, p, tags):
-        """add_comment will add a tag comment to the list
-
-        Arguments:
-            p {Dict} -- Panel
 
-            tags {List} -- List of all tags
+            marker_in {int} -- First frame of the marker
+            (from the whole sequence)
 
-        Returns:
-            List -- List of all tags
+            marker_name {str} -- Marker Name
         """
-        comment_tag = self.get_comment_tag(p)
-        if comment_tag is not None:
-            tags.append(comment_tag)
-        return tags
+        tag = self.hiero_api.create_marker_tag(marker_in, marker_name)
+        sequence.addTagToRange(tag, marker_in, marker_in + 1)
 
     def create_burnin(self, track, fr, to, burnin_name):
         """create_burnin will create a burnin and add it to the track
@@ -305,13 +288,13 @@ class hiero_ui(QWidget):
         }
         self.hiero_api.add_burnin_track_effect(track, fr, to, settings)
 
-    def pull_to_sequence(self,
-                         show_tc,
-                         seq_rev_tc,
-                         seq_tracking_code,
-                         fn_update):
-        """pull_to_sequence will pull to hiero a project, sequence and
-        sequence revision bin, as well as a new Sequence
+    def get_sequence_bins(self,
+                          show_tc,
+                          seq_rev_tc,
+                          seq_tracking_code,
+                          fn_update):
+        """get_sequence_bins will pull to hiero a project, sequence and
+        sequence revision bin
 
         Arguments:
             show_tc {str} -- Show tracking code
@@ -323,7 +306,7 @@ class hiero_ui(QWidget):
             fn_update {Callable[[str], None]} -- Update callback
 
         Returns:
-            Tuple[Dict, Dict, Dict] -- Seq, Seq bin, Seq rev bin
+            Tuple[Dict, Dict] -- Seq bin, Seq rev bin
         """
         hiero_project_name = 'Flix_{0}'.format(show_tc)
         fn_update('Get / Create hiero project: {0}'.format(hiero_project_name))
@@ -341,7 +324,30 @@ class hiero_ui(QWidget):
             seq, seqrev_bin_name)
         if seq_rev_bin_reused is False:
             seq.addItem(seq_rev_bin)
+        return seq, seq_rev_bin
+
+    def pull_to_sequence(self,
+                         show_tc,
+                         seq_rev_tc,
+                         seq_tracking_code,
+                         fn_update):
+        """pull_to_sequence will pull to hiero a project, sequence and
+        sequence revision bin, as well as a new Sequence
+
+        Arguments:
+            show_tc {str} -- Show tracking code
+
+            seq_rev_tc {str} -- Sequence rev tracking code
+
+            seq_tracking_code {str} -- Sequence tracking code
 
+            fn_update {Callable[[str], None]} -- Update callback
+
+        Returns:
+            Tuple[Dict, Dict, Dict] -- Seq, Seq bin, Seq rev bin
+        """
+        seq, seq_rev_bin = self.get_sequence_bins(
+            show_tc, seq_rev_tc, seq_tracking_code, fn_update)
         sequence_name = 'Flix_{0}_v{1}'.format(
                 seq_tracking_code,
                 seq_rev_tc)
@@ -4,17 +4,13 @@
 
 from PySide2.QtCore import QCoreApplication
 from PySide2.QtWidgets import (QDialog, QErrorMessage, QInputDialog,
-                               QMessageBox, QVBoxLayout, QProgressDialog)
+                               QMessageBox, QVBoxLayout)
 
 import flix_ui as flix_widget
-import hiero_c as hiero_api
 import hiero_ui as hiero_widget
-
-
-class progress_canceled(Exception):
-    """progress_canceled is an exception for the progress cancelled
-    """
-    pass
+import pool
+import progress
+import timeline_diff
 
 
 class main_dialogue(QDialog):
@@ -34,7 +30,7 @@ class main_dialogue(QDialog):
         v_main_box.addWidget(self.wg_hiero_ui)
         self.setLayout(v_main_box)
 
-    def create_clip(self, seq_rev, p, clip_name, clips):
+    def create_clip(self, seq_rev, p, clip_name, clips, thumb_task=None):
         """create_clip will create a clip or reuse one and download image
 
         Arguments:
@@ -46,14 +42,24 @@ class main_dialogue(QDialog):
 
             clips {List} -- List of all clips
 
+            thumb_task {pool.task} -- Prefetch of the image (default: {None})
+
         Returns:
             Dict -- Clip created / reused
         """
-        if clip_name not in clips:
-            temp_filepath = self.wg_flix_ui.download_first_thumb(p)
+        clip = clips.get(clip_name)
+        if clip is None or not self.wg_hiero_ui.hiero_api.is_alive(clip):
+            if thumb_task is not None:
+                # Keep the UI responsive while the prefetch finishes
+                while not thumb_task.wait(0.05):
+                    self.__update_progress(
+                        'Download thumbnail: {0}'.format(clip_name))
+            temp_filepath = self.wg_flix_ui.download_first_thumb(
+                p, thumb_task)
             if temp_filepath is None:
                 return
-            return seq_rev.createClip(temp_filepath)
+            # clips is the index of the sequence bin, kept for next pulls
+            clips[clip_name] = seq_rev.createClip(temp_filepath)
         return clips[clip_name]
 
     def create_video_track(
@@ -62,7 +68,8 @@ class main_dialogue(QDialog):
             seq_bin,
             seq_rev_bin,
             seq_id,
-            seq_rev_number):
+            seq_rev_number,
+            data=None):
         """create_video_track will create 2 videos tracks, one for the
         sequence and one for shots
 
@@ -77,120 +84,313 @@ class main_dialogue(QDialog):
 
             seq_rev_number {int} -- Sequence revision number
 
+            data {revision_snapshot} -- Sequence revision already retrieved
+            with fetch_sequence (default: {None})
+
         Returns:
             Tuple[Dict, Dict] -- VideoTrack, ShotTrack
         """
-        _, seq_rev_nbr, seq_tc = self.wg_flix_ui.get_selected_sequence()
-        self.__update_progress('Get dialogues by panel id')
-        mapped_dialogue = self.wg_flix_ui.get_dialogues_by_panel_id()
-        self.__update_progress('Get markers by name')
-        markers_mapping = self.wg_flix_ui.get_markers_by_name()
-        self.__update_progress('Get panels')
-        panels = self.wg_flix_ui.get_panels()
-        if panels is None:
-            self.__error('Could not retreive panels')
-            return
-
-        vt_track_name = 'Flix_{0}_v{1}'.format(
-            seq_tc, seq_rev_nbr)
-        vt_shot_name = 'Shots' if len(markers_mapping) > 0 else None
+        _, _, seq_tc = self.wg_flix_ui.get_selected_sequence()
+        if data is None:
+            try:
+                data = self.fetch_selected_sequence()
+            except RuntimeError as e:
+                self.__error(str(e))
+                return None, None
+        plan = data.get_plan(seq_tc)
+
+        vt_shot_name = 'Shots' if len(plan.markers) > 0 else None
         self.__update_progress('Create video tracks')
-        track, shots = self.wg_hiero_ui.create_video_tracks(vt_track_name,
+        track, shots = self.wg_hiero_ui.create_video_tracks(plan.track_name,
                                                             vt_shot_name)
         self.__update_progress('Get clips from Hiero')
         clips = self.wg_hiero_ui.hiero_api.get_clips(seq_bin)
+        self.wg_hiero_ui.add_sidecar_tag(sequence, plan.sidecar)
+
+        if self.add_track_items(track, seq_rev_bin, clips, plan.items,
+                                data.thumbs):
+            self.add_markers_and_burnins(sequence, shots, plan)
+        return track, shots
+
+    def fetch_selected_sequence(self):
+        """fetch_selected_sequence will retrieve the selected sequence
+        revision and plan its timeline in the background, while the
+        progress stays responsive
+
+        Raises:
+            RuntimeError: Sequence revision, dialogues or panels not found
+
+        Returns:
+            revision_snapshot.revision_snapshot -- Sequence revision snapshot
+        """
+        show_id, _, _ = self.wg_flix_ui.get_selected_show()
+        seq_id, seq_rev_number, seq_tc = (
+            self.wg_flix_ui.get_selected_sequence())
+        t = pool.start(self.wg_flix_ui.fetch_sequence,
+                       show_id, seq_id, seq_rev_number, seq_tc)
+        while not t.wait(0.05):
+            self.__update_progress('Get markers, dialogues and panels')
+        return t.result()
+
+    def add_track_items(self, track, seq_rev_bin, clips, items, thumbs):
+        """add_track_items will add the track items planned for the panels
+        with their clip, tags and dialogue
+
+        Arguments:
+            track {Dict} -- Video Track
 
-        prev = None
-        panel_in = 0
-        marker_in = None
-        prev_marker_name = None
-        for i, p in enumerate(panels):
-            tags = []
-            panel_id = p.get('panel_id')
-            clip_name = '{0}_{1}_{2}_'.format(
-                seq_tc, panel_id, p.get(
-                    'revision_counter'))
-            self.__update_progress('Create clip: {0}'.format(clip_name))
-            clip = self.create_clip(seq_rev_bin, p, clip_name, clips)
+            seq_rev_bin {Dict} -- Sequence revision Bin
+
+            clips {Dict} -- Clips of the sequence bin
+
+            items {List} -- Track items of a timeline_plan
+
+            thumbs {Dict} -- Thumbnail downloads per panel, see
+            prefetch_thumbs
+
+        Returns:
+            bool -- False if a clip could not be created
+        """
+        hiero_api = self.wg_hiero_ui.hiero_api
+        self.progress.add_steps(len(items))
+        for item in items:
+            clip_name = item['clip_name']
+            self.__update_progress('Add panel: {0}'.format(clip_name), False)
+            clip = self.create_clip(seq_rev_bin, item['panel'], clip_name,
+                                    clips, thumbs.get(item['thumb']))
             if clip is None:
                 self.__error('could not create clip: {0}'.format(clip_name))
-                return track, shots
-
-            # Add comment
-            self.__update_progress('Add comment')
-            tags = self.wg_hiero_ui.add_comment(p, tags)
-            # Add panel info
-            self.__update_progress('Add clip info')
-            tags = self.wg_hiero_ui.add_panel_info_tag(p, tags)
-            # Add marker
-            self.__update_progress('Add marker')
-            self.wg_hiero_ui.add_marker(markers_mapping, panel_in, sequence)
-            # Add track item
-            self.__update_progress('Add track item')
-            prev = self.wg_hiero_ui.hiero_api.add_track_item(
-                track, clip_name, clip, p.get('duration'), tags, prev)
-            # Add dialogue
-            self.__update_progress('Add dialogue')
-            self.wg_hiero_ui.add_dialogue(
-                mapped_dialogue, panel_id, track, prev)
-            # Add burnin
-            self.__update_progress('Add burnin')
-            marker_in = self.wg_hiero_ui.add_burnin(
-                panels,
-                panel_in,
-                markers_mapping,
-                prev_marker_name,
-                marker_in,
-                shots,
-                p,
-                i)
-
-            if panel_in in markers_mapping:
-                prev_marker_name = markers_mapping[panel_in]
-            panel_in = panel_in + p.get('duration')
+                return False
+            track_item = hiero_api.add_track_item(
+                track, clip_name, clip, item['duration'],
+                self.wg_hiero_ui.get_track_item_tags(item),
+                timeline_in=item['in'])
+            if item['dialogue'] is not None:
+                self.wg_hiero_ui.add_dialogue(
+                    track, track_item, item['panel'].get('panel_id'),
+                    item['dialogue'])
+        return True
+
+    def add_markers_and_burnins(self, sequence, shots, plan):
+        """add_markers_and_burnins will add the markers to the sequence and
+        a burnin per shot to the shots track
+
+        Arguments:
+            sequence {Dict} -- Hiero Sequence
+
+            shots {Dict} -- Shots track
+
+            plan {timeline_plan.timeline_plan} -- Timeline to create
+        """
+        self.__update_progress('Add markers and burnins')
+        for marker_in, marker_name in plan.markers:
+            self.wg_hiero_ui.add_marker(sequence, marker_in, marker_name)
+        for fr, to, burnin_name in plan.burnins:
+            self.wg_hiero_ui.create_burnin(shots, fr, to, burnin_name)
+
+    def update_sequence(self, sequence, prev_rev, prev_bin, seq_bin,
+                        seq_rev_bin, data):
+        """update_sequence will update a copy of the sequence of a previous
+        revision to the pulled revision: only the track items of the panels
+        that changed are removed or added, the others are retimed with their
+        dialogue. Markers and burnins are added again. The sequence of the
+        previous revision stays in its bin
+
+        Arguments:
+            sequence {Dict} -- Hiero Sequence of the previous revision
+
+            prev_rev {int} -- Previous sequence revision number
+
+            prev_bin {Dict} -- Sequence revision Bin of the previous revision
+
+            seq_bin {Dict} -- Sequence Bin
+
+            seq_rev_bin {Dict} -- Sequence revision Bin
+
+            data {revision_snapshot} -- Sequence revision
+
+        Returns:
+            bool -- False if the sequence has no track to update
+        """
+        hiero_api = self.wg_hiero_ui.hiero_api
+        _, _, seq_tc = self.wg_flix_ui.get_selected_sequence()
+        prev_track_name = 'Flix_{0}_v{1}'.format(seq_tc, prev_rev)
+        track, _ = self.__find_tracks(sequence, prev_track_name)
+        if track is None:
+            return False
+
+        plan = data.get_plan(seq_tc)
+        if prev_bin is not seq_rev_bin:
+            sequence = hiero_api.clone_sequence(sequence, plan.track_name)
+        # Pulling the same revision again updates its own sequence
+        track, shots = self.__find_tracks(sequence, prev_track_name)
+        self.__update_progress('Compare with {0}'.format(prev_track_name))
+        items = list(track.items())
+        diff = timeline_diff.timeline_diff(
+            [self.wg_hiero_ui.get_panel_uid(i) for i in items],
+            [item['uid'] for item in plan.items])
+        ranges = [(item['in'], item['out']) for item in plan.items]
+        dialogues = {}
+        for e in hiero_api.get_effects(track):
+            if e.name().startswith('dialogue-'):
+                dialogues.setdefault(e.timelineIn(), []).append(e)
+        item_dialogues = [dialogues.get(i.timelineIn(), []) for i in items]
+
+        self.__update_progress('Remove {0} track items'.format(
+            len(diff.remove)))
+        for i in diff.remove:
+            for e in item_dialogues[i]:
+                track.removeSubTrackItem(e)
+            track.removeItem(items[i])
+        # The new place of every item is known before moving any of them,
+        # they are then moved in an order where they never overlap
+        self.__update_progress('Retime {0} track items'.format(
+            len(diff.keep)))
+        kept = [(items[old_i], item_dialogues[old_i], ranges[new_i])
+                for old_i, new_i in diff.keep]
+        order = timeline_diff.retime_order(
+            [(i.timelineIn(), i.timelineOut()) for i, _, _ in kept],
+            [r for _, _, r in kept])
+        for k in order:
+            item, effects, timeline_range = kept[k]
+            for i in [item] + effects:
+                self.__retime(i, timeline_range)
+
+        self.__update_progress('Add {0} track items'.format(len(diff.add)))
+        clips = hiero_api.get_clips(seq_bin)
+        self.add_track_items(track, seq_rev_bin, clips,
+                             [plan.items[i] for i in diff.add], data.thumbs)
+
+        self.__update_progress('Update markers and burnins')
+        self.wg_hiero_ui.clear_markers(sequence)
+        if shots is not None:
+            for e in hiero_api.get_effects(shots):
+                shots.removeSubTrackItem(e)
+        elif len(plan.markers) > 0:
+            shots = hiero_api.create_video_track('Shots')
+            sequence.addTrack(shots)
+        self.add_markers_and_burnins(sequence, shots, plan)
+        self.wg_hiero_ui.add_sidecar_tag(sequence, plan.sidecar)
+
+        track.setName(plan.track_name)
+        sequence.setName(plan.track_name)
+        if prev_bin is not seq_rev_bin:
+            seq_rev_bin.addItem(hiero_api.sequence_to_bin_item(sequence))
+        return True
+
+    def __find_tracks(self, sequence, track_name):
+        """__find_tracks will find the panels track and the shots track of
+        a sequence
+
+        Arguments:
+            sequence {Dict} -- Hiero Sequence
+
+            track_name {str} -- Name of the panels track
+
+        Returns:
+            Tuple[Dict, Dict] -- Panels track, Shots track, None if missing
+        """
+        track = None
+        shots = None
+        for t in sequence.videoTracks():
+            if t.name() == track_name:
+                track = t
+            elif t.name() == 'Shots':
+                shots = t
         return track, shots
 
-    def pull_latest_seq_rev(self):
+    def __retime(self, item, timeline_range):
+        """__retime will move a track item or an effect
+
+        Arguments:
+            item {Dict} -- Track item or effect
+
+            timeline_range {Tuple[int, int]} -- Timeline in and out
+        """
+        timeline_in, timeline_out = timeline_range
+        if timeline_in > item.timelineIn():
+            item.setTimelineOut(timeline_out)
+            item.setTimelineIn(timeline_in)
+        else:
+            item.setTimelineIn(timeline_in)
+            item.setTimelineOut(timeline_out)
+
+    def pull_latest_seq_rev(self, data=None):
         """pull_taltest_seq_rev will pull one latest sequence revision and send
         it to hiero
+
+        Arguments:
+            data {revision_snapshot} -- Sequence revision already retrieved
+            with fetch_sequence (default: {None})
+
+        Returns:
+            bool -- False if the progress has been cancelled
         """
         try:
             self.__init_progress(3)
 
             _, _, show_tc = self.wg_flix_ui.get_selected_show()
             seq_id, seq_rev_tc, seq_tc = self.wg_flix_ui.get_selected_sequence()
+            if self.wg_hiero_ui.is_incremental():
+                self.__update_progress('Find previous revision', False)
+                seq, seq_rev_bin = self.wg_hiero_ui.get_sequence_bins(
+                    show_tc, seq_rev_tc, seq_tc, self.__update_progress)
+                sequence, prev_rev, prev_bin = (
+                    self.wg_hiero_ui.hiero_api.find_latest_sequence(
+                        seq, seq_tc, seq_rev_tc))
+                if sequence is not None:
+                    if data is None:
+                        data = self.fetch_selected_sequence()
+                    self.__update_progress('Update sequence', False)
+                    if self.update_sequence(
+                            sequence, prev_rev, prev_bin, seq, seq_rev_bin,
+                            data):
+                        return True
             self.__update_progress('Pull sequence to hiero', False)
             sequence, seq, seq_rev_bin = self.wg_hiero_ui.pull_to_sequence(
                 show_tc, seq_rev_tc, seq_tc, self.__update_progress)
             self.__update_progress('Create video track', False)
             track, shots = self.create_video_track(
-                sequence, seq, seq_rev_bin, seq_id, seq_rev_tc)
+                sequence, seq, seq_rev_bin, seq_id, seq_rev_tc, data)
             if track is None:
-                return
+                return True
             self.__update_progress('Add video track', False)
             sequence.addTrack(track)
             if shots is not None:
                 self.__update_progress('Add shot track')
                 sequence.addTrack(shots)
-        except progress_canceled:
+        except RuntimeError as e:
+            self.__error(str(e))
+        except progress.progress_canceled:
             print('progress cancelled')
-            return
+            return False
+        return True
 
     def on_pull_latest(self):
         """on_pull_latest will retrieve the last sequence revision from Flix
         and will create / reuse bins, sequences, clips
         Depending on the selection it will pull only one or all of them
         """
+        show_id, _, _ = self.wg_flix_ui.get_selected_show()
         _, _, selected_seq_tc = self.wg_flix_ui.get_selected_sequence()
+        self.wg_flix_ui.clear_snapshots()
         if selected_seq_tc == 'All Sequences':
-            for count in range(self.wg_flix_ui.sequence_list.count()):
-                if self.wg_flix_ui.sequence_list.itemText(
-                        count) == 'All Sequences':
+            # The next sequence is retrieved while the timeline of the
+            # current one is created
+            sequences = pool.pipeline(
+                lambda s: self.wg_flix_ui.fetch_sequence(
+                    show_id, s[1], s[2], s[0]),
+                self.wg_flix_ui.get_sequences_to_pull())
+            for seq, t in sequences:
+                while not t.wait(0.05):
+                    QCoreApplication.processEvents()
+                if t.error is not None:
+                    self.__error('{0}: {1}'.format(seq[0], t.error))
                     continue
-                select_seq_tc = self.wg_flix_ui.sequence_list.itemText(
-                    count)
-                self.wg_flix_ui.on_sequence_changed(select_seq_tc)
-                self.pull_latest_seq_rev()
+                self.wg_flix_ui.on_sequence_changed(seq[0])
+                if self.pull_latest_seq_rev(t.result()) is False:
+                    sequences.stop()
+                    break
             self.wg_flix_ui.on_sequence_changed('All Sequences')
         else:
             self.pull_latest_seq_rev()
@@ -211,36 +411,36 @@ class main_dialogue(QDialog):
             sequence = self.wg_hiero_ui.hiero_api.get_active_sequence()
             if sequence is None:
                 self.__error('could not find any sequence selected')
-                self.progress.close()
+                self.progress_dialog.close()
                 return
             self.__update_progress('Get Hiero items', False)
+            sidecar = self.wg_hiero_ui.get_sidecar(sequence)
             for tr in sequence.items():
                 if tr.name() == 'Shots':
                     self.__update_progress('Get Shots items')
                     markers = self.wg_hiero_ui.get_markers_from_sequence(tr)
-                else:
+                elif len(rev_panels) < 1:
+                    # Only the first video track is sent to Flix
                     self.__update_progress('Get Clips items')
                     panels = self.wg_hiero_ui.get_panels_from_sequence(
-                        tr, show_id, seq_id, self.wg_flix_ui.create_blank_panel)
-                    self.__update_progress('Update clips items info')
-                    panels = self.wg_hiero_ui.update_panel_from_sequence(
-                        tr, panels)
+                        tr, show_id, seq_id,
+                        self.wg_flix_ui.create_blank_panels, sidecar)
                     self.__update_progress('Handle duplicate clips')
                     panels = self.wg_flix_ui.handle_duplicate_panels(panels)
-                    if len(panels) > 0 and len(rev_panels) < 1:
+                    if len(panels) > 0:
                         rev_panels = flix_api.format_panel_for_revision(panels)
 
             if len(rev_panels) < 1:
                 self.__error(
                     'could not create a sequence revision, need at least one clip')
-                self.progress.close()
+                self.progress_dialog.close()
                 return
 
             self.__update_progress('Set seq revision comment', False)
             comment, ok = QInputDialog.getText(
                 self, 'Update to Flix', 'Sequence revision comment:')
             if ok is False:
-                self.progress.close()
+                self.progress_dialog.close()
                 return
 
             self.__update_progress('Create sequence revision', False)
@@ -250,7 +450,10 @@ class main_dialogue(QDialog):
                 self.__error('Could not save sequence revision')
             else:
                 self.__info('Sequence revision successfully created')
-        except progress_canceled:
+        except RuntimeError as e:
+            self.__error(str(e))
+            self.progress_dialog.close()
+        except progress.progress_canceled:
             print('progress cancelled')
             return
 
@@ -258,23 +461,15 @@ class main_dialogue(QDialog):
                           message,
                           skip_step=True):
         """update_progress will update the progress message
-        and will return False if the progress is 'canceled' by the user
+        and will raise progress_canceled if the progress is 'canceled'
+        by the user
 
         Arguments:
             message {str} -- Message to show in the progress
 
             skip_step {bool} -- Will skip the step (default: {True})
         """
-        next_value = self.progress_start
-        if skip_step is False:
-            next_value = next_value + 1
-        self.progress_start = next_value
-        self.progress.setValue(next_value)
-        self.progress.setLabelText(message)
-        self.progress.repaint()
-        QCoreApplication.processEvents()
-        if self.progress.wasCanceled():
-            raise progress_canceled
+        self.progress.update(message, skip_step)
 
     def __init_progress(self, steps):
         """__init_progress will init the progress bar
@@ -282,14 +477,8 @@ class main_dialogue(QDialog):
         Arguments:
             steps {int} -- Number of step of the progress bar
         """
-        self.progress = QProgressDialog('Operation in progress.',
-                                        'Stop',
-                                        0,
-                                        steps)
-        self.progress_start = 0
-        self.progress.setMinimumWidth(400)
-        self.progress.setMinimumHeight(100)
-        self.progress.show()
+        self.progress_dialog = progress.progress_dialog()
+        self.progress = progress.progress(self.progress_dialog, steps)
 
     def __error(self, message):
         """__error will show a error message with a given message
@@ -315,6 +504,5 @@ class main_dialogue(QDialog):
 
 
 main_view = main_dialogue()
-wm = hiero_api.hiero_c()
-wm = wm.get_window_manager()
+wm = main_view.wg_hiero_ui.hiero_api.get_window_manager()
 wm.addWindow(main_view)
@@ -0,0 +1,181 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import threading
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class task:
+    """task is a function submitted to the pool, its result can be waited
+    from another thread
+    """
+
+    def __init__(self, fn, args):
+        self.fn = fn
+        self.args = args
+        self.value = None
+        self.error = None
+        self.event = threading.Event()
+
+    def run(self):
+        """run will call the function and store its result or its error
+        """
+        try:
+            self.value = self.fn(*self.args)
+        except BaseException as e:
+            self.error = e
+        self.event.set()
+
+    def done(self):
+        """done will return if the task has finished
+
+        Returns:
+            bool -- Finished or not
+        """
+        return self.event.is_set()
+
+    def wait(self, timeout=None):
+        """wait will wait for the task to finish
+
+        Arguments:
+            timeout {float} -- Maximum time to wait in seconds
+            (default: {None})
+
+        Returns:
+            bool -- Finished or not
+        """
+        return self.event.wait(timeout)
+
+    def result(self):
+        """result will wait for the task and return its result, the error of
+        the function is raised again
+
+        Returns:
+            object -- Result of the function
+        """
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def start(fn, *args):
+    """start will run a function in its own thread
+
+    Arguments:
+        fn {Callable} -- Function to run
+
+        args {*object} -- Arguments of the function
+
+    Returns:
+        task -- Task to wait for the result
+    """
+    t = task(fn, args)
+    th = threading.Thread(target=t.run)
+    th.daemon = True
+    th.start()
+    return t
+
+
+class pool:
+    """pool is a pool of threads running tasks in the background,
+    the threads are started on the first submitted task
+    """
+
+    def __init__(self, workers=8):
+        self.workers = workers
+        self.tasks = queue.Queue()
+        self.threads = []
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        """submit will run a function in the pool
+
+        Arguments:
+            fn {Callable} -- Function to run
+
+            args {*object} -- Arguments of the function
+
+        Returns:
+            task -- Task to wait for the result
+        """
+        t = task(fn, args)
+        self.__start()
+        self.tasks.put(t)
+        return t
+
+    def shutdown(self):
+        """shutdown will stop the threads once the submitted tasks are done
+        """
+        with self.lock:
+            for _ in self.threads:
+                self.tasks.put(None)
+            self.threads = []
+
+    def __start(self):
+        """__start will start the threads if they are not running
+        """
+        with self.lock:
+            if len(self.threads) > 0:
+                return
+            for _ in range(self.workers):
+                th = threading.Thread(target=self.__work)
+                th.daemon = True
+                th.start()
+                self.threads.append(th)
+
+    def __work(self):
+        """__work will run the tasks until it gets None
+        """
+        while True:
+            t = self.tasks.get()
+            if t is None:
+                return
+            t.run()
+
+
+class pipeline:
+    """pipeline will call a function on every item in a background thread,
+    in order, at most depth items ahead of the item being consumed.
+    Iterating over it gives every item with its task
+    """
+
+    def __init__(self, fn, items, depth=1):
+        self.fn = fn
+        self.items = list(items)
+        self.tasks = queue.Queue()
+        self.slots = threading.Semaphore(depth)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.__produce)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def __iter__(self):
+        for item in self.items:
+            if self.stopped.is_set():
+                return
+            t = self.tasks.get()
+            self.slots.release()
+            yield item, t
+
+    def stop(self):
+        """stop will stop fetching the next items
+        """
+        self.stopped.set()
+        self.slots.release()
+
+    def __produce(self):
+        """__produce will run the tasks while there are free slots
+        """
+        for item in self.items:
+            self.slots.acquire()
+            if self.stopped.is_set():
+                return
+            t = task(self.fn, (item,))
+            self.tasks.put(t)
+            t.run()
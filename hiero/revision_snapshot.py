@@ -0,0 +1,118 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+from collections import OrderedDict
+
+import timeline_plan
+
+
+class revision_snapshot:
+    """revision_snapshot retrieves a sequence revision, its panels and its
+    dialogues once, concurrently when a pool is given, and serves them
+    from memory afterwards. It does not use Qt and can be created in the
+    background
+    """
+
+    def __init__(self, flix_api, show_id, seq_id, seq_rev_number, pool=None):
+        self.flix_api = flix_api
+        self.show_id = show_id
+        self.seq_id = seq_id
+        self.seq_rev_number = seq_rev_number
+        self.revision = None
+        self.panels = None
+        self.dialogues = None
+        # Thumbnail downloads started for the panels, see prefetch_thumbs
+        self.thumbs = {}
+        # Timeline to create in Hiero, see get_plan
+        self.plan = None
+        self.__markers_by_name = None
+        self.__dialogues_by_panel_id = None
+        self.__fetch(pool)
+
+    def get_markers(self):
+        """get_markers will return the markers of the sequence revision
+
+        Returns:
+            List -- Markers
+        """
+        return self.revision.get('meta_data', {}).get('markers', [])
+
+    def get_markers_by_name(self):
+        """get_markers_by_name will map the markers: start -> marker_name
+
+        Returns:
+            Dict -- Mapping start -> marker_name
+        """
+        if self.__markers_by_name is None:
+            markers_mapping = {}
+            for m in self.get_markers():
+                markers_mapping[m.get('start')] = m.get('name')
+            self.__markers_by_name = OrderedDict(
+                sorted(markers_mapping.items()))
+        return self.__markers_by_name
+
+    def get_dialogues_by_panel_id(self):
+        """get_dialogues_by_panel_id will map the dialogues without their
+        html: panel_id -> dialogue
+
+        Returns:
+            Dict -- Mapping panel_id to dialogue
+        """
+        if self.__dialogues_by_panel_id is None:
+            mapped_dialogues = {}
+            for d in self.dialogues:
+                t = d.get('text', '').replace('</p>', '\n')
+                mapped_dialogues[d.get('panel_id')] = timeline_plan.sanitize(t)
+            self.__dialogues_by_panel_id = mapped_dialogues
+        return self.__dialogues_by_panel_id
+
+    def get_plan(self, seq_tc):
+        """get_plan will compute the timeline of the sequence revision once
+
+        Arguments:
+            seq_tc {str} -- Sequence tracking code
+
+        Returns:
+            timeline_plan.timeline_plan -- Timeline to create in Hiero
+        """
+        if self.plan is None:
+            self.plan = timeline_plan.timeline_plan(
+                seq_tc, self.seq_rev_number, self.get_panels(),
+                self.get_markers_by_name(), self.get_dialogues_by_panel_id())
+        return self.plan
+
+    def get_panels(self):
+        """get_panels will return the panels of the sequence revision
+
+        Returns:
+            List -- Panels
+        """
+        return self.panels
+
+    def __fetch(self, pool):
+        """__fetch will retrieve the sequence revision, its panels and its
+        dialogues
+
+        Arguments:
+            pool {pool.pool} -- Pool to send the requests concurrently
+
+        Raises:
+            RuntimeError: Sequence revision, dialogues or panels not found
+        """
+        args = (self.show_id, self.seq_id, self.seq_rev_number)
+        requests = [self.flix_api.get_sequence_rev,
+                    self.flix_api.get_panels,
+                    self.flix_api.get_dialogues]
+        if pool is None:
+            results = [fn(*args) for fn in requests]
+        else:
+            tasks = [pool.submit(fn, *args) for fn in requests]
+            results = [t.result() for t in tasks]
+        self.revision, self.panels, self.dialogues = results
+        if self.revision is None:
+            raise RuntimeError('Could not retreive sequence revision')
+        if self.panels is None:
+            raise RuntimeError('Could not retreive panels')
+        if self.dialogues is None:
+            raise RuntimeError('Could not retreive dialogues')
@@ -0,0 +1,213 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+
+# Age after which a download left unfinished by a closed session is removed
+STALE_TMP = 3600
+
+
+class thumb_cache:
+    """thumb_cache is a persistent on disk cache of the panel thumbnails,
+    keyed by panel ID, panel revision and media object ID.
+    Every entry is a folder holding the thumbnail with the name Hiero uses
+    for the clip. The least recently used entries are evicted when the
+    cache is bigger than max_size, entries used by this session are kept
+    as the clips of the opened projects point to them. The cache folder is
+    scanned once, the size and last use of the entries are then kept up to
+    date in memory
+    """
+
+    def __init__(self, root=None, max_size=1024 * 1024 * 1024):
+        if root is None:
+            root = os.path.join(
+                os.path.expanduser('~'), '.flix', 'hiero', 'thumbnails')
+        self.root = root
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.size = 0
+        # folder -> [last use, size], None until the first scan
+        self.entries = None
+        self.used = set()
+
+    def get_entry_path(self, panel_id, revision, mo_id):
+        """get_entry_path will return the folder of a cache entry
+
+        Arguments:
+            panel_id {int} -- Panel ID
+
+            revision {int} -- Panel revision
+
+            mo_id {int} -- Media object ID
+
+        Returns:
+            str -- Folder of the entry
+        """
+        return os.path.join(self.root, '{0}_{1}_{2}'.format(
+            panel_id, revision, mo_id))
+
+    def fetch(self, panel_id, revision, mo_id, name, fn_download):
+        """fetch will return the path of a thumbnail, it is only downloaded
+        if it is not in the cache yet
+
+        Arguments:
+            panel_id {int} -- Panel ID
+
+            revision {int} -- Panel revision
+
+            mo_id {int} -- Media object ID
+
+            name {str} -- File name of the thumbnail
+
+            fn_download {Callable[[str], object]} -- Download the thumbnail
+            to a path, returns None if it failed
+
+        Returns:
+            str -- Path of the thumbnail
+        """
+        entry = self.get_entry_path(panel_id, revision, mo_id)
+        path = os.path.join(entry, name)
+        if os.path.isfile(path):
+            self.__touch(entry, path)
+            return path
+
+        try:
+            os.makedirs(entry)
+        except OSError:
+            if not os.path.isdir(entry):
+                raise
+        # Same thumbnail pulled from another sequence, no need to download
+        for f in os.listdir(entry):
+            if not f.endswith('.tmp'):
+                shutil.copyfile(os.path.join(entry, f), path)
+                self.__add(entry, path)
+                return path
+
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=entry)
+        os.close(fd)
+        try:
+            if fn_download(temp_path) is None:
+                return None
+            if os.path.isfile(path):
+                # Downloaded concurrently by another thread
+                self.__touch(entry, path)
+                return path
+            try:
+                os.rename(temp_path, path)
+            except OSError:
+                # Windows does not rename over the thumbnail written by
+                # another thread since the check above
+                if not os.path.isfile(path):
+                    raise
+                self.__touch(entry, path)
+                return path
+        finally:
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+        self.__add(entry, path)
+        return path
+
+    def evict(self):
+        """evict will remove the least recently used entries until the cache
+        fits in max_size
+        """
+        with self.lock:
+            self.__load()
+            # Nothing to evict when every entry is used by this session
+            if (self.size <= self.max_size or
+                    len(self.entries) <= len(self.used)):
+                return
+            for entry, (_, size) in sorted(self.entries.items(),
+                                           key=lambda e: e[1][0]):
+                if self.size <= self.max_size:
+                    break
+                if entry in self.used:
+                    continue
+                shutil.rmtree(entry, ignore_errors=True)
+                del self.entries[entry]
+                self.size -= size
+
+    def __add(self, entry, path):
+        """__add will account a new thumbnail and evict entries if needed
+
+        Arguments:
+            entry {str} -- Folder of the entry
+
+            path {str} -- Thumbnail path
+        """
+        size = os.path.getsize(path)
+        with self.lock:
+            self.__load()
+            e = self.entries.setdefault(entry, [time.time(), 0])
+            e[1] += size
+            self.size += size
+            self.used.add(entry)
+        self.evict()
+
+    def __touch(self, entry, path):
+        """__touch will mark an entry as recently used
+
+        Arguments:
+            entry {str} -- Folder of the entry
+
+            path {str} -- Thumbnail path
+        """
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+            os.utime(entry, (now, now))
+        except OSError:
+            pass
+        with self.lock:
+            self.__load()
+            if entry not in self.entries:
+                # Added by another session since the scan
+                size = os.path.getsize(path)
+                self.entries[entry] = [now, size]
+                self.size += size
+            self.entries[entry][0] = now
+            self.used.add(entry)
+
+    def __load(self):
+        """__load will scan the cache folder the first time, the lock must
+        be held
+        """
+        if self.entries is None:
+            self.entries, self.size = self.__scan()
+
+    def __scan(self):
+        """__scan will list the entries with their last use and size, and
+        remove the downloads left unfinished
+
+        Returns:
+            Tuple[Dict, int] -- folder -> [mtime, size], total size
+        """
+        entries = {}
+        total = 0
+        if not os.path.isdir(self.root):
+            return entries, total
+        stale = time.time() - STALE_TMP
+        for e in os.listdir(self.root):
+            entry = os.path.join(self.root, e)
+            if not os.path.isdir(entry):
+                continue
+            size = 0
+            for f in os.listdir(entry):
+                try:
+                    st = os.stat(os.path.join(entry, f))
+                    if f.endswith('.tmp'):
+                        if st.st_mtime < stale:
+                            os.remove(os.path.join(entry, f))
+                        continue
+                    size += st.st_size
+                except OSError:
+                    pass
+            entries[entry] = [os.path.getmtime(entry), size]
+            total += size
+        return entries, total
@@ -0,0 +1,88 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import difflib
+
+
+def panel_uid(p):
+    """panel_uid will return the key of a panel revision
+
+    Arguments:
+        p {Dict} -- Panel
+
+    Returns:
+        str -- panel_id-revision_number
+    """
+    return '{0}-{1}'.format(p.get('panel_id'), p.get('revision_number'))
+
+
+def layout(durations):
+    """layout will place panels one after the other from the frame 0
+
+    Arguments:
+        durations {List} -- Duration of every panel
+
+    Returns:
+        List -- (timeline in, timeline out) of every panel
+    """
+    ranges = []
+    panel_in = 0
+    for d in durations:
+        ranges.append((panel_in, panel_in + d - 1))
+        panel_in += d
+    return ranges
+
+
+def retime_order(old_ranges, new_ranges):
+    """retime_order will return the order to move track items in so that
+    they never overlap: in timeline order, but an item growing over the
+    current place of the next one is moved right after it
+
+    Arguments:
+        old_ranges {List} -- Current (timeline in, timeline out) of the
+        items, in timeline order
+
+        new_ranges {List} -- (timeline in, timeline out) to move them to
+
+    Returns:
+        List -- Indexes of the items, in the order to move them
+    """
+    order = []
+    deferred = []
+    for i, (_, new_out) in enumerate(new_ranges):
+        if i + 1 < len(old_ranges) and new_out >= old_ranges[i + 1][0]:
+            deferred.append(i)
+            continue
+        order.append(i)
+        while len(deferred) > 0:
+            order.append(deferred.pop())
+    return order
+
+
+class timeline_diff:
+    """timeline_diff compares the panels of a track already in Hiero with
+    the panels of a sequence revision, to know which track items can be
+    kept, which ones are removed and which panels need a new track item
+    """
+
+    def __init__(self, old_uids, new_uids):
+        self.keep = []
+        self.remove = []
+        self.add = []
+        matcher = difflib.SequenceMatcher(
+            None, old_uids, new_uids, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                self.keep.extend(zip(range(i1, i2), range(j1, j2)))
+                continue
+            self.remove.extend(range(i1, i2))
+            self.add.extend(range(j1, j2))
+
+    def changed(self):
+        """changed will return the number of track items to remove or add
+
+        Returns:
+            int -- Number of changes
+        """
+        return len(self.remove) + len(self.add)
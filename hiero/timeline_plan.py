@@ -0,0 +1,151 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import json
+import re
+
+import timeline_diff
+
+HTML = re.compile('<.*?>|&([a-z0-9]+|#[0-9]{1,6}|#x[0-9a-f]{1,6});')
+
+
+def sanitize(text):
+    """sanitize will remove the html tags and entities of a text
+
+    Arguments:
+        text {str} -- Text from Flix
+
+    Returns:
+        str -- Text without html
+    """
+    return HTML.sub('', text)
+
+
+def clip_name(seq_tc, p):
+    """clip_name will return the name of the clip of a panel
+
+    Arguments:
+        seq_tc {str} -- Sequence tracking code
+
+        p {Dict} -- Panel
+
+    Returns:
+        str -- Clip name
+    """
+    return '{0}_{1}_{2}_'.format(
+        seq_tc, p.get('panel_id'), p.get('revision_counter'))
+
+
+def panel_info_note(p):
+    """panel_info_note will return the note of the tag referencing a panel,
+    the rest of the panel info is in the sidecar tag of the sequence
+
+    Arguments:
+        p {Dict} -- Panel
+
+    Returns:
+        str -- Compact JSON note
+    """
+    return json.dumps({
+        'panel_id': p.get('panel_id'),
+        'revision_number': p.get('revision_number'),
+        'asset_id': p.get('asset', {}).get('asset_id'),
+    }, separators=(',', ':'))
+
+
+def sidecar_note(panels):
+    """sidecar_note will return the note of the sidecar tag of a sequence:
+    the dialogue of every panel
+
+    Arguments:
+        panels {List} -- List of Panels
+
+    Returns:
+        str -- Compact JSON note
+    """
+    index = {}
+    for p in panels:
+        index[timeline_diff.panel_uid(p)] = {'dialogue': p.get('dialogue')}
+    return json.dumps({'sidecar': index}, separators=(',', ':'))
+
+
+def read_panel_info(note, sidecar):
+    """read_panel_info will read the note of a panel info tag, tags with the
+    whole panel from the previous versions are still supported
+
+    Arguments:
+        note {str} -- Note of the panel info tag
+
+        sidecar {Dict} -- Sidecar index of the sequence
+
+    Returns:
+        Dict -- Panel
+    """
+    info = json.loads(note)
+    if 'asset' in info:
+        return info
+    return {
+        'panel_id': info.get('panel_id'),
+        'revision_number': info.get('revision_number'),
+        'asset': {'asset_id': info.get('asset_id')},
+        'dialogue': sidecar.get(
+            timeline_diff.panel_uid(info), {}).get('dialogue'),
+    }
+
+
+class timeline_plan:
+    """timeline_plan computes everything a sequence revision needs in
+    Hiero: the track items with their clip, tags and dialogue, the markers
+    and the burnins. It does not use Hiero nor Qt, it is built in the
+    background and applied to the timeline afterwards
+    """
+
+    def __init__(self, seq_tc, seq_rev_number, panels, markers_mapping,
+                 mapped_dialogue):
+        self.track_name = 'Flix_{0}_v{1}'.format(seq_tc, seq_rev_number)
+        self.items = []
+        self.markers = []
+        self.burnins = []
+        self.sidecar = sidecar_note(panels)
+        ranges = timeline_diff.layout([p.get('duration') for p in panels])
+        for p, (timeline_in, timeline_out) in zip(panels, ranges):
+            comment = p.get('latest_open_note', {}).get('body', None)
+            self.items.append({
+                'panel': p,
+                'uid': timeline_diff.panel_uid(p),
+                'clip_name': clip_name(seq_tc, p),
+                'thumb': (p.get('panel_id'), p.get('revision_counter')),
+                'duration': p.get('duration'),
+                'in': timeline_in,
+                'out': timeline_out,
+                'comment': None if comment is None else sanitize(comment),
+                'info': panel_info_note(p),
+                'dialogue': mapped_dialogue.get(p.get('panel_id')),
+            })
+        self.__place_markers(ranges, markers_mapping)
+
+    def __place_markers(self, ranges, markers_mapping):
+        """__place_markers will add a marker on every panel starting a shot
+        and a burnin per shot, until the next shot or the end
+
+        Arguments:
+            ranges {List} -- (timeline in, timeline out) of every panel
+
+            markers_mapping {Dict} -- Mapping start -> marker_name
+        """
+        marker_in = None
+        current_marker = None
+        for i, (timeline_in, timeline_out) in enumerate(ranges):
+            name = markers_mapping.get(timeline_in)
+            if timeline_in in markers_mapping:
+                self.markers.append((timeline_in, name))
+                if name != current_marker:
+                    if marker_in is not None:
+                        self.burnins.append(
+                            (marker_in, timeline_in - 1, name))
+                    marker_in = timeline_in
+            if i == len(ranges) - 1 and marker_in is not None:
+                self.burnins.append((marker_in, timeline_out, current_marker))
+            if timeline_in in markers_mapping:
+                current_marker = name
@@ -0,0 +1,228 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import select
+import socket
+import threading
+
+try:
+    import httplib
+    from urllib import getproxies
+    from urlparse import urlsplit
+except ImportError:
+    import http.client as httplib
+    from urllib.request import getproxies
+    from urllib.parse import urlsplit
+
+# Methods a server may receive twice without creating anything twice
+IDEMPOTENT = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS')
+
+
+class http_error(Exception):
+    """http_error is raised for a response with an error status
+    """
+
+    def __init__(self, status, reason):
+        super(http_error, self).__init__(
+            'HTTP Error {0}: {1}'.format(status, reason))
+        self.status = status
+        self.reason = reason
+
+
+class transport:
+    """transport keeps the connections to the Flix server open between
+    requests, a connection is taken from the idle ones for a request and
+    given back once its response is read, so threads can share it.
+    A request failing on a connection closed by the server meanwhile is
+    sent again on a new connection, unless it may have reached the server
+    and is not idempotent, like the POST creating panels
+    """
+
+    def __init__(self, max_idle=8, timeout=None):
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.idle = {}
+        self.lock = threading.Lock()
+
+    def request(self, method, url, body=None, headers=None):
+        """request will send a request and read its response
+
+        Arguments:
+            method {str} -- Http method
+
+            url {str} -- Url of the request
+
+            body {str} -- Content of the request (default: {None})
+
+            headers {Dict} -- Headers of the request (default: {None})
+
+        Raises:
+            http_error: Response with an error status
+
+        Returns:
+            str -- Content of the response
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or '/'
+        if parts.query:
+            path = '{0}?{1}'.format(path, parts.query)
+        while True:
+            conn, reused = self.__get(key, method not in IDEMPOTENT)
+            sent = False
+            try:
+                conn.request(method, path, body, headers or {})
+                sent = True
+                res = conn.getresponse()
+                data = res.read()
+            except (httplib.BadStatusLine, socket.error):
+                conn.close()
+                if reused and (not sent or method in IDEMPOTENT):
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if res.will_close:
+                conn.close()
+            else:
+                self.__put(key, conn)
+            if res.status >= 400:
+                raise http_error(res.status, res.reason)
+            return data
+
+    def close(self):
+        """close will close the idle connections
+        """
+        with self.lock:
+            idle = self.idle
+            self.idle = {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def __get(self, key, check=False):
+        """__get will take an idle connection or open a new one
+
+        Arguments:
+            key {Tuple[str, str]} -- Scheme and host of the server
+
+            check {bool} -- Skip the idle connections already closed by the
+            server, for the requests that are not sent twice
+            (default: {False})
+
+        Returns:
+            Tuple[object, bool] -- Connection, reused or new
+        """
+        while True:
+            with self.lock:
+                conns = self.idle.get(key)
+                if not conns:
+                    break
+                conn = conns.pop()
+            if not check or not self.__is_closed(conn):
+                return conn, True
+            conn.close()
+        scheme, netloc = key
+        if scheme == 'https':
+            conn = httplib.HTTPSConnection(netloc, timeout=self.timeout)
+        else:
+            conn = httplib.HTTPConnection(netloc, timeout=self.timeout)
+        conn.connect()
+        # The headers and the body of a request are sent separately, do not
+        # wait for the acknowledgement of the headers to send the body
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn, False
+
+    def __is_closed(self, conn):
+        """__is_closed will check if an idle connection was closed by the
+        server, nothing is expected to be read from it until the next request
+
+        Arguments:
+            conn {object} -- Connection
+
+        Returns:
+            bool -- Closed or not
+        """
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (select.error, ValueError):
+            return True
+        return len(readable) > 0
+
+    def __put(self, key, conn):
+        """__put will keep a connection for the next requests
+
+        Arguments:
+            key {Tuple[str, str]} -- Scheme and host of the server
+
+            conn {object} -- Connection
+        """
+        with self.lock:
+            conns = self.idle.setdefault(key, [])
+            if len(conns) < self.max_idle:
+                conns.append(conn)
+                return
+        conn.close()
+
+
+class urlopen_transport:
+    """urlopen_transport opens a connection per request with urllib2,
+    it goes through the proxies of the environment
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+
+    def request(self, method, url, body=None, headers=None):
+        """request will send a request and read its response
+
+        Arguments:
+            method {str} -- Http method
+
+            url {str} -- Url of the request
+
+            body {str} -- Content of the request (default: {None})
+
+            headers {Dict} -- Headers of the request (default: {None})
+
+        Raises:
+            http_error: Response with an error status
+
+        Returns:
+            str -- Content of the response
+        """
+        # Only needed behind a proxy, imported when first used
+        try:
+            import urllib2
+        except ImportError:
+            import urllib.request as urllib2
+        # urllib on Python 3 only sends bytes
+        if body is not None and not isinstance(body, bytes):
+            body = body.encode('utf-8')
+        req = urllib2.Request(url, data=body, headers=headers or {})
+        req.get_method = lambda: method
+        try:
+            if self.timeout is None:
+                return urllib2.urlopen(req).read()
+            return urllib2.urlopen(req, timeout=self.timeout).read()
+        except urllib2.HTTPError as e:
+            raise http_error(e.code, e.msg)
+
+    def close(self):
+        """close has nothing to close, connections are not kept
+        """
+        pass
+
+
+def create():
+    """create will return the transport to use: connections are kept
+    alive, unless a proxy is set in the environment
+
+    Returns:
+        transport -- Transport
+    """
+    if len(getproxies()) > 0:
+        return urlopen_transport()
+    return transport()
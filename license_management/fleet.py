@@ -0,0 +1,150 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple
+
+import flix as flix_api
+
+
+def load_fleet(path: str) -> List[Dict]:
+    """load_fleet will read the Flix servers of a fleet file, a JSON list
+    of objects with a server, a user, a password or the environment
+    variable holding it (password_env), and an optional name
+
+    Arguments:
+        path {str} -- Path of the fleet file
+
+    Raises:
+        ValueError: The fleet file is not valid
+
+    Returns:
+        List[Dict] -- Servers with their name, url, user and password
+    """
+    with open(path) as f:
+        try:
+            entries = json.load(f)
+        except ValueError as err:
+            raise ValueError('{0} is not valid JSON: {1}'.format(path, err))
+    if not isinstance(entries, list) or len(entries) < 1:
+        raise ValueError('{0} needs a list of servers'.format(path))
+    servers = []
+    for i, e in enumerate(entries):
+        if not isinstance(e, dict):
+            raise ValueError('server {0} is not an object'.format(i + 1))
+        password = e.get('password')
+        if password is None and e.get('password_env') is not None:
+            password = os.environ.get(e['password_env'])
+        for key, value in (('server', e.get('server')),
+                           ('user', e.get('user')),
+                           ('password', password)):
+            if not value:
+                raise ValueError('server {0} has no {1}'.format(i + 1, key))
+        servers.append({'name': str(e.get('name', e['server'])),
+                        'server': e['server'],
+                        'user': e['user'],
+                        'password': password})
+    return servers
+
+
+def query_server(server: Dict,
+                 fn_fetch: Callable[[flix_api.flix], Tuple[Dict, Dict]]
+                 ) -> Dict:
+    """query_server will login to a server with its own session and
+    retrieve its seats
+
+    Arguments:
+        server {Dict} -- Server from load_fleet
+
+        fn_fetch {Callable[[flix_api.flix], Tuple[Dict, Dict]]} -- Function
+        retrieving the access keys and the server info
+
+    Returns:
+        Dict -- Name, error (None if it succeeded), login and query time in
+        milliseconds, seats, access keys and users
+    """
+    result = {'name': server['name'], 'error': None, 'login_ms': None,
+              'query_ms': None, 'current_seats': None, 'max_seats': None,
+              'access_keys': None, 'users': None}
+    flix = flix_api.flix()
+    try:
+        start = time.time()
+        if flix.authenticate(server['server'], server['user'],
+                             server['password']) is None:
+            result['error'] = 'could not authenticate'
+            return result
+        login = time.time()
+        result['login_ms'] = round((login - start) * 1000)
+        access_keys, info = fn_fetch(flix)
+        result['query_ms'] = round((time.time() - login) * 1000)
+    except Exception as err:
+        # A server answering garbage must not stop the others
+        result['error'] = str(err)
+        return result
+    finally:
+        flix.session.close()
+    if access_keys is None or info is None:
+        result['error'] = 'could not get the seats'
+        return result
+    keys = access_keys.get('access_keys', [])
+    result['current_seats'] = info.get('current_seats')
+    result['max_seats'] = info.get('max_seats')
+    result['access_keys'] = len(keys)
+    result['users'] = len({ak.get('owner', {}).get('username')
+                           for ak in keys})
+    return result
+
+
+def query_fleet(servers: List[Dict],
+                fn_fetch: Callable[[flix_api.flix], Tuple[Dict, Dict]],
+                jobs: int = 8,
+                fn_progress: Callable[[str, bool], None] = None
+                ) -> List[Dict]:
+    """query_fleet will query the servers concurrently, at most jobs at a
+    time
+
+    Arguments:
+        servers {List[Dict]} -- Servers from load_fleet
+
+        fn_fetch {Callable[[flix_api.flix], Tuple[Dict, Dict]]} -- Function
+        retrieving the access keys and the server info
+
+        jobs {int} -- Servers queried at the same time (default: {8})
+
+        fn_progress {Callable[[str, bool], None]} -- Progress function,
+        called with a new step for every server queried (default: {None})
+
+    Returns:
+        List[Dict] -- Result of every server, in the order of the servers
+    """
+    with ThreadPoolExecutor(max_workers=min(jobs, len(servers))) as executor:
+        futures = [executor.submit(query_server, s, fn_fetch)
+                   for s in servers]
+        if fn_progress is not None:
+            for f in as_completed(futures):
+                fn_progress('queried {0}'.format(f.result()['name']), False)
+        return [f.result() for f in futures]
+
+
+def total(results: List[Dict]) -> Dict:
+    """total will add the seats of the servers that answered
+
+    Arguments:
+        results {List[Dict]} -- Results from query_fleet
+
+    Returns:
+        Dict -- Servers, failures, seats, access keys and users
+    """
+    ok = [r for r in results if r['error'] is None]
+    return {
+        'servers': len(results),
+        'failed': len(results) - len(ok),
+        'current_seats': sum(r['current_seats'] or 0 for r in ok),
+        'max_seats': sum(r['max_seats'] or 0 for r in ok),
+        'access_keys': sum(r['access_keys'] for r in ok),
+        'users': sum(r['users'] for r in ok),
+    }
@@ -7,10 +7,10 @@ import binascii
 import hashlib
 import hmac
 import json
-import time
-from collections import OrderedDict
+import sys
+import threading
 from datetime import datetime, timedelta
-from typing import Callable, Dict, List, Tuple
+from typing import Dict, Tuple
 
 import requests
 
@@ -21,6 +21,13 @@ class flix:
     """
 
     def __init__(self):
+        self.token_lock = threading.Lock()
+        # Keep the connections alive between requests, enough of them for
+        # the revokes running at the same time
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=32)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.reset()
 
     def authenticate(self, hostname: str, login: str, password: str) -> Dict:
@@ -43,15 +50,15 @@ class flix:
             'Authorization': 'Basic ' + authdata.decode('UTF-8'),
         }
         try:
-            r = requests.post(hostname + '/authenticate', headers=header,
-                              verify=False)
+            r = self.session.post(hostname + '/authenticate', headers=header,
+                                  verify=False)
             r.raise_for_status()
             response = json.loads(r.content)
             self.hostname = hostname
             self.login = login
             self.password = password
         except requests.exceptions.RequestException as err:
-            print('Authentification failed', err)
+            print('Authentification failed', err, file=sys.stderr)
             return None
 
         self.key = response['id']
@@ -81,19 +88,21 @@ class flix:
         """
         url = '/authenticate/key/{}'.format(access_key)
         headers = self.__get_headers(None, url, 'DELETE')
+        r = None
 
         try:
-            r = requests.delete(self.hostname + url, headers=headers,
-                                verify=False)
+            r = self.session.delete(self.hostname + url, headers=headers,
+                                    verify=False)
             r.raise_for_status()
         except requests.exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
-                print('Your token has been revoked')
+                print('Your token has been revoked', file=sys.stderr)
             elif r is not None and r.status_code == 403:
-                print('could not revoke access key (need to be admin user)')
+                print('could not revoke access key (need to be admin user)',
+                      file=sys.stderr)
                 return None
             else:
-                print('Could not revoke access key', err)
+                print('Could not revoke access key', err, file=sys.stderr)
             return False
         return True
 
@@ -108,15 +117,15 @@ class flix:
         response = None
 
         try:
-            r = requests.get(self.hostname + url, headers=headers,
-                             verify=False)
+            r = self.session.get(self.hostname + url, headers=headers,
+                                 verify=False)
             r.raise_for_status()
             response = json.loads(r.content)
         except requests.exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
-                print('Your token has been revoked')
+                print('Your token has been revoked', file=sys.stderr)
             else:
-                print('Could not retrieve info', err)
+                print('Could not retrieve info', err, file=sys.stderr)
             return None
         return response
 
@@ -131,18 +140,19 @@ class flix:
         response = None
 
         try:
-            r = requests.get(self.hostname + url, headers=headers,
-                             verify=False)
+            r = self.session.get(self.hostname + url, headers=headers,
+                                 verify=False)
             r.raise_for_status()
             response = json.loads(r.content)
         except requests.exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
-                print('Your token has been revoked')
+                print('Your token has been revoked', file=sys.stderr)
             elif r is not None and r.status_code == 403:
-                print('could not get infos (need to be admin user)')
+                print('could not get infos (need to be admin user)',
+                      file=sys.stderr)
                 return None
             else:
-                print('Could not retrieve users', err)
+                print('Could not retrieve users', err, file=sys.stderr)
             return None
         return response
 
@@ -153,19 +163,21 @@ class flix:
         Returns:
             Tuple[str, str] -- Key and Secret
         """
-        if (self.key is None or self.secret is None or self.expiry is None or
-                datetime.now() + timedelta(hours=2) > self.expiry):
-            authentificationToken = self.authenticate(
-                self.hostname, self.login, self.password)
-            auth_id = authentificationToken['id']
-            auth_secret_token = authentificationToken['secret_access_key']
-            auth_expiry_date = authentificationToken['expiry_date']
-            auth_expiry_date = auth_expiry_date.split('.')[0]
-            self.key = auth_id
-            self.secret = auth_secret_token
-            self.expiry = datetime.strptime(auth_expiry_date,
-                                            '%Y-%m-%dT%H:%M:%S')
-        return self.key, self.secret
+        with self.token_lock:
+            if (self.key is None or self.secret is None or
+                    self.expiry is None or
+                    datetime.utcnow() + timedelta(hours=2) > self.expiry):
+                authentificationToken = self.authenticate(
+                    self.hostname, self.login, self.password)
+                auth_id = authentificationToken['id']
+                auth_secret_token = authentificationToken['secret_access_key']
+                auth_expiry_date = authentificationToken['expiry_date']
+                auth_expiry_date = auth_expiry_date.split('.')[0]
+                self.key = auth_id
+                self.secret = auth_secret_token
+                self.expiry = datetime.strptime(auth_expiry_date,
+                                                '%Y-%m-%dT%H:%M:%S')
+            return self.key, self.secret
 
     def __fn_sign(self,
                   access_key_id: str,
@@ -3,12 +3,24 @@
 #
 
 import argparse
-import datetime
-import os
-import signal
+import csv
+import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
+import fleet
 import flix as flix_api
+import metrics
+import progress
+import reclaim
+import revoke
+import seat_store
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep',
+          'Oct', 'Nov', 'Dec']
 
 
 # Initialise cli params
@@ -19,26 +31,571 @@ def parse_cli():
     # Required args
     required_group = parser.add_argument_group('required arguments')
     required_group.add_argument(
-        '--server', required=True, help='Flix 6 server url')
+        '--server', help='Flix 6 server url, not needed by --history and '
+        '--fleet')
     required_group.add_argument(
-        '--user', required=True, help='Flix 6 client username')
+        '--user', help='Flix 6 client username, not needed by --history and '
+        '--fleet')
     required_group.add_argument(
-        '--password', required=True, help='Flix 6 client password')
+        '--password', help='Flix 6 client password, not needed by --history '
+        'and --fleet')
     required_action = required_group.add_mutually_exclusive_group(
         required=True)
     required_action.add_argument(
         '--info', action='store_true', help='Show seats and logged in users')
     required_action.add_argument(
         '--revoke',
-        help='Revoke user from access key',
+        help='Revoke user from access key, and the access keys matching '
+        'the selectors',
         nargs='*',
-        default=[])
-    return parser.parse_args()
+        default=None)
+    required_action.add_argument(
+        '--fleet', metavar='FILE',
+        help='Show the seats of all the servers of a fleet file, a JSON '
+        'list of {"name", "server", "user", "password" or "password_env"}')
+    required_action.add_argument(
+        '--watch', action='store_true',
+        help='Poll the seats and the access keys every --interval and '
+        'store them in --db, until interrupted')
+    required_action.add_argument(
+        '--metrics', action='store_true',
+        help='Serve the seats and the access keys polled every --interval '
+        'as Prometheus metrics on http://LISTEN/metrics, until interrupted')
+    required_action.add_argument(
+        '--reclaim', metavar='POLICY',
+        help='Revoke access keys every --interval when the seats reach the '
+        'threshold of a policy file, until interrupted')
+    required_action.add_argument(
+        '--history', action='store_true',
+        help='Show the seats stored in --db by --watch, or the access keys '
+        'of the users given with --owner')
+
+    selectors = parser.add_argument_group(
+        'revoke selectors', 'access keys matching all the selectors are '
+        'revoked, on top of the ones given to --revoke')
+    selectors.add_argument(
+        '--owner', action='append', metavar='USERNAME',
+        help='Access keys of a user, can be repeated, also used by '
+        '--history')
+    selectors.add_argument(
+        '--older-than', type=float, metavar='HOURS',
+        help='Access keys created more than HOURS ago')
+    selectors.add_argument(
+        '--expiring-before', type=parse_time, metavar='TIME',
+        help='Access keys expiring before TIME, in UTC '
+        '(2020-06-26T10:32:17Z)')
+
+    history = parser.add_argument_group('watch, metrics and history')
+    history.add_argument(
+        '--db', default='seats.db',
+        help='SQLite database of the seats (default: seats.db)')
+    history.add_argument(
+        '--interval', type=float, default=60,
+        help='Seconds between two polls of --watch, --metrics and '
+        '--reclaim (default: 60)')
+    history.add_argument(
+        '--listen', type=parse_address, default=('localhost', 9751),
+        help='Address of the --metrics server (default: localhost:9751)')
+    history.add_argument(
+        '--since', type=parse_time, metavar='TIME',
+        help='Start of --history, in UTC')
+    history.add_argument(
+        '--until', type=parse_time, metavar='TIME',
+        help='End of --history, in UTC')
+    history.add_argument(
+        '--resolution', choices=sorted(seat_store.RESOLUTIONS),
+        default='hour', help='Period of --history (default: hour)')
+
+    reclaim_group = parser.add_argument_group('reclaim')
+    reclaim_group.add_argument(
+        '--audit', default='reclaim.jsonl',
+        help='File the decisions of --reclaim are appended to '
+        '(default: reclaim.jsonl)')
+    reclaim_group.add_argument(
+        '--dry-run', action='store_true',
+        help='Only log the access keys --reclaim would revoke')
+
+    parser.add_argument(
+        '--jobs', type=int, default=8,
+        help='Access keys revoked or servers of --fleet queried at the '
+        'same time (default: 8)')
+    parser.add_argument(
+        '--format', choices=['table', 'json', 'csv'], default='table',
+        help='Output of the commands, csv of --info only lists the access '
+        'keys (default: table)')
+    args = parser.parse_args()
+    if not args.history and args.fleet is None:
+        for name in ('server', 'user', 'password'):
+            if getattr(args, name) is None:
+                parser.error('the following arguments are required: --' +
+                             name)
+    if args.interval <= 0:
+        parser.error('--interval needs to be positive')
+    if args.revoke is not None and len(args.revoke) < 1 and not (
+            args.owner or args.older_than is not None or
+            args.expiring_before is not None):
+        parser.error('--revoke needs access keys or selectors')
+    if args.jobs < 1:
+        parser.error('--jobs needs to be at least 1')
+    return args
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    """parse_address will parse an address from the command line
+    (localhost:9751 or :9751 for all the interfaces)
+
+    Arguments:
+        value {str} -- Host and port
+
+    Raises:
+        argparse.ArgumentTypeError: The address is not valid
+
+    Returns:
+        Tuple[str, int] -- Host and port
+    """
+    host, _, port = value.rpartition(':')
+    if not port.isdigit():
+        raise argparse.ArgumentTypeError(
+            'invalid address: {} (e.g. localhost:9751)'.format(value))
+    return host, int(port)
+
+
+def parse_time(value: str) -> datetime:
+    """parse_time will parse a time from the command line
+    (2020-06-26T10:32:17Z, 2020-06-26 10:32 or 2020-06-26)
+
+    Arguments:
+        value {str} -- Time in UTC
+
+    Raises:
+        argparse.ArgumentTypeError: The time is not valid
+
+    Returns:
+        datetime -- Time in UTC
+    """
+    try:
+        return datetime.fromisoformat(value.rstrip('Z'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            'invalid time: {} (e.g. 2020-06-26T10:32:17Z)'.format(value))
+
+
+def get_info(flix: flix_api.flix) -> Tuple[Dict, Dict]:
+    """get_info will retrieve the access keys and the seats concurrently
+
+    Arguments:
+        flix {flix_api.flix} -- Authenticated Flix api
+
+    Returns:
+        Tuple[Dict, Dict] -- Access keys and server info, None if they
+        could not be retrieved
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        access_keys = executor.submit(flix.get_users)
+        info = executor.submit(flix.get_info)
+        return access_keys.result(), info.result()
+
+
+def format_date(value: str) -> str:
+    """format_date will format an expiry date from Flix
+    (2020-06-26T10:32:17Z) as Jun 26 2020 10:32 AM, without strptime
+
+    Arguments:
+        value {str} -- Date from Flix
+
+    Returns:
+        str -- Formatted date, the date unchanged if it is not in this format
+    """
+    if (not isinstance(value, str) or len(value) != 20 or
+            value[4] != '-' or value[10] != 'T' or value[19] != 'Z'):
+        return str(value)
+    month = int(value[5:7])
+    if month < 1 or month > 12:
+        return value
+    hour = value[11:13]
+    return '{0} {1} {2} {3}:{4} {5}'.format(
+        MONTHS[month - 1], value[8:10], value[0:4], hour, value[14:16],
+        'AM' if hour < '12' else 'PM')
+
+
+def iter_access_keys(access_keys: Dict) -> Iterator[Tuple[str, str, str,
+                                                          str]]:
+    """iter_access_keys will go through the access keys one by one
+
+    Arguments:
+        access_keys {Dict} -- Access keys from get_users
+
+    Returns:
+        Iterator[Tuple[str, str, str, str]] -- Access key, user id,
+        username and expiry date
+    """
+    for ak in access_keys.get('access_keys', []):
+        owner = ak.get('owner', {})
+        yield (str(ak.get('id')), str(owner.get('id')),
+               str(owner.get('username')), ak.get('expiry_date'))
+
+
+def print_table(access_keys: Dict, info: Dict, out: object):
+    """print_table will print the seats and a table of the access keys
+
+    Arguments:
+        access_keys {Dict} -- Access keys from get_users
+
+        info {Dict} -- Server info from get_info
+
+        out {object} -- Output stream
+    """
+    out.write('Seats in use: {} / Maximum seats: {}\n'.format(
+        info.get('current_seats'),
+        info.get('max_seats')))
+    dash = '-' * 100
+    out.write('{0}\n{1:<20s}|{2:>6s}|{3:>20s}|{4:>30s}\n{0}\n'.format(
+        dash, 'access_key', 'user id', 'username', 'expiry_date'))
+    for key, user_id, username, expiry_date in iter_access_keys(access_keys):
+        out.write('{:<20s}|{:>7s}|{:>20s}|{:>30s}\n'.format(
+            key, user_id, username, format_date(expiry_date)))
+
+
+def print_json(access_keys: Dict, info: Dict, out: object):
+    """print_json will print the seats and the access keys as one JSON
+    object, written key by key
+
+    Arguments:
+        access_keys {Dict} -- Access keys from get_users
+
+        info {Dict} -- Server info from get_info
+
+        out {object} -- Output stream
+    """
+    out.write('{{"current_seats": {0}, "max_seats": {1}, '
+              '"access_keys": ['.format(
+                  json.dumps(info.get('current_seats')),
+                  json.dumps(info.get('max_seats'))))
+    sep = '\n'
+    for key, user_id, username, expiry_date in iter_access_keys(access_keys):
+        out.write(sep + json.dumps({'access_key': key,
+                                    'user_id': user_id,
+                                    'username': username,
+                                    'expiry_date': expiry_date}))
+        sep = ',\n'
+    out.write(']}\n')
+
+
+def print_csv(access_keys: Dict, info: Dict, out: object):
+    """print_csv will print the access keys as CSV
+
+    Arguments:
+        access_keys {Dict} -- Access keys from get_users
+
+        info {Dict} -- Server info from get_info, not printed
+
+        out {object} -- Output stream
+    """
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(['access_key', 'user_id', 'username', 'expiry_date'])
+    writer.writerows(iter_access_keys(access_keys))
+
+
+PRINTERS = {
+    'table': print_table,
+    'json': print_json,
+    'csv': print_csv,
+}
+
+
+def format_time(ts: int) -> str:
+    """format_time will format a time as Flix does (2020-06-26T10:32:17Z)
+
+    Arguments:
+        ts {int} -- Seconds since epoch
+
+    Returns:
+        str -- Time in UTC
+    """
+    return datetime.fromtimestamp(ts, timezone.utc).strftime(
+        '%Y-%m-%dT%H:%M:%SZ')
+
+
+def to_timestamp(value: datetime) -> int:
+    """to_timestamp will convert a time in UTC from parse_time
+
+    Arguments:
+        value {datetime} -- Time in UTC, or None
+
+    Returns:
+        int -- Seconds since epoch, None if value is None
+    """
+    if value is None:
+        return None
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+def row_writer(columns: List[str], fmt: str,
+               out: object) -> Callable[[Dict], None]:
+    """row_writer will print the header of a table, and return a function
+    printing its rows one by one, the times are formatted
+
+    Arguments:
+        columns {List[str]} -- Columns of the table, time columns are
+        'time' and 'start'
+
+        fmt {str} -- Output format: table, json or csv
+
+        out {object} -- Output stream
+
+    Returns:
+        Callable[[Dict], None] -- Function printing a row
+    """
+    writer = csv.writer(out, lineterminator='\n')
+    widths = [20 if c in ('time', 'start') else max(len(c), 10)
+              for c in columns]
+    if fmt == 'table':
+        out.write('|'.join('{0:>{1}s}'.format(c, w)
+                           for c, w in zip(columns, widths)) + '\n')
+        out.write('-' * (sum(widths) + len(widths) - 1) + '\n')
+    elif fmt == 'csv':
+        writer.writerow(columns)
+
+    def write(row: Dict):
+        values = [format_time(row[c]) if c in ('time', 'start') else row[c]
+                  for c in columns]
+        if fmt == 'json':
+            out.write(json.dumps(dict(zip(columns, values))) + '\n')
+        elif fmt == 'csv':
+            writer.writerow(values)
+        else:
+            out.write('|'.join('{0:>{1}s}'.format(str(v), w)
+                               for v, w in zip(values, widths)) + '\n')
+        out.flush()
+    return write
+
+
+def count_user_keys(access_keys: Dict) -> Dict:
+    """count_user_keys will count the access keys of every user
+
+    Arguments:
+        access_keys {Dict} -- Access keys from get_users
+
+    Returns:
+        Dict -- Number of access keys per username
+    """
+    counts = {}
+    for ak in access_keys.get('access_keys', []):
+        username = str(ak.get('owner', {}).get('username'))
+        counts[username] = counts.get(username, 0) + 1
+    return counts
+
+
+def watch(flix: flix_api.flix, store: seat_store.seat_store,
+          interval: float, fmt: str, out: object):
+    """watch will poll the seats and the access keys with the same
+    session, store them and print them, until interrupted
+
+    Arguments:
+        flix {flix_api.flix} -- Authenticated Flix api
+
+        store {seat_store.seat_store} -- Store of the samples
+
+        interval {float} -- Seconds between two polls
+
+        fmt {str} -- Output format: table, json or csv
+
+        out {object} -- Output stream
+    """
+    write = row_writer(['time', 'current_seats', 'max_seats', 'access_keys',
+                        'users'], fmt, out)
+    next_poll = time.monotonic()
+    while True:
+        access_keys, info = get_info(flix)
+        if access_keys is None or info is None:
+            # The token may have been revoked, login again for the next poll
+            print('could not poll Flix Server', file=sys.stderr)
+            flix.authenticate(flix.hostname, flix.login, flix.password)
+        else:
+            ts = int(time.time())
+            user_keys = count_user_keys(access_keys)
+            if store.add_sample(ts, info, user_keys):
+                write({'time': ts,
+                       'current_seats': info.get('current_seats'),
+                       'max_seats': info.get('max_seats'),
+                       'access_keys': sum(user_keys.values()),
+                       'users': len(user_keys)})
+            else:
+                print('no seats in use in the server info', file=sys.stderr)
+        # Polls are not shifted by the time of the requests, unless they
+        # take longer than the interval
+        next_poll = max(next_poll + interval, time.monotonic())
+        time.sleep(max(next_poll - time.monotonic(), 0))
+
+
+def print_history(store: seat_store.seat_store, args: argparse.Namespace,
+                  out: object):
+    """print_history will print the seats stored by --watch, or the
+    access keys of the users given with --owner
+
+    Arguments:
+        store {seat_store.seat_store} -- Store of the samples
+
+        args {argparse.Namespace} -- Command line arguments
+
+        out {object} -- Output stream
+    """
+    since = to_timestamp(args.since)
+    until = to_timestamp(args.until)
+    if args.owner:
+        write = row_writer(['time', 'username', 'keys'], args.format, out)
+        for username in args.owner:
+            for row in store.user_history(username, since, until):
+                row['username'] = username
+                write(row)
+        return
+    write = row_writer(['start', 'samples', 'min_seats', 'avg_seats',
+                        'peak_seats', 'max_seats', 'peak_keys', 'peak_users'],
+                       args.format, out)
+    for row in store.history(since, until, args.resolution):
+        write(row)
+
+
+def print_fleet(results: List[Dict], fmt: str, out: object):
+    """print_fleet will print the seats of every server of a fleet and
+    their total, the servers that failed are listed after them
+
+    Arguments:
+        results {List[Dict]} -- Results from fleet.query_fleet
+
+        fmt {str} -- Output format: table, json or csv
+
+        out {object} -- Output stream
+    """
+    columns = ['name', 'current_seats', 'max_seats', 'access_keys', 'users',
+               'login_ms', 'query_ms']
+    sums = fleet.total(results)
+    if fmt == 'json':
+        out.write(json.dumps({'servers': results, 'total': sums}, indent=2) +
+                  '\n')
+        return
+    if fmt == 'csv':
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(columns + ['error'])
+        writer.writerows([r[c] for c in columns + ['error']]
+                         for r in results)
+        return
+    out.write('{0:<20s}|{1:>13s}|{2:>10s}|{3:>11s}|{4:>8s}|{5:>9s}|{6:>9s}'
+              '\n{7}\n'.format(*columns, '-' * 86))
+    row = '{0:<20s}|{1:>13}|{2:>10}|{3:>11}|{4:>8}|{5:>9}|{6:>9}\n'
+    for r in results:
+        if r['error'] is None:
+            out.write(row.format(*[r[c] for c in columns]))
+    out.write('-' * 86 + '\n')
+    out.write(row.format(
+        'total ({0}/{1})'.format(sums['servers'] - sums['failed'],
+                                 sums['servers']),
+        sums['current_seats'], sums['max_seats'], sums['access_keys'],
+        sums['users'], '', ''))
+    failed = [r for r in results if r['error'] is not None]
+    if len(failed) > 0:
+        out.write('\nfailed servers:\n')
+        for r in failed:
+            out.write('{0:<20s}| {1}\n'.format(r['name'], r['error']))
+
+
+def get_revoke_list(flix: flix_api.flix,
+                    args: argparse.Namespace) -> Tuple[List[str], Dict]:
+    """get_revoke_list will resolve the access keys to revoke, the access
+    keys are only retrieved once, when selectors are given
+
+    Arguments:
+        flix {flix_api.flix} -- Authenticated Flix api
+
+        args {argparse.Namespace} -- Command line arguments
+
+    Returns:
+        Tuple[List[str], Dict] -- Access keys, and their username when known,
+        None if the access keys could not be retrieved
+    """
+    keys = list(args.revoke)
+    usernames = {}
+    if (args.owner or args.older_than is not None or
+            args.expiring_before is not None):
+        access_keys = flix.get_users()
+        if access_keys is None:
+            return None, None
+        for ak in access_keys.get('access_keys', []):
+            usernames[ak.get('id')] = ak.get('owner', {}).get('username')
+        keys.extend(ak.get('id') for ak in revoke.select_access_keys(
+            access_keys, args.owner, args.older_than, args.expiring_before))
+    # Keep the order, a key given twice is revoked once
+    return list(dict.fromkeys(keys)), usernames
+
+
+def print_revoked(results: Iterable[Tuple[str, str]], usernames: Dict,
+                  fmt: str, out: object,
+                  fn_progress: Callable[[str, bool], None] = None) -> int:
+    """print_revoked will print the result of every access key as soon as
+    it is revoked
+
+    Arguments:
+        results {Iterable[Tuple[str, str]]} -- Access keys and status
+
+        usernames {Dict} -- Username per access key
+
+        fmt {str} -- Output format: table, json or csv
+
+        out {object} -- Output stream
+
+        fn_progress {Callable[[str, bool], None]} -- Progress function,
+        called with a new step for every access key (default: {None})
+
+    Returns:
+        int -- Number of access keys not revoked
+    """
+    writer = csv.writer(out, lineterminator='\n')
+    if fmt == 'table':
+        out.write('{0:<20s}|{1:>20s}|{2:>10s}\n{3}\n'.format(
+            'access_key', 'username', 'status', '-' * 52))
+    elif fmt == 'csv':
+        writer.writerow(['access_key', 'username', 'status'])
+    failed = 0
+    for key, status in results:
+        username = usernames.get(key)
+        if status != 'revoked':
+            failed += 1
+        if fmt == 'json':
+            out.write(json.dumps({'access_key': key, 'username': username,
+                                  'status': status}) + '\n')
+        elif fmt == 'csv':
+            writer.writerow([key, username, status])
+        else:
+            out.write('{0:<20s}|{1:>20s}|{2:>10s}\n'.format(
+                key, str(username or ''), status))
+        out.flush()
+        if fn_progress is not None:
+            fn_progress('revoked access keys, {0} failed'.format(failed),
+                        False)
+    return failed
 
 
 if __name__ == '__main__':
     args = parse_cli()
 
+    if args.history:
+        store = seat_store.seat_store(args.db)
+        print_history(store, args, sys.stdout)
+        store.close()
+        sys.exit(0)
+
+    if args.fleet is not None:
+        try:
+            servers = fleet.load_fleet(args.fleet)
+        except (OSError, ValueError) as err:
+            print('could not read the fleet file:', err)
+            sys.exit(1)
+        p = progress.progress(progress.progress_stream(), len(servers))
+        results = fleet.query_fleet(servers, get_info, args.jobs, p.update)
+        print_fleet(results, args.format, sys.stdout)
+        # Fail when a server could not be queried
+        sys.exit(1 if fleet.total(results)['failed'] > 0 else 0)
+
     # Init flix api
     flix_api = flix_api.flix()
 
@@ -56,43 +613,70 @@ if __name__ == '__main__':
         sys.exit(1)
 
     if args.info:
-        # Get Access keys:
-        access_keys = flix_api.get_users()
+        # Get access keys and infos
+        access_keys, info = get_info(flix_api)
         if access_keys is None:
             print('could not get access keys from Flix Server')
             sys.exit(1)
-
-        # Get infos
-        info = flix_api.get_info()
         if info is None:
             print('could not get infos from Flix Server')
             sys.exit(1)
 
-        # Print seats infos
-        print('Seats in use: {} / Maximum seats: {}'.format(
-            info.get('current_seats'),
-            info.get('max_seats')))
-
-        # Print table of users
-        dash = '-' * 100
-        print(dash)
-        print('{:<20s}|{:>6s}|{:>20s}|{:>30s}'.format(
-            'access_key',
-            'user id',
-            'username', 'expiry_date'))
-        print(dash)
-        for ak in access_keys.get('access_keys', []):
-            owner = ak.get('owner', {})
-            expiry_date = datetime.datetime.strptime(str(ak.get('expiry_date')), '%Y-%m-%dT%H:%M:%SZ')
-            expiry_date = expiry_date.strftime("%b %d %Y %H:%M %p")
-            print('{:<20s}|{:>7s}|{:>20s}|{:>30s}'.format(
-                str(ak.get('id')),
-                str(owner.get('id')),
-                str(owner.get('username')),
-                expiry_date))
-
-    elif args.revoke:
+        PRINTERS[args.format](access_keys, info, sys.stdout)
+
+    elif args.revoke is not None:
         # Revoke access keys
-        for ak_id in args.revoke:
-            if flix_api.revoke_access_key(ak_id) is False:
-                print('could not revoke access key: {}'.format(ak_id))
+        keys, usernames = get_revoke_list(flix_api, args)
+        if keys is None:
+            print('could not get access keys from Flix Server')
+            sys.exit(1)
+        results = revoke.revoke_access_keys(flix_api, keys, args.jobs)
+        p = progress.progress(progress.progress_stream(), len(keys))
+        if print_revoked(results, usernames, args.format, sys.stdout,
+                         p.update) > 0:
+            sys.exit(1)
+
+    elif args.watch:
+        store = seat_store.seat_store(args.db)
+        try:
+            watch(flix_api, store, args.interval, args.format, sys.stdout)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            store.close()
+
+    elif args.metrics:
+        host, port = args.listen
+        poller = metrics.poller(
+            lambda: get_info(flix_api),
+            lambda: flix_api.authenticate(hostname, login, password),
+            args.interval)
+        server = metrics.serve(poller, host, port)
+        print('serving metrics on http://{0}:{1}/metrics'.format(
+            host or '0.0.0.0', server.server_address[1]))
+        poller.start()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            poller.stop()
+
+    elif args.reclaim is not None:
+        try:
+            policy = reclaim.load_policy(args.reclaim)
+        except (OSError, ValueError) as err:
+            print('could not read the policy:', err)
+            sys.exit(1)
+        write = row_writer(['time', 'access_key', 'username', 'rule',
+                            'status'], args.format, sys.stdout)
+        audit = reclaim.audit_log(args.audit)
+        try:
+            reclaim.run(flix_api, get_info, policy, audit, args.interval,
+                        lambda c: write(dict(c, time=int(time.time()))),
+                        args.dry_run, args.jobs)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            audit.close()
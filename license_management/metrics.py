@@ -0,0 +1,236 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+import revoke
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds of the buckets of the time left before the access keys
+# expire, in seconds
+EXPIRY_BUCKETS = [300, 900, 3600, 4 * 3600, 12 * 3600, 24 * 3600]
+
+
+def escape(value: str) -> str:
+    """escape will escape a label value of the Prometheus text format
+
+    Arguments:
+        value {str} -- Label value
+
+    Returns:
+        str -- Escaped value
+    """
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def render(access_keys: Dict, info: Dict, up: bool, polled: float,
+           duration: float, now: datetime = None) -> bytes:
+    """render will write the metrics in the Prometheus text format
+
+    Arguments:
+        access_keys {Dict} -- Access keys from get_users, None if they were
+        never retrieved
+
+        info {Dict} -- Server info from get_info, None if it was never
+        retrieved
+
+        up {bool} -- Last poll succeeded
+
+        polled {float} -- Time of the last successful poll, seconds since
+        epoch
+
+        duration {float} -- Seconds taken by the last poll
+
+        now {datetime} -- Current date in UTC (default: {None})
+
+    Returns:
+        bytes -- Metrics
+    """
+    if now is None:
+        now = datetime.utcnow()
+    lines = [
+        '# HELP flix_up Last poll of the Flix server succeeded',
+        '# TYPE flix_up gauge',
+        'flix_up {0}'.format(1 if up else 0),
+        '# HELP flix_poll_duration_seconds Time taken by the last poll',
+        '# TYPE flix_poll_duration_seconds gauge',
+        'flix_poll_duration_seconds {0:.3f}'.format(duration),
+    ]
+    if info is not None and access_keys is not None:
+        lines.extend(render_values(access_keys, info, now))
+        lines.extend([
+            '# HELP flix_last_poll_timestamp_seconds Time of the last '
+            'successful poll',
+            '# TYPE flix_last_poll_timestamp_seconds gauge',
+            'flix_last_poll_timestamp_seconds {0:.3f}'.format(polled),
+        ])
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def render_values(access_keys: Dict, info: Dict,
+                  now: datetime) -> List[str]:
+    """render_values will write the seats, the access keys per user and
+    the histogram of their expiry
+
+    Arguments:
+        access_keys {Dict} -- Access keys from get_users
+
+        info {Dict} -- Server info from get_info
+
+        now {datetime} -- Current date in UTC
+
+    Returns:
+        List[str] -- Lines of the metrics
+    """
+    per_user = {}
+    buckets = [0] * len(EXPIRY_BUCKETS)
+    expiry_sum = 0.0
+    expiry_count = 0
+    for ak in access_keys.get('access_keys', []):
+        username = ak.get('owner', {}).get('username')
+        per_user[username] = per_user.get(username, 0) + 1
+        expiry = revoke.parse_date(ak.get('expiry_date'))
+        if expiry is None:
+            continue
+        left = (expiry - now).total_seconds()
+        expiry_sum += left
+        expiry_count += 1
+        for i, bound in enumerate(EXPIRY_BUCKETS):
+            if left <= bound:
+                buckets[i] += 1
+    lines = [
+        '# HELP flix_seats_current Seats in use',
+        '# TYPE flix_seats_current gauge',
+        'flix_seats_current {0}'.format(info.get('current_seats') or 0),
+        '# HELP flix_seats_max Maximum seats',
+        '# TYPE flix_seats_max gauge',
+        'flix_seats_max {0}'.format(info.get('max_seats') or 0),
+        '# HELP flix_access_keys Access keys of the logged in users',
+        '# TYPE flix_access_keys gauge',
+        'flix_access_keys {0}'.format(sum(per_user.values())),
+        '# HELP flix_user_access_keys Access keys per user',
+        '# TYPE flix_user_access_keys gauge',
+    ]
+    lines.extend('flix_user_access_keys{{username="{0}"}} {1}'.format(
+        escape(u), n) for u, n in sorted(per_user.items(), key=str))
+    lines.extend([
+        '# HELP flix_access_key_expiry_seconds Time left before the access '
+        'keys expire',
+        '# TYPE flix_access_key_expiry_seconds histogram',
+    ])
+    lines.extend('flix_access_key_expiry_seconds_bucket{{le="{0}"}} {1}'
+                 .format(b, n) for b, n in zip(EXPIRY_BUCKETS, buckets))
+    lines.extend([
+        'flix_access_key_expiry_seconds_bucket{{le="+Inf"}} {0}'.format(
+            expiry_count),
+        'flix_access_key_expiry_seconds_sum {0:.1f}'.format(expiry_sum),
+        'flix_access_key_expiry_seconds_count {0}'.format(expiry_count),
+    ])
+    return lines
+
+
+class poller:
+    """poller polls the Flix server from a background thread and keeps the
+    metrics rendered, a scrape only reads the last ones and never waits
+    for the Flix server
+    """
+
+    def __init__(self,
+                 fn_poll: Callable[[], Tuple[Dict, Dict]],
+                 fn_login: Callable[[], object],
+                 interval: float = 15):
+        self.fn_poll = fn_poll
+        self.fn_login = fn_login
+        self.interval = interval
+        self.access_keys = None
+        self.info = None
+        self.polled = 0.0
+        self.metrics = render(None, None, False, 0.0, 0.0)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.__run, daemon=True)
+
+    def start(self):
+        """start will poll once, so the first scrape has values, then every
+        interval from the background thread
+        """
+        self.poll()
+        self.thread.start()
+
+    def stop(self):
+        """stop will stop polling after the current poll
+        """
+        self.stopped.set()
+        self.thread.join()
+
+    def poll(self):
+        """poll will poll the Flix server once and render the metrics
+        """
+        start = time.time()
+        try:
+            access_keys, info = self.fn_poll()
+        except Exception as err:
+            print('could not poll Flix Server', err, file=sys.stderr)
+            access_keys, info = None, None
+        up = access_keys is not None and info is not None
+        if up:
+            self.access_keys, self.info = access_keys, info
+            self.polled = time.time()
+        # Swapped at once, the handlers read it without a lock
+        self.metrics = render(self.access_keys, self.info, up, self.polled,
+                              time.time() - start)
+        if not up:
+            # The token may have been revoked, login again for the next poll
+            try:
+                self.fn_login()
+            except Exception as err:
+                print('could not login to Flix Server', err, file=sys.stderr)
+
+    def __run(self):
+        """__run will poll every interval until stopped
+        """
+        next_poll = time.monotonic() + self.interval
+        while not self.stopped.wait(max(next_poll - time.monotonic(), 0)):
+            self.poll()
+            next_poll = max(next_poll + self.interval, time.monotonic())
+
+
+def serve(p: poller, host: str, port: int) -> ThreadingHTTPServer:
+    """serve will create the HTTP server of the metrics, on /metrics
+
+    Arguments:
+        p {poller} -- Poller of the metrics
+
+        host {str} -- Address to listen to
+
+        port {int} -- Port to listen to
+
+    Returns:
+        ThreadingHTTPServer -- Server, to run with serve_forever
+    """
+    class handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = p.metrics
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
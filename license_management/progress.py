@@ -0,0 +1,116 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import sys
+import threading
+import time
+from typing import Callable
+
+
+class progress:
+    """progress follows a long running operation and reports it to a sink.
+    Updates are merged: the sink is called at most every interval with the
+    latest step and message, and once when the last step is reached. It
+    keeps the throughput and the estimated time left from the steps done
+    so far
+    """
+
+    def __init__(self,
+                 fn_report: Callable[['progress'], None],
+                 steps: int = 0,
+                 interval: float = 0.1):
+        self.fn_report = fn_report
+        self.steps = steps
+        self.interval = interval
+        self.step = 0
+        self.message = ''
+        self.start = time.time()
+        self.last_report = 0.0
+        self.lock = threading.Lock()
+
+    def update(self, message: str, skip_step: bool = True):
+        """update will set the progress message, and go to the next step
+        when skip_step is False
+
+        Arguments:
+            message {str} -- Message of the progress
+
+            skip_step {bool} -- Will skip the step (default: {True})
+        """
+        with self.lock:
+            if skip_step is False:
+                self.step += 1
+            self.message = message
+            now = time.time()
+            last = skip_step is False and 0 < self.steps <= self.step
+            if not last and now - self.last_report < self.interval:
+                return
+            self.last_report = now
+        self.fn_report(self)
+
+    def elapsed(self) -> float:
+        """elapsed will return the time since the start
+
+        Returns:
+            float -- Seconds
+        """
+        return time.time() - self.start
+
+    def rate(self) -> float:
+        """rate will return the throughput of the operation
+
+        Returns:
+            float -- Steps done per second
+        """
+        return self.step / max(self.elapsed(), 1e-6)
+
+    def eta(self) -> float:
+        """eta will return the time left, from the throughput so far
+
+        Returns:
+            float -- Seconds, None if it is unknown
+        """
+        if self.step < 1 or self.steps <= self.step:
+            return None
+        return (self.steps - self.step) / self.rate()
+
+    def describe(self) -> str:
+        """describe will return the steps, throughput and time left
+
+        Returns:
+            str -- Progress summary
+        """
+        text = '{0}/{1} steps, {2:.1f}/s'.format(
+            self.step, self.steps, self.rate())
+        eta = self.eta()
+        if eta is not None:
+            text = '{0}, {1:.0f}s left'.format(text, eta)
+        return text
+
+
+class progress_stream:
+    """progress_stream is a progress sink printing the progress on stderr,
+    away from the table, JSON or CSV written to stdout. A line is printed
+    at most every interval, and for the last step
+    """
+
+    def __init__(self, stream: object = sys.stderr, interval: float = 1.0):
+        self.stream = stream
+        self.interval = interval
+        self.last = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self, p: progress):
+        """__call__ will print the progress
+
+        Arguments:
+            p {progress} -- Progress to print
+        """
+        with self.lock:
+            now = time.time()
+            if p.step < p.steps and now - self.last < self.interval:
+                return
+            self.last = now
+            self.stream.write('{0} ({1})\n'.format(p.message, p.describe()))
+            self.stream.flush()
@@ -0,0 +1,290 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import json
+import math
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import flix as flix_api
+import revoke
+
+RULES = ['duplicates', 'expiring', 'oldest']
+
+DEFAULT_POLICY = {
+    'threshold': 1.0,
+    'target': 0.95,
+    'rules': ['duplicates', 'oldest'],
+    'protected': [],
+    'max_revokes': 50,
+}
+
+
+def load_policy(path: str) -> Dict:
+    """load_policy will read a reclaim policy, a JSON object with:
+    threshold -- Fraction of the max seats in use starting a reclaim
+    target -- Fraction of the max seats in use to go back to
+    rules -- Order the access keys are revoked in: duplicates (all the
+    keys of a user but the newest), expiring (soonest expiry first) or
+    oldest (oldest creation first)
+    protected -- Usernames and access keys never revoked
+    max_revokes -- Access keys revoked at most per reclaim
+
+    Arguments:
+        path {str} -- Path of the policy file
+
+    Raises:
+        ValueError: The policy is not valid
+
+    Returns:
+        Dict -- Policy, with the defaults of the missing values
+    """
+    with open(path) as f:
+        try:
+            values = json.load(f)
+        except ValueError as err:
+            raise ValueError('{0} is not valid JSON: {1}'.format(path, err))
+    if not isinstance(values, dict):
+        raise ValueError('{0} needs an object'.format(path))
+    unknown = set(values) - set(DEFAULT_POLICY)
+    if len(unknown) > 0:
+        raise ValueError('unknown policy values: {0}'.format(
+            ', '.join(sorted(unknown))))
+    policy = dict(DEFAULT_POLICY, **values)
+    for key in ('threshold', 'target'):
+        if (not isinstance(policy[key], (int, float)) or
+                not 0 < policy[key] <= 1):
+            raise ValueError('{0} needs to be a fraction of the max seats, '
+                             'between 0 and 1'.format(key))
+    if policy['target'] > policy['threshold']:
+        raise ValueError('target needs to be under the threshold')
+    if len(policy['rules']) < 1 or not set(policy['rules']) <= set(RULES):
+        raise ValueError('rules need to be some of: {0}'.format(
+            ', '.join(RULES)))
+    if not isinstance(policy['max_revokes'], int) or \
+            policy['max_revokes'] < 1:
+        raise ValueError('max_revokes needs to be at least 1')
+    policy['protected'] = set(policy['protected'])
+    return policy
+
+
+def key_age(ak: Dict) -> datetime:
+    """key_age will return the date sorting the access keys by age, the
+    creation date, or the expiry date when it is missing since the keys
+    last as long
+
+    Arguments:
+        ak {Dict} -- Access key from get_users
+
+    Returns:
+        datetime -- Date, datetime.max if there is none
+    """
+    return (revoke.parse_date(ak.get('created_date')) or
+            revoke.parse_date(ak.get('expiry_date')) or datetime.max)
+
+
+def candidates(keys: List[Dict], rule: str) -> List[Dict]:
+    """candidates will order the access keys to revoke by a rule
+
+    Arguments:
+        keys {List[Dict]} -- Access keys from get_users
+
+        rule {str} -- duplicates, expiring or oldest
+
+    Returns:
+        List[Dict] -- Access keys, the first to revoke first
+    """
+    if rule == 'expiring':
+        return sorted(keys, key=lambda ak: (
+            revoke.parse_date(ak.get('expiry_date')) or datetime.max))
+    if rule == 'oldest':
+        return sorted(keys, key=key_age)
+    per_user = {}
+    for ak in keys:
+        per_user.setdefault(ak.get('owner', {}).get('username'),
+                            []).append(ak)
+    duplicates = []
+    for user_keys in per_user.values():
+        if len(user_keys) > 1:
+            # Keep the newest key of the user, it is the one in use
+            duplicates.extend(sorted(user_keys, key=key_age)[:-1])
+    return sorted(duplicates, key=key_age)
+
+
+def plan(access_keys: Dict, info: Dict, policy: Dict,
+         protected: List[str] = ()) -> Tuple[int, List[Dict]]:
+    """plan will choose the access keys to revoke when the seats in use
+    reach the threshold, until the target is reached. When a seat is taken
+    per user, a seat is only freed once all the keys of the user are
+    revoked
+
+    Arguments:
+        access_keys {Dict} -- Access keys from get_users
+
+        info {Dict} -- Server info from get_info
+
+        policy {Dict} -- Policy from load_policy
+
+        protected {List[str]} -- Usernames and access keys never revoked,
+        on top of the ones of the policy (default: {()})
+
+    Returns:
+        Tuple[int, List[Dict]] -- Seats to free, and the access keys to
+        revoke with their username and rule
+    """
+    seats = info.get('current_seats') or 0
+    max_seats = info.get('max_seats') or 0
+    if max_seats < 1 or seats < math.ceil(max_seats * policy['threshold']):
+        return 0, []
+    needed = seats - math.floor(max_seats * policy['target'])
+    protected = policy['protected'].union(protected)
+    keys = [ak for ak in access_keys.get('access_keys', [])
+            if ak.get('id') not in protected and
+            ak.get('owner', {}).get('username') not in protected]
+    remaining = {}
+    for ak in access_keys.get('access_keys', []):
+        username = ak.get('owner', {}).get('username')
+        remaining[username] = remaining.get(username, 0) + 1
+    per_user = seats == len(remaining)
+    chosen = []
+    seen = set()
+    freed = 0
+    for rule in policy['rules']:
+        for ak in candidates(keys, rule):
+            if freed >= needed or len(chosen) >= policy['max_revokes']:
+                return needed, chosen
+            if ak.get('id') in seen:
+                continue
+            seen.add(ak.get('id'))
+            username = ak.get('owner', {}).get('username')
+            chosen.append({'access_key': ak.get('id'),
+                           'username': username,
+                           'rule': rule})
+            remaining[username] -= 1
+            if not per_user or remaining[username] == 0:
+                freed += 1
+    return needed, chosen
+
+
+class audit_log:
+    """audit_log appends the decisions of the reclaims to a file, one JSON
+    object per line
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, 'a')
+        self.lock = threading.Lock()
+
+    def write(self, event: str, **kwargs):
+        """write will append an event
+
+        Arguments:
+            event {str} -- Event name: reclaim or revoke
+        """
+        line = dict(kwargs, event=event, time=datetime.utcnow().strftime(
+            '%Y-%m-%dT%H:%M:%SZ'))
+        with self.lock:
+            self.file.write(json.dumps(line, sort_keys=True) + '\n')
+            self.file.flush()
+
+    def close(self):
+        """close will close the file
+        """
+        self.file.close()
+
+
+def reclaim(flix: flix_api.flix,
+            fn_fetch: Callable[[flix_api.flix], Tuple[Dict, Dict]],
+            policy: Dict,
+            audit: audit_log,
+            dry_run: bool = False,
+            jobs: int = 8) -> List[Dict]:
+    """reclaim will check the seats once, and revoke the access keys
+    chosen by the policy if the threshold is reached. The access key of
+    this session is never revoked
+
+    Arguments:
+        flix {flix_api.flix} -- Authenticated Flix api
+
+        fn_fetch {Callable[[flix_api.flix], Tuple[Dict, Dict]]} -- Function
+        retrieving the access keys and the server info
+
+        policy {Dict} -- Policy from load_policy
+
+        audit {audit_log} -- Audit log of the decisions
+
+        dry_run {bool} -- Only log the decisions (default: {False})
+
+        jobs {int} -- Access keys revoked at the same time (default: {8})
+
+    Returns:
+        List[Dict] -- Access keys chosen, with their username, rule and
+        status, None if the seats could not be retrieved
+    """
+    access_keys, info = fn_fetch(flix)
+    if access_keys is None or info is None:
+        return None
+    needed, chosen = plan(access_keys, info, policy, [flix.key])
+    if needed < 1:
+        return []
+    audit.write('reclaim', current_seats=info.get('current_seats'),
+                max_seats=info.get('max_seats'), seats_to_free=needed,
+                access_keys=len(chosen), dry_run=dry_run)
+    by_key = {c['access_key']: c for c in chosen}
+    if dry_run:
+        results = [(k, 'dry-run') for k in by_key]
+    else:
+        results = revoke.revoke_access_keys(flix, list(by_key), jobs)
+    for key, status in results:
+        by_key[key]['status'] = status
+        audit.write('revoke', status=status, **{
+            k: by_key[key][k] for k in ('access_key', 'username', 'rule')})
+    return chosen
+
+
+def run(flix: flix_api.flix,
+        fn_fetch: Callable[[flix_api.flix], Tuple[Dict, Dict]],
+        policy: Dict,
+        audit: audit_log,
+        interval: float,
+        fn_report: Callable[[Dict], None],
+        dry_run: bool = False,
+        jobs: int = 8):
+    """run will reclaim every interval, until interrupted
+
+    Arguments:
+        flix {flix_api.flix} -- Authenticated Flix api
+
+        fn_fetch {Callable[[flix_api.flix], Tuple[Dict, Dict]]} -- Function
+        retrieving the access keys and the server info
+
+        policy {Dict} -- Policy from load_policy
+
+        audit {audit_log} -- Audit log of the decisions
+
+        interval {float} -- Seconds between two checks
+
+        fn_report {Callable[[Dict], None]} -- Function called with every
+        access key chosen
+
+        dry_run {bool} -- Only log the decisions (default: {False})
+
+        jobs {int} -- Access keys revoked at the same time (default: {8})
+    """
+    next_check = time.monotonic()
+    while True:
+        chosen = reclaim(flix, fn_fetch, policy, audit, dry_run, jobs)
+        if chosen is None:
+            # The token may have been revoked, login again for the next check
+            print('could not get the seats from Flix Server',
+                  file=sys.stderr)
+            flix.authenticate(flix.hostname, flix.login, flix.password)
+        else:
+            for c in chosen:
+                fn_report(c)
+        next_check = max(next_check + interval, time.monotonic())
+        time.sleep(max(next_check - time.monotonic(), 0))
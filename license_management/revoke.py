@@ -0,0 +1,106 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+import flix as flix_api
+
+# Result of flix.revoke_access_key -> status of the access key
+STATUSES = {True: 'revoked', False: 'failed', None: 'forbidden'}
+
+
+def parse_date(value: str) -> datetime:
+    """parse_date will parse a date from Flix (2020-06-26T10:32:17Z or
+    2020-06-26T10:32:17.123Z), without strptime
+
+    Arguments:
+        value {str} -- Date from Flix
+
+    Returns:
+        datetime -- Date in UTC, None if it is not in this format
+    """
+    if (not isinstance(value, str) or len(value) < 19 or
+            value[4] != '-' or value[10] != 'T'):
+        return None
+    try:
+        return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                        int(value[11:13]), int(value[14:16]),
+                        int(value[17:19]))
+    except ValueError:
+        return None
+
+
+def select_access_keys(access_keys: Dict,
+                       owners: List[str] = None,
+                       older_than: float = None,
+                       expiring_before: datetime = None,
+                       now: datetime = None) -> List[Dict]:
+    """select_access_keys will select the access keys matching all the
+    given selectors
+
+    Arguments:
+        access_keys {Dict} -- Access keys from get_users
+
+        owners {List[str]} -- Usernames owning the keys (default: {None})
+
+        older_than {float} -- Keys created more than this number of hours
+        ago (default: {None})
+
+        expiring_before {datetime} -- Keys expiring before this date, in
+        UTC (default: {None})
+
+        now {datetime} -- Current date in UTC (default: {None})
+
+    Returns:
+        List[Dict] -- Selected access keys
+    """
+    if now is None:
+        now = datetime.utcnow()
+    selected = []
+    for ak in access_keys.get('access_keys', []):
+        owner = ak.get('owner', {})
+        if owners and owner.get('username') not in owners:
+            continue
+        if older_than is not None:
+            created = parse_date(ak.get('created_date'))
+            if created is None or created > now - timedelta(hours=older_than):
+                continue
+        if expiring_before is not None:
+            expiry = parse_date(ak.get('expiry_date'))
+            if expiry is None or expiry >= expiring_before:
+                continue
+        selected.append(ak)
+    return selected
+
+
+def revoke_access_keys(flix: flix_api.flix,
+                       keys: List[str],
+                       jobs: int = 8) -> Iterator[Tuple[str, str]]:
+    """revoke_access_keys will revoke access keys concurrently, at most jobs
+    at a time, and give the result of every key as soon as it is known
+
+    Arguments:
+        flix {flix_api.flix} -- Authenticated Flix api
+
+        keys {List[str]} -- Access keys to revoke
+
+        jobs {int} -- Concurrent requests (default: {8})
+
+    Returns:
+        Iterator[Tuple[str, str]] -- Access key and status: revoked, failed
+        or forbidden
+    """
+    if len(keys) < 1:
+        return
+    with ThreadPoolExecutor(max_workers=min(jobs, len(keys))) as executor:
+        futures = {executor.submit(flix.revoke_access_key, k): k
+                   for k in keys}
+        for f in as_completed(futures):
+            try:
+                status = STATUSES.get(f.result(), 'failed')
+            except Exception:
+                status = 'failed'
+            yield futures[f], status
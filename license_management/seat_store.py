@@ -0,0 +1,164 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import sqlite3
+from typing import Dict, List
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS samples (
+    ts INTEGER PRIMARY KEY,
+    current_seats INTEGER,
+    max_seats INTEGER,
+    access_keys INTEGER,
+    users INTEGER
+);
+CREATE TABLE IF NOT EXISTS user_keys (
+    username TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    keys INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS user_keys_username ON user_keys (username, ts);
+CREATE TABLE IF NOT EXISTS hourly (
+    hour INTEGER PRIMARY KEY,
+    samples INTEGER NOT NULL,
+    min_seats INTEGER,
+    sum_seats INTEGER,
+    peak_seats INTEGER,
+    max_seats INTEGER,
+    peak_keys INTEGER,
+    peak_users INTEGER
+);
+'''
+
+RESOLUTIONS = {'hour': 1, 'day': 24}
+
+
+class seat_store:
+    """seat_store keeps the seat usage polled from a Flix server in a
+    SQLite database. Every sample is appended, the key count of a user is
+    only written when it changes, and the samples are rolled up per hour
+    as they are added, so the history of months is read from a few
+    hundred rows
+    """
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+        self.last_keys = dict(self.db.execute(
+            'SELECT username, keys FROM user_keys WHERE rowid IN '
+            '(SELECT MAX(rowid) FROM user_keys GROUP BY username)'))
+
+    def add_sample(self, ts: int, info: Dict, user_keys: Dict):
+        """add_sample will store a sample and update its hourly rollup, a
+        sample without the seats in use is skipped, it would count as 0 in
+        the min and the average
+
+        Arguments:
+            ts {int} -- Time of the sample, seconds since epoch
+
+            info {Dict} -- Server info from get_info
+
+            user_keys {Dict} -- Number of access keys per username
+
+        Returns:
+            bool -- False if the sample was skipped
+        """
+        seats = info.get('current_seats')
+        if seats is None:
+            return False
+        max_seats = info.get('max_seats')
+        keys = sum(user_keys.values())
+        changed = [(u, ts, n) for u, n in user_keys.items()
+                   if self.last_keys.get(u) != n]
+        changed.extend((u, ts, 0) for u, n in self.last_keys.items()
+                       if n > 0 and u not in user_keys)
+        with self.db:
+            self.db.execute(
+                'INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?, ?)',
+                (ts, seats, max_seats, keys, len(user_keys)))
+            self.db.executemany(
+                'INSERT INTO user_keys VALUES (?, ?, ?)', changed)
+            hour = ts // 3600
+            self.db.execute(
+                'INSERT OR IGNORE INTO hourly VALUES '
+                '(?, 0, NULL, 0, NULL, NULL, NULL, NULL)', (hour,))
+            self.db.execute(
+                'UPDATE hourly SET samples = samples + 1, '
+                'min_seats = MIN(IFNULL(min_seats, :seats), :seats), '
+                'sum_seats = sum_seats + :seats, '
+                'peak_seats = MAX(IFNULL(peak_seats, :seats), :seats), '
+                'max_seats = :max_seats, '
+                'peak_keys = MAX(IFNULL(peak_keys, :keys), :keys), '
+                'peak_users = MAX(IFNULL(peak_users, :users), :users) '
+                'WHERE hour = :hour',
+                {'seats': seats, 'max_seats': max_seats, 'keys': keys,
+                 'users': len(user_keys), 'hour': hour})
+        for u, _, n in changed:
+            self.last_keys[u] = n
+        return True
+
+    def history(self, since: int = None, until: int = None,
+                resolution: str = 'hour') -> List[Dict]:
+        """history will return the seat usage per hour or per day
+
+        Arguments:
+            since {int} -- Start, seconds since epoch (default: {None})
+
+            until {int} -- End, seconds since epoch (default: {None})
+
+            resolution {str} -- hour or day (default: {'hour'})
+
+        Returns:
+            List[Dict] -- Start of the period, samples, min / average /
+            peak seats in use, max seats, peak access keys and users
+        """
+        hours = RESOLUTIONS[resolution]
+        rows = self.db.execute(
+            'SELECT hour / :hours * :hours, SUM(samples), MIN(min_seats), '
+            'SUM(sum_seats), MAX(peak_seats), MAX(max_seats), '
+            'MAX(peak_keys), MAX(peak_users) FROM hourly '
+            'WHERE hour >= :since AND hour <= :until '
+            'GROUP BY hour / :hours ORDER BY hour / :hours',
+            {'hours': hours,
+             'since': 0 if since is None else since // 3600,
+             'until': 2 ** 62 if until is None else until // 3600})
+        return [{'start': start * 3600,
+                 'samples': samples,
+                 'min_seats': min_seats,
+                 'avg_seats': round(sum_seats / samples, 1),
+                 'peak_seats': peak_seats,
+                 'max_seats': max_seats,
+                 'peak_keys': peak_keys,
+                 'peak_users': peak_users}
+                for (start, samples, min_seats, sum_seats, peak_seats,
+                     max_seats, peak_keys, peak_users) in rows]
+
+    def user_history(self, username: str, since: int = None,
+                     until: int = None) -> List[Dict]:
+        """user_history will return the changes of the number of access
+        keys of a user
+
+        Arguments:
+            username {str} -- Username
+
+            since {int} -- Start, seconds since epoch (default: {None})
+
+            until {int} -- End, seconds since epoch (default: {None})
+
+        Returns:
+            List[Dict] -- Time of the change and number of access keys
+        """
+        rows = self.db.execute(
+            'SELECT ts, keys FROM user_keys WHERE username = ? '
+            'AND ts >= ? AND ts <= ? ORDER BY ts',
+            (username, 0 if since is None else since,
+             2 ** 62 if until is None else until))
+        return [{'time': ts, 'keys': keys} for ts, keys in rows]
+
+    def close(self):
+        """close will close the database
+        """
+        self.db.close()
@@ -0,0 +1,242 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import flix as flix_api
+import handoff
+import media_store
+import progress
+import shotgun as shotgun_api
+
+
+def parse_cli():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--help', action='help', default=argparse.SUPPRESS)
+
+    # Required args
+    required_group = parser.add_argument_group('required arguments')
+    required_group.add_argument(
+        '--server', required=True, help='Flix server url')
+    required_group.add_argument(
+        '--user', required=True, help='Flix username')
+    required_group.add_argument(
+        '--password', required=True, help='Flix password')
+    required_group.add_argument(
+        '--show', required=True, help='Show tracking code')
+    required_group.add_argument(
+        '--export', required=True, choices=['local', 'shotgun'],
+        help='Handoff type')
+
+    parser.add_argument(
+        '--episode', help='Episode tracking code, for episodic shows')
+    parser.add_argument(
+        '--sequence', nargs='*', default=[],
+        help='Sequence tracking codes (default: all the sequences)')
+    parser.add_argument(
+        '--revision', type=int,
+        help='Sequence revision number (default: the latest revision)')
+    parser.add_argument(
+        '--output',
+        help='Export path for a local export, folder for the quicktimes of '
+        'a shotgun export')
+    parser.add_argument(
+        '--media-store',
+        help='Folder keeping the media objects downloaded by the local '
+        'exports, shared by the revisions (default: OUTPUT/.media_store)')
+    parser.add_argument(
+        '--jobs', type=int, default=1,
+        help='Number of sequences exported concurrently (default: 1)')
+    parser.add_argument(
+        '--progress', choices=['text', 'json'], default='text',
+        help='Progress output, json prints one object per line')
+
+    shotgun_group = parser.add_argument_group('shotgun export arguments')
+    shotgun_group.add_argument('--sg-hostname', help='Shotgun url')
+    shotgun_group.add_argument('--sg-login', help='Shotgun username')
+    shotgun_group.add_argument('--sg-password', help='Shotgun password')
+
+    args = parser.parse_args()
+    if args.export == 'local' and args.output is None:
+        parser.error('--output is required for a local export')
+    if args.export == 'shotgun' and None in (
+            args.sg_hostname, args.sg_login, args.sg_password):
+        parser.error('--sg-hostname, --sg-login and --sg-password are '
+                     'required for a shotgun export')
+    if args.revision is not None and len(args.sequence) != 1:
+        parser.error('--revision needs exactly one --sequence')
+    if args.jobs < 1:
+        parser.error('--jobs needs to be at least 1')
+    return args
+
+
+def find_by_tracking_code(items: List, tracking_code: str) -> Dict:
+    """find_by_tracking_code will find a show, episode or sequence
+    by its tracking code
+
+    Arguments:
+        items {List} -- Shows, episodes or sequences from Flix
+
+        tracking_code {str} -- Tracking code
+
+    Returns:
+        Dict -- Show, episode or sequence
+    """
+    for i in items or []:
+        if i.get('tracking_code') == tracking_code:
+            return i
+    return None
+
+
+def get_sequences(flix: flix_api.flix, args) -> Dict:
+    """get_sequences will resolve the show, episode and sequences to export
+
+    Arguments:
+        flix {flix_api.flix} -- Authenticated Flix api
+
+        args {Namespace} -- Command line arguments
+
+    Raises:
+        handoff.handoff_error: Show, episode or sequence not found
+
+    Returns:
+        Dict -- Show, episode and list of sequences
+    """
+    show = find_by_tracking_code(flix.get_shows(), args.show)
+    if show is None:
+        raise handoff.handoff_error(
+            'Could not find show {0}'.format(args.show))
+    episode = None
+    if show.get('episodic'):
+        if args.episode is None:
+            raise handoff.handoff_error(
+                'Show {0} is episodic, --episode is required'.format(
+                    args.show))
+        episode = find_by_tracking_code(
+            flix.get_episodes(show.get('id')), args.episode)
+        if episode is None:
+            raise handoff.handoff_error(
+                'Could not find episode {0}'.format(args.episode))
+    sequences = flix.get_sequences(
+        show.get('id'), None if episode is None else episode.get('id'))
+    if sequences is None:
+        raise handoff.handoff_error('Could not retrieve sequences')
+    sequences = [s for s in sequences if s.get('revisions_count', 0) > 0]
+    if len(args.sequence) > 0:
+        selected = []
+        for tc in args.sequence:
+            s = find_by_tracking_code(sequences, tc)
+            if s is None:
+                raise handoff.handoff_error(
+                    'Could not find sequence {0}'.format(tc))
+            selected.append(s)
+        sequences = selected
+    return {'show': show, 'episode': episode, 'sequences': sequences}
+
+
+def export_sequence(flix: flix_api.flix,
+                    target: Dict,
+                    seq: Dict,
+                    args,
+                    output: progress.progress_stream,
+                    store: media_store.media_store = None) -> bool:
+    """export_sequence will do the handoff of one sequence revision
+
+    Arguments:
+        flix {flix_api.flix} -- Authenticated Flix api
+
+        target {Dict} -- Show and episode
+
+        seq {Dict} -- Sequence from Flix
+
+        args {Namespace} -- Command line arguments
+
+        output {progress.progress_stream} -- Progress output
+
+        store {media_store.media_store} -- Store of the media objects of
+        the local exports (default: {None})
+
+    Returns:
+        bool -- Succeeded or not
+    """
+    seq_tc = seq.get('tracking_code')
+    show = target['show']
+    episode = target['episode']
+    seq_rev_nbr = args.revision or seq.get('revisions_count')
+    fn_progress = output.for_sequence(seq_tc)
+    start = time.time()
+    counts = {}
+    try:
+        # The Shotgun API is not thread safe, one connection per job
+        sg = None
+        if args.export == 'shotgun':
+            sg = shotgun_api.shotgun(
+                args.sg_hostname, args.sg_login, args.sg_password)
+        api = handoff.handoff(flix, sg)
+        mo_per_shots = api.get_media_object_per_shots(
+            show.get('id'),
+            seq.get('id'),
+            seq_rev_nbr,
+            None if episode is None else episode.get('id'),
+            fn_progress)
+        if args.export == 'local':
+            counts = api.local_export(mo_per_shots,
+                                      args.output,
+                                      show.get('tracking_code'),
+                                      seq_tc,
+                                      seq_rev_nbr,
+                                      None if episode is None else
+                                      episode.get('tracking_code'),
+                                      fn_progress,
+                                      store)
+        else:
+            api.shotgun_export(mo_per_shots,
+                               show.get('tracking_code'),
+                               seq_rev_nbr,
+                               seq_tc,
+                               fn_progress,
+                               args.output)
+    except Exception as err:
+        output.emit('error', seq_tc, message='failed: {0}'.format(err),
+                    revision=seq_rev_nbr, error=str(err),
+                    elapsed=round(time.time() - start, 3))
+        return False
+    output.emit('done', seq_tc, message='done', revision=seq_rev_nbr,
+                shots=len(mo_per_shots),
+                elapsed=round(time.time() - start, 3), **counts)
+    return True
+
+
+if __name__ == '__main__':
+    args = parse_cli()
+    output = progress.progress_stream(args.progress)
+
+    flix = flix_api.flix()
+    if flix.authenticate(args.server, args.user, args.password) is None:
+        output.emit('error', None, message='could not authenticate to Flix',
+                    error='authentication')
+        sys.exit(1)
+
+    try:
+        target = get_sequences(flix, args)
+    except handoff.handoff_error as err:
+        output.emit('error', None, message=str(err), error=str(err))
+        sys.exit(1)
+
+    # One store for all the sequences, a media object is downloaded once
+    store = None
+    if args.export == 'local':
+        store = media_store.media_store(
+            args.media_store or os.path.join(args.output, '.media_store'))
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        results = list(executor.map(
+            lambda s: export_sequence(flix, target, s, args, output, store),
+            target['sequences']))
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,161 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import os
+import sys
+from typing import Dict, Iterator, List, Tuple
+
+
+def image_name(show_tc: str,
+               seq_tc: str,
+               seq_rev_number: int,
+               panel_pos: int,
+               panel_id: int,
+               panel_revision: int) -> str:
+    """image_name will format the name of an artwork or a thumbnail
+
+    Arguments:
+        show_tc {str} -- Show tracking code
+
+        seq_tc {str} -- Sequence tracking code
+
+        seq_rev_number {int} -- Sequence revision number
+
+        panel_pos {int} -- Panel position
+
+        panel_id {int} -- Panel ID
+
+        panel_revision {int} -- Panel revision
+
+    Returns:
+        str -- Formatted name
+    """
+    return '{0}_{1}_v{2}_{3}_{4}_v{5}'.format(
+        show_tc, seq_tc, seq_rev_number, panel_pos, panel_id, panel_revision)
+
+
+class export_plan:
+    """export_plan computes the folders and the files of the local export
+    of a sequence revision once, from the media objects per shots. The
+    folders are then created in one pass: a folder is only listed if its
+    parent existed before, and a folder under a new one is created
+    without any check
+    """
+
+    def __init__(self,
+                 mo_per_shots: Dict,
+                 export_path: str,
+                 show_tc: str,
+                 seq_tc: str,
+                 seq_rev_nbr: int,
+                 episode_tc: str = None):
+        parts = [show_tc] if episode_tc is None else [show_tc, episode_tc]
+        parts += [seq_tc, 'v{0}'.format(seq_rev_nbr)]
+        self.export_path = export_path
+        self.seq_rev_path = os.path.join(export_path, *parts)
+        self.folders = []
+        self.files = []
+        path = export_path
+        for p in parts:
+            path = os.path.join(path, p)
+            self.folders.append(path)
+        prefix = '{0}_{1}_v{2}_'.format(show_tc, seq_tc, seq_rev_nbr)
+        for shot, mos in mo_per_shots.items():
+            shot_path = os.path.join(self.seq_rev_path, shot)
+            art_path = os.path.join(shot_path, 'artwork')
+            thumb_path = os.path.join(shot_path, 'thumbnail')
+            self.folders.extend([shot_path, art_path, thumb_path])
+            self.files.append((shot, 'mov', self.__path(
+                shot_path, '{0}_v{1}_{2}.mov'.format(
+                    seq_tc, seq_rev_nbr, shot)), mos.get('mov')))
+            for kind, base in (('artwork', art_path),
+                               ('thumbnails', thumb_path)):
+                for mo in mos.get(kind, []):
+                    # Same name as image_name, without formatting the show,
+                    # the sequence and the revision for every file
+                    name = '{0}{1}_{2}_v{3}{4}'.format(
+                        prefix, mo.get('pos'), mo.get('id'),
+                        mo.get('revision_number'),
+                        os.path.splitext(mo.get('name'))[1])
+                    self.files.append((shot, kind, self.__path(base, name),
+                                       mo.get('mo')))
+
+    def create_folders(self) -> int:
+        """create_folders will create the missing folders of the export
+
+        Returns:
+            int -- Number of folders created
+        """
+        created = set()
+        listed = {}
+        for folder in self.folders:
+            parent, name = os.path.split(folder)
+            if parent not in created:
+                if parent not in listed:
+                    listed[parent] = self.__list(parent)
+                if name in listed[parent]:
+                    continue
+            try:
+                os.mkdir(folder)
+            except FileExistsError:
+                # Created by another export meanwhile
+                if not os.path.isdir(folder):
+                    raise
+                continue
+            except FileNotFoundError:
+                # The export path itself is missing
+                os.makedirs(folder, exist_ok=True)
+            created.add(folder)
+        return len(created)
+
+    def shots(self) -> Iterator[Tuple[str, Dict[str, List[Tuple[str, int]]]]]:
+        """shots will go through the files shot by shot
+
+        Returns:
+            Iterator[Tuple[str, Dict[str, List[Tuple[str, int]]]]] -- Shot,
+            and the paths and media object IDs of its mov, artwork and
+            thumbnails
+        """
+        current = None
+        kinds = None
+        for shot, kind, path, mo_id in self.files:
+            if shot != current:
+                if current is not None:
+                    yield current, kinds
+                current = shot
+                kinds = {'mov': [], 'artwork': [], 'thumbnails': []}
+            kinds[kind].append((path, mo_id))
+        if current is not None:
+            yield current, kinds
+
+    def __list(self, folder: str) -> set:
+        """__list will list the folders in a folder
+
+        Arguments:
+            folder {str} -- Folder
+
+        Returns:
+            set -- Names of the folders, empty if the folder does not exist
+        """
+        try:
+            with os.scandir(folder) as it:
+                return {e.name for e in it if e.is_dir()}
+        except FileNotFoundError:
+            return set()
+
+    def __path(self, folder: str, name: str) -> str:
+        """__path will return the path of a file of the export
+
+        Arguments:
+            folder {str} -- Folder of the file
+
+            name {str} -- Name of the file
+
+        Returns:
+            str -- Path of the file
+        """
+        path = os.path.join(folder, name)
+        if sys.platform == 'win32' or sys.platform == 'cygwin':
+            path = path.replace('\\', '\\\\')
+        return path
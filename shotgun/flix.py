@@ -7,13 +7,22 @@ import binascii
 import hashlib
 import hmac
 import json
+import threading
 import time
 from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Callable, Dict, List, Tuple
 
-import requests
 
+def requests_api():
+    """requests_api will return the requests module, it is only imported on
+    the first request to the Flix server, not when the handoff tools start
+
+    Returns:
+        module -- requests
+    """
+    import requests
+    return requests
 
 class flix:
     """Flix will handle the login and expose functions to get,
@@ -21,6 +30,7 @@ class flix:
     """
 
     def __init__(self):
+        self.token_lock = threading.Lock()
         self.reset()
 
     def authenticate(self, hostname: str, login: str, password: str) -> Dict:
@@ -43,14 +53,14 @@ class flix:
             'Authorization': 'Basic ' + authdata.decode('UTF-8'),
         }
         try:
-            r = requests.post(hostname + '/authenticate', headers=header,
-                              verify=False)
+            r = requests_api().post(hostname + '/authenticate', headers=header,
+                                    verify=False)
             r.raise_for_status()
             response = json.loads(r.content)
             self.hostname = hostname
             self.login = login
             self.password = password
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             print('Authentification failed', err)
             return None
 
@@ -69,12 +79,12 @@ class flix:
         headers = self.__get_headers(None, '/shows', 'GET')
         response = None
         try:
-            r = requests.get(self.hostname + '/shows', headers=headers,
-                             verify=False)
+            r = requests_api().get(self.hostname + '/shows', headers=headers,
+                                   verify=False)
             r.raise_for_status()
             response = json.loads(r.content)
             response = response.get('shows')
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -96,11 +106,11 @@ class flix:
         response = None
 
         try:
-            r = requests.get(self.hostname + url, headers=headers,
-                             verify=False)
+            r = requests_api().get(self.hostname + url, headers=headers,
+                                   verify=False)
             r.raise_for_status()
             response = json.loads(r.content)
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -121,12 +131,12 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            r = requests.get(self.hostname + url, headers=headers,
-                             verify=False)
+            r = requests_api().get(self.hostname + url, headers=headers,
+                                   verify=False)
             r.raise_for_status()
             response = json.loads(r.content)
             response = response.get('episodes')
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -152,11 +162,11 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            r = requests.get(self.hostname + url, headers=headers,
-                             verify=False)
+            r = requests_api().get(self.hostname + url, headers=headers,
+                                   verify=False)
             response = json.loads(r.content)
             response = response.get('sequences')
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -183,11 +193,11 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            r = requests.get(self.hostname + url, headers=headers,
-                             verify=False)
+            r = requests_api().get(self.hostname + url, headers=headers,
+                                   verify=False)
             response = json.loads(r.content)
             response = response.get('panels')
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -214,11 +224,11 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            r = requests.get(self.hostname + url, headers=headers,
-                             verify=False)
+            r = requests_api().get(self.hostname + url, headers=headers,
+                                   verify=False)
             response = json.loads(r.content)
             response = response.get('dialogues')
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -245,10 +255,10 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            r = requests.get(self.hostname + url, headers=headers,
-                             verify=False)
+            r = requests_api().get(self.hostname + url, headers=headers,
+                                   verify=False)
             response = json.loads(r.content)
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -268,21 +278,47 @@ class flix:
         Returns:
             str -- Temp filepath of the downloaded file
         """
+        if self.stream_media_object(temp_filepath, media_object_id) is None:
+            return None
+        return temp_filepath
+
+    def stream_media_object(
+            self, filepath: str, media_object_id: int) -> Dict:
+        """stream_media_object will download a media object in chunks, its
+        sha256 is computed as the chunks are written
+
+        Arguments:
+            filepath {str} -- Filepath to store the downloaded file
+
+            media_object_id {int} -- Media Object ID
+
+        Returns:
+            Dict -- sha256 and size of the file, None if the download failed
+        """
         url = '/file/{0}/data'.format(media_object_id)
         headers = self.__get_headers(None, url, 'GET')
+        sha = hashlib.sha256()
+        size = 0
+        r = None
         try:
-            r = requests.get(self.hostname + url, headers=headers,
-                             verify=False)
-            file = open(temp_filepath, 'wb')
-            file.write(r.content)
-            file.close()
-        except requests.exceptions.RequestException as err:
+            r = requests_api().get(self.hostname + url, headers=headers,
+                                   verify=False, stream=True)
+            r.raise_for_status()
+            with open(filepath, 'wb') as f:
+                for chunk in r.iter_content(1 << 20):
+                    sha.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
                 print('Could not retrieve media object', err)
             return None
-        return temp_filepath
+        finally:
+            if r is not None:
+                r.close()
+        return {'sha256': sha.hexdigest(), 'size': size}
 
     def start_quicktime_export(self,
                                show_id: int,
@@ -322,10 +358,10 @@ class flix:
         headers = self.__get_headers(content, url, 'POST')
         response = None
         try:
-            r = requests.post(self.hostname + url, headers=headers,
-                              data=json.dumps(content), verify=False)
+            r = requests_api().post(self.hostname + url, headers=headers,
+                                    data=json.dumps(content), verify=False)
             response = json.loads(r.content)
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -346,10 +382,10 @@ class flix:
         headers = self.__get_headers(None, url, 'GET')
         response = None
         try:
-            r = requests.get(self.hostname + url, headers=headers,
-                             verify=False)
+            r = requests_api().get(self.hostname + url, headers=headers,
+                                   verify=False)
             response = json.loads(r.content)
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -394,10 +430,10 @@ class flix:
         headers = self.__get_headers(content, url, 'POST')
         response = None
         try:
-            r = requests.post(self.hostname + url, headers=headers,
-                              data=json.dumps(content), verify=False)
+            r = requests_api().post(self.hostname + url, headers=headers,
+                                    data=json.dumps(content), verify=False)
             response = json.loads(r.content)
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -431,10 +467,10 @@ class flix:
         headers = self.__get_headers(content, url, 'POST')
         response = None
         try:
-            r = requests.post(self.hostname + url, headers=headers,
-                              data=json.dumps(content), verify=False)
+            r = requests_api().post(self.hostname + url, headers=headers,
+                                    data=json.dumps(content), verify=False)
             response = json.loads(r.content)
-        except requests.exceptions.RequestException as err:
+        except requests_api().exceptions.RequestException as err:
             if r is not None and r.status_code == 401:
                 print('Your token has been revoked')
             else:
@@ -627,19 +663,23 @@ class flix:
         Returns:
             Tuple[str, str] -- Key and Secret
         """
-        if (self.key is None or self.secret is None or self.expiry is None or
-                datetime.now() + timedelta(hours=2) > self.expiry):
-            authentificationToken = self.authenticate(
-                self.hostname, self.login, self.password)
-            auth_id = authentificationToken['id']
-            auth_secret_token = authentificationToken['secret_access_key']
-            auth_expiry_date = authentificationToken['expiry_date']
-            auth_expiry_date = auth_expiry_date.split('.')[0]
-            self.key = auth_id
-            self.secret = auth_secret_token
-            self.expiry = datetime.strptime(auth_expiry_date,
-                                            '%Y-%m-%dT%H:%M:%S')
-        return self.key, self.secret
+        # The jobs of the command line share the client, one refresh at a
+        # time
+        with self.token_lock:
+            if (self.key is None or self.secret is None or
+                    self.expiry is None or
+                    datetime.now() + timedelta(hours=2) > self.expiry):
+                authentificationToken = self.authenticate(
+                    self.hostname, self.login, self.password)
+                auth_id = authentificationToken['id']
+                auth_secret_token = authentificationToken['secret_access_key']
+                auth_expiry_date = authentificationToken['expiry_date']
+                auth_expiry_date = auth_expiry_date.split('.')[0]
+                self.key = auth_id
+                self.secret = auth_secret_token
+                self.expiry = datetime.strptime(auth_expiry_date,
+                                                '%Y-%m-%dT%H:%M:%S')
+            return self.key, self.secret
 
     def __fn_sign(self,
                   access_key_id: str,
@@ -0,0 +1,334 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import os
+import re
+import sys
+import tempfile
+from typing import Callable, Dict, List
+
+import export_plan
+import flix as flix_api
+import manifest
+import media_store
+import shotgun as shotgun_api
+
+
+class handoff_error(Exception):
+    """handoff_error is raised when the handoff cannot go further,
+    its message is meant to be shown to the user
+    """
+    pass
+
+
+class handoff:
+    """handoff will run the production handoff from Flix without any UI,
+    it is used by the widgets as well as by the benchmarks
+    """
+
+    def __init__(self,
+                 flix: flix_api.flix,
+                 shotgun: shotgun_api.shotgun = None):
+        self.flix_api = flix
+        self.shotgun = shotgun
+
+    def get_media_object_per_shots(
+            self,
+            show_id: int,
+            seq_id: int,
+            seq_rev_number: int,
+            episode_id: int,
+            fn_progress: Callable[[str], None]) -> Dict:
+        """get_media_object_per_shots will get the media objects per shots
+        and export a quicktime per shot
+
+        Arguments:
+            show_id {int} -- Show ID
+
+            seq_id {int} -- Sequence ID
+
+            seq_rev_number {int} -- Sequence revision number
+
+            episode_id {int} -- Episode ID
+
+            Callable[[str], None] -- fn_progress is a progress function
+
+        Raises:
+            handoff_error: Could not retrieve the media objects per shots
+
+        Returns:
+            Dict -- Mapping of media objects per shots
+        """
+        fn_progress('get sequence revision')
+        seq_rev = self.flix_api.get_sequence_rev(
+            show_id, seq_id, seq_rev_number)
+        if seq_rev is None:
+            raise handoff_error('Could not retrieve sequence revision')
+        fn_progress('get markers')
+        markers = self.flix_api.get_markers(seq_rev)
+        if len(markers) < 1:
+            raise handoff_error('You need at least one shot')
+        fn_progress('get panels')
+        panels = self.flix_api.get_panels(show_id, seq_id, seq_rev_number)
+        if panels is None:
+            raise handoff_error('Could not retrieve panels')
+        fn_progress('get markers per panels')
+        panels_per_markers = self.flix_api.get_markers_per_panels(
+            markers, panels)
+        mo_per_shots, ok = self.flix_api.mo_per_shots(panels_per_markers,
+                                                      show_id,
+                                                      seq_id,
+                                                      seq_rev_number,
+                                                      episode_id)
+        if mo_per_shots is None or ok is False:
+            raise handoff_error('Could not retrieve media objects per shots')
+
+        # Split export quicktime
+        for shot_name in mo_per_shots:
+            def on_retry(r): return fn_progress(
+                'export quicktime for shot {0}{1}'.format(
+                    shot_name, '.' * (r % 4)))
+            fn_progress('export quicktime for shot {0}'.format(shot_name))
+            mo = self.flix_api.get_mo_quicktime_export(
+                shot_name, panels_per_markers[shot_name],
+                show_id, seq_id, seq_rev_number, episode_id, on_retry)
+            mo_per_shots[shot_name]['mov'] = mo
+        return mo_per_shots
+
+    def local_export(
+            self,
+            mo_per_shots: Dict,
+            export_path: str,
+            show_tc: str,
+            seq_tc: str,
+            seq_rev_nbr: int,
+            episode_tc: str,
+            fn_progress: Callable[[str, bool], None],
+            store: media_store.media_store = None) -> Dict:
+        """local_export will plan the folders and the files of the sequence
+        revision, create the folders at once, and download the quicktime,
+        artworks and thumbnails of every shot.
+        The media objects exported for a previous revision are linked from
+        the media store instead of being downloaded again, and the files
+        already exported by a previous run are skipped. The exported files
+        are listed in the manifest of the revision
+
+        Arguments:
+            mo_per_shots {Dict} -- Mapping of media objects per shots
+
+            export_path {str} -- Base export path
+
+            show_tc {str} -- Show tracking code
+
+            seq_tc {str} -- Sequence tracking code
+
+            seq_rev_nbr {int} -- Sequence revision number
+
+            episode_tc {str} -- Episode tracking code
+
+            fn_progress {Callable[[str, bool], None]} -- Progress function
+
+            store {media_store.media_store} -- Store of the media objects
+            (default: {None}, .media_store in the export path)
+
+        Returns:
+            Dict -- Number of files downloaded, reused from the store,
+            unchanged since the previous run and failed
+        """
+        if store is None:
+            store = media_store.media_store(
+                os.path.join(export_path, '.media_store'))
+        counts = {'downloaded': 0, 'reused': 0, 'unchanged': 0, 'failed': 0}
+
+        # Create folders for export
+        fn_progress('create folders for export', False)
+        plan = export_plan.export_plan(mo_per_shots, export_path, show_tc,
+                                       seq_tc, seq_rev_nbr, episode_tc)
+        plan.create_folders()
+        files = manifest.manifest(plan.seq_rev_path, {
+            'show': show_tc, 'episode': episode_tc, 'sequence': seq_tc,
+            'revision': seq_rev_nbr})
+
+        for shot, kinds in plan.shots():
+            for kind, message in (('mov', 'download quicktime'),
+                                  ('artwork', 'download artworks'),
+                                  ('thumbnails', 'download thumbnails')):
+                fn_progress('{0} for shot {1}'.format(message, shot), False)
+                for path, mo_id in kinds[kind]:
+                    counts[self.__export_file(
+                        path, mo_id, store, files)] += 1
+        fn_progress('write manifest', False)
+        files.save()
+        return counts
+
+    def export_to_version(
+            self,
+            shots: List,
+            show_tc: str,
+            seq_rev_nbr: int,
+            seq_tc: str,
+            fn_progress: Callable[[str], None]) -> Dict:
+        """export_to_version will export to shotgun a project, a sequence, a shot and version
+
+        Arguments:
+            shots {List} -- List of shots
+
+            show_tc {str} -- Show tracking code
+
+            seq_rev_nbr {int} -- Sequence revision number
+
+            seq_tc {str} -- Sequence tracking code
+
+            Callable[[str], None]) -- fn_progress is a progress function
+
+        Returns:
+            Dict -- Mapping of shot to quicktime info with his corresponding shotgun version
+        """
+        fn_progress('get or create shotgun project')
+        sg_show = self.shotgun.get_project(show_tc)
+        if sg_show is None:
+            sg_show = self.shotgun.create_project(show_tc)
+        fn_progress('get or create shotgun sequence')
+        sg_seq = self.shotgun.get_sequence(sg_show, seq_tc)
+        if sg_seq is None:
+            sg_seq = self.shotgun.create_seq(sg_show, seq_tc)
+
+        shot_to_file = {}
+        for shot_name in shots:
+            fn_progress(
+                'get or create shotgun shot for shot {0}'.format(shot_name))
+            sg_shot = self.shotgun.get_shot(sg_show, sg_seq, shot_name)
+            if sg_shot is None:
+                sg_shot = self.shotgun.create_shot(sg_show, sg_seq, shot_name)
+            fn_progress(
+                'get or create shotgun version for shot {0}'.format(shot_name))
+            version = self.shotgun.get_version(sg_show, sg_shot)
+            if version is None:
+                new_version = 1
+            else:
+                ver = re.search('(.*)v([0-9]+)', version['code'])
+                new_version = int(ver.group(2)) + 1
+            version = self.shotgun.create_version(
+                sg_show, sg_shot, new_version)
+            mov_name = '{0}_v{1}_{2}.mov'.format(
+                seq_tc, seq_rev_nbr, shot_name)
+            shot_to_file[shot_name] = {
+                'mov_name': mov_name, 'version': version}
+        return shot_to_file
+
+    def shotgun_export(
+            self,
+            mo_per_shots: Dict,
+            show_tc: str,
+            seq_rev_nbr: int,
+            seq_tc: str,
+            fn_progress: Callable[[str, bool], None],
+            temp_folder: str = None):
+        """shotgun_export will create or reuse the project / sequence / shots
+        and versions in shotgun, download the quicktime of every shot from
+        Flix and upload it to its shotgun version
+
+        Arguments:
+            mo_per_shots {Dict} -- Mapping of media objects per shots
+
+            show_tc {str} -- Show tracking code
+
+            seq_rev_nbr {int} -- Sequence revision number
+
+            seq_tc {str} -- Sequence tracking code
+
+            fn_progress {Callable[[str, bool], None]} -- Progress function
+
+            temp_folder {str} -- Folder for the quicktimes (default: {None})
+        """
+        shot_to_file = self.export_to_version(mo_per_shots.keys(),
+                                              show_tc,
+                                              seq_rev_nbr,
+                                              seq_tc,
+                                              fn_progress)
+
+        if temp_folder is None:
+            temp_folder = tempfile.gettempdir()
+        for shot in shot_to_file:
+            fn_progress(
+                'download quicktime for shot {0}'.format(shot), False)
+            mov_path = os.path.join(
+                temp_folder, shot_to_file[shot]['mov_name'])
+            if sys.platform == 'win32' or sys.platform == 'cygwin':
+                mov_path = mov_path.replace('\\', '\\\\')
+            # Download quictime from Flix
+            self.flix_api.download_media_object(
+                mov_path, mo_per_shots[shot].get('mov'))
+            # Upload quicktime to shotgun version
+            fn_progress(
+                'upload quicktime to shotgun for shot {0}'.format(shot), False)
+            self.shotgun.upload_movie(shot_to_file[shot]['version'], mov_path)
+
+    def __download(self,
+                   file_path: str,
+                   media_object_id: int,
+                   store: media_store.media_store = None):
+        """__download will download a media object, through the media
+        store when there is one
+
+        Arguments:
+            file_path {str} -- Path of the file
+
+            media_object_id {int} -- Media Object ID
+
+            store {media_store.media_store} -- Store of the media objects
+            (default: {None})
+
+        Returns:
+            Dict -- sha256, size, and downloaded or reused from the store,
+            None if the download failed
+        """
+        if media_object_id is None:
+            return None
+        if store is None:
+            res = self.flix_api.stream_media_object(file_path,
+                                                    media_object_id)
+            if res is None:
+                return None
+            return dict(res, downloaded=True)
+        try:
+            return store.fetch(media_object_id, file_path,
+                               self.flix_api.stream_media_object)
+        except OSError as err:
+            print('Could not export media object', media_object_id, err)
+            return None
+
+    def __export_file(self,
+                      file_path: str,
+                      media_object_id: int,
+                      store: media_store.media_store,
+                      files: manifest.manifest) -> str:
+        """__export_file will export a media object unless the previous
+        run already did, and list it in the manifest
+
+        Arguments:
+            file_path {str} -- Path of the file
+
+            media_object_id {int} -- Media Object ID
+
+            store {media_store.media_store} -- Store of the media objects
+
+            files {manifest.manifest} -- Manifest of the export
+
+        Returns:
+            str -- downloaded, reused, unchanged or failed
+        """
+        entry = files.unchanged(file_path, media_object_id)
+        if entry is not None:
+            files.add(file_path, media_object_id, entry['sha256'],
+                      entry['size'], 'unchanged')
+            return 'unchanged'
+        res = self.__download(file_path, media_object_id, store)
+        if res is None:
+            files.add_failed(file_path)
+            return 'failed'
+        status = 'downloaded' if res['downloaded'] else 'reused'
+        files.add(file_path, media_object_id, res['sha256'], res['size'],
+                  status)
+        return status
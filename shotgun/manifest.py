@@ -0,0 +1,133 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict
+
+MANIFEST = 'manifest.json'
+
+
+class manifest:
+    """manifest lists the files of an exported sequence revision with their
+    media object ID, size and sha256, in manifest.json at the root of the
+    revision. The manifest of the previous export of the revision tells
+    which files are already there: a file is unchanged when it still has
+    the media object ID, the size and the modification time it was
+    exported with
+    """
+
+    def __init__(self, seq_rev_path: str, info: Dict):
+        self.root = seq_rev_path
+        self.info = info
+        self.files = {}
+        self.failed = []
+        self.lock = threading.Lock()
+        self.previous = {}
+        try:
+            with open(os.path.join(seq_rev_path, MANIFEST)) as f:
+                for entry in json.load(f).get('files', []):
+                    self.previous[entry['path']] = entry
+        except (OSError, ValueError, KeyError, AttributeError):
+            # No previous export, or one that was interrupted
+            pass
+
+    def relative(self, file_path: str) -> str:
+        """relative will return the path of a file in the manifest
+
+        Arguments:
+            file_path {str} -- Path of the file
+
+        Returns:
+            str -- Path from the revision folder, with / separators
+        """
+        return os.path.relpath(os.path.normpath(file_path),
+                               self.root).replace(os.sep, '/')
+
+    def unchanged(self, file_path: str, media_object_id: int) -> Dict:
+        """unchanged will check a file against the previous manifest
+
+        Arguments:
+            file_path {str} -- Path of the file
+
+            media_object_id {int} -- Media Object ID of the file
+
+        Returns:
+            Dict -- Entry of the previous manifest, None if the file has
+            to be exported
+        """
+        entry = self.previous.get(self.relative(file_path))
+        if entry is None or entry.get('media_object_id') != media_object_id:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        if (st.st_size != entry.get('size') or
+                st.st_mtime_ns != entry.get('mtime_ns')):
+            return None
+        return entry
+
+    def add(self,
+            file_path: str,
+            media_object_id: int,
+            sha256: str,
+            size: int,
+            status: str):
+        """add will list an exported file
+
+        Arguments:
+            file_path {str} -- Path of the file
+
+            media_object_id {int} -- Media Object ID of the file
+
+            sha256 {str} -- sha256 of the file
+
+            size {int} -- Size of the file
+
+            status {str} -- downloaded, reused or unchanged
+        """
+        path = self.relative(file_path)
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        with self.lock:
+            self.files[path] = {'path': path,
+                                'media_object_id': media_object_id,
+                                'size': size,
+                                'sha256': sha256,
+                                'mtime_ns': mtime_ns,
+                                'status': status}
+
+    def add_failed(self, file_path: str):
+        """add_failed will list a file that could not be exported
+
+        Arguments:
+            file_path {str} -- Path of the file
+        """
+        with self.lock:
+            self.failed.append(self.relative(file_path))
+
+    def save(self) -> str:
+        """save will write the manifest, the files of the previous manifest
+        that are not exported anymore are listed as removed
+
+        Returns:
+            str -- Path of the manifest
+        """
+        with self.lock:
+            data = dict(self.info,
+                        created=time.strftime('%Y-%m-%dT%H:%M:%SZ',
+                                              time.gmtime()),
+                        files=list(self.files.values()),
+                        removed=sorted(set(self.previous) - set(self.files)),
+                        failed=list(self.failed))
+        path = os.path.join(self.root, MANIFEST)
+        # Written aside then renamed, readers never see half of it
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp, path)
+        return path
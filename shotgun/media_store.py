@@ -0,0 +1,227 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from typing import Callable, Dict
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl cloning a file on Linux filesystems with copy on write (btrfs, xfs)
+FICLONE = 0x40049409
+
+LINK_METHODS = ['reflink', 'hardlink', 'copy']
+
+# Errors of a filesystem or a platform without reflinks or hardlinks
+UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP,
+               errno.EINVAL, errno.ENOTTY}
+
+
+def reflink(src: str, dest: str):
+    """reflink will clone a file, the clone shares the blocks of the
+    file until one of them is modified
+
+    Arguments:
+        src {str} -- File to clone
+
+        dest {str} -- Path of the clone
+
+    Raises:
+        OSError: The filesystem or the platform cannot clone files
+    """
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, 'reflinks are not supported')
+    with open(src, 'rb') as s, open(dest, 'wb') as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+
+
+def hardlink(src: str, dest: str):
+    """hardlink will link a file
+
+    Arguments:
+        src {str} -- File to link
+
+        dest {str} -- Path of the link
+    """
+    os.link(src, dest)
+
+
+def copy(src: str, dest: str):
+    """copy will copy a file
+
+    Arguments:
+        src {str} -- File to copy
+
+        dest {str} -- Path of the copy
+    """
+    shutil.copyfile(src, dest)
+
+
+LINKERS = {
+    'reflink': reflink,
+    'hardlink': hardlink,
+    'copy': copy,
+}
+
+
+class media_store:
+    """media_store keeps every media object downloaded from Flix once, in
+    a folder shared by the exports. The files are stored by the sha256 of
+    their content, and found from the media object ID, media objects do
+    not change once uploaded to Flix. Files of the exports are reflinks of
+    the stored ones when the filesystem allows it, hardlinks otherwise,
+    copies as a last resort. The stored files are read only, as hardlinks
+    share them with the exports
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.methods = list(LINK_METHODS)
+        self.lock = threading.Lock()
+        for folder in ('objects', 'ids', 'tmp'):
+            os.makedirs(os.path.join(root, folder), exist_ok=True)
+
+    def object_path(self, digest: str) -> str:
+        """object_path will return the path of a stored file
+
+        Arguments:
+            digest {str} -- sha256 of the file
+
+        Returns:
+            str -- Path of the file
+        """
+        return os.path.join(self.root, 'objects', digest[:2], digest)
+
+    def lookup(self, media_object_id: int) -> str:
+        """lookup will find the sha256 of the stored file of a media object
+
+        Arguments:
+            media_object_id {int} -- Media Object ID
+
+        Returns:
+            str -- sha256 of the file, None if it is not stored
+        """
+        try:
+            with open(os.path.join(self.root, 'ids',
+                                   str(media_object_id))) as f:
+                digest = f.read().strip()
+        except OSError:
+            return None
+        if len(digest) < 2 or not os.path.isfile(self.object_path(digest)):
+            return None
+        return digest
+
+    def add(self, media_object_id: int, path: str, digest: str = None) -> str:
+        """add will move a downloaded file into the store, a file with the
+        same content is only stored once
+
+        Arguments:
+            media_object_id {int} -- Media Object ID
+
+            path {str} -- Downloaded file, in the tmp folder of the store
+
+            digest {str} -- sha256 of the file, computed if it is not given
+            (default: {None})
+
+        Returns:
+            str -- Path of the stored file
+        """
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+        obj = self.object_path(digest)
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        if os.path.isfile(obj):
+            os.remove(path)
+        else:
+            os.chmod(path, 0o444)
+            os.replace(path, obj)
+        # Written aside then renamed, a concurrent lookup never reads half
+        # of the digest
+        fd, id_path = tempfile.mkstemp(dir=os.path.join(self.root, 'tmp'))
+        with os.fdopen(fd, 'w') as f:
+            f.write(digest)
+        os.replace(id_path, os.path.join(self.root, 'ids',
+                                         str(media_object_id)))
+        return obj
+
+    def link(self, src: str, dest: str) -> str:
+        """link will put a stored file in an export, with the first method
+        the filesystem allows
+
+        Arguments:
+            src {str} -- Stored file
+
+            dest {str} -- Path in the export, replaced if it exists
+
+        Returns:
+            str -- Method used: reflink, hardlink or copy
+        """
+        tmp = '{0}.{1}.tmp'.format(dest, threading.get_ident())
+        for method in list(self.methods):
+            try:
+                LINKERS[method](src, tmp)
+            except OSError as err:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                if method == 'copy' or err.errno not in UNSUPPORTED:
+                    raise
+                # Do not try it again for the next files
+                with self.lock:
+                    if method in self.methods and len(self.methods) > 1:
+                        self.methods.remove(method)
+                continue
+            os.replace(tmp, dest)
+            return method
+
+    def fetch(self,
+              media_object_id: int,
+              dest: str,
+              fn_download: Callable[[str, int], Dict]) -> Dict:
+        """fetch will put a media object in an export, it is only
+        downloaded if it is not stored yet
+
+        Arguments:
+            media_object_id {int} -- Media Object ID
+
+            dest {str} -- Path in the export
+
+            fn_download {Callable[[str, int], Dict]} -- Function downloading
+            a media object to a path, returns its sha256 and size, None if
+            it failed
+
+        Returns:
+            Dict -- sha256, size, and downloaded or reused, None if the
+            download failed
+        """
+        digest = self.lookup(media_object_id)
+        downloaded = digest is None
+        if downloaded:
+            fd, tmp = tempfile.mkstemp(dir=os.path.join(self.root, 'tmp'))
+            os.close(fd)
+            stored = False
+            try:
+                res = fn_download(tmp, media_object_id)
+                if res is None:
+                    return None
+                digest = res['sha256']
+                self.add(media_object_id, tmp, digest)
+                stored = True
+            finally:
+                if not stored and os.path.exists(tmp):
+                    os.remove(tmp)
+        obj = self.object_path(digest)
+        self.link(obj, dest)
+        return {'sha256': digest, 'size': os.path.getsize(obj),
+                'downloaded': downloaded}
@@ -0,0 +1,196 @@
+#
+# Copyright (C) Foundry 2020
+#
+
+import json
+import sys
+import threading
+import time
+from typing import Callable
+
+
+class progress_canceled(Exception):
+    """progress_canceled is an exception for the progress cancelled
+    """
+    pass
+
+
+class progress:
+    """progress follows a long running operation and reports it to a sink.
+    Updates are merged: the sink is called at most every interval with the
+    latest step and message, and once when the last step is reached. It
+    keeps the throughput and the estimated time left from the steps done
+    so far
+    """
+
+    def __init__(self,
+                 fn_report: Callable[['progress'], None],
+                 steps: int = 0,
+                 interval: float = 0.1):
+        self.fn_report = fn_report
+        self.steps = steps
+        self.interval = interval
+        self.step = 0
+        self.message = ''
+        self.start = time.time()
+        self.last_report = 0.0
+        self.lock = threading.Lock()
+
+    def update(self, message: str, skip_step: bool = True):
+        """update will set the progress message, and go to the next step
+        when skip_step is False
+
+        Arguments:
+            message {str} -- Message to show in the progress
+
+            skip_step {bool} -- Will skip the step (default: {True})
+
+        Raises:
+            progress_canceled: The progress has been cancelled by the user
+        """
+        with self.lock:
+            if skip_step is False:
+                self.step += 1
+            self.message = message
+            now = time.time()
+            last = skip_step is False and 0 < self.steps <= self.step
+            if not last and now - self.last_report < self.interval:
+                return
+            self.last_report = now
+        self.fn_report(self)
+
+    def add_steps(self, steps: int):
+        """add_steps will add steps to do, once the size of the operation
+        is known
+
+        Arguments:
+            steps {int} -- Number of steps to add
+        """
+        with self.lock:
+            self.steps += steps
+
+    def elapsed(self) -> float:
+        """elapsed will return the time since the start
+
+        Returns:
+            float -- Seconds
+        """
+        return time.time() - self.start
+
+    def rate(self) -> float:
+        """rate will return the throughput of the operation
+
+        Returns:
+            float -- Steps done per second
+        """
+        return self.step / max(self.elapsed(), 1e-6)
+
+    def eta(self) -> float:
+        """eta will return the time left, from the throughput so far
+
+        Returns:
+            float -- Seconds, None if it is unknown
+        """
+        if self.step < 1 or self.steps <= self.step:
+            return None
+        return (self.steps - self.step) / self.rate()
+
+    def describe(self) -> str:
+        """describe will return the steps, throughput and time left
+
+        Returns:
+            str -- Progress summary
+        """
+        text = '{0}/{1} steps, {2:.1f}/s'.format(
+            self.step, self.steps, self.rate())
+        eta = self.eta()
+        if eta is not None:
+            text = '{0}, {1:.0f}s left'.format(text, eta)
+        return text
+
+
+class progress_dialog:
+    """progress_dialog is a progress sink showing a Qt progress dialog
+    with a Stop button
+    """
+
+    def __init__(self):
+        from PySide2.QtCore import QCoreApplication
+        from PySide2.QtWidgets import QProgressDialog
+        self.app = QCoreApplication
+        self.dialog = QProgressDialog('Operation in progress.', 'Stop', 0, 0)
+        self.dialog.setMinimumWidth(400)
+        self.dialog.setMinimumHeight(100)
+        self.dialog.show()
+
+    def __call__(self, p: progress):
+        """__call__ will repaint the dialog with the progress
+
+        Arguments:
+            p {progress} -- Progress to show
+
+        Raises:
+            progress_canceled: The progress has been cancelled by the user
+        """
+        self.dialog.setMaximum(max(p.steps, p.step))
+        self.dialog.setValue(p.step)
+        self.dialog.setLabelText('{0}\n{1}'.format(p.message, p.describe()))
+        self.dialog.repaint()
+        self.app.processEvents()
+        if self.dialog.wasCanceled():
+            raise progress_canceled
+
+    def close(self):
+        """close will close the dialog
+        """
+        self.dialog.close()
+
+
+class progress_stream:
+    """progress_stream is a progress sink printing the progress as text or
+    as one JSON object per line to be read by another process
+    """
+
+    def __init__(self, fmt: str = 'text', stream: object = sys.stdout):
+        self.fmt = fmt
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def emit(self, event: str, sequence: str, **kwargs):
+        """emit will print an event
+
+        Arguments:
+            event {str} -- Event name: progress, done or error
+
+            sequence {str} -- Sequence tracking code
+        """
+        with self.lock:
+            if self.fmt == 'json':
+                line = dict(kwargs, event=event, sequence=sequence,
+                            time=round(time.time(), 3))
+                self.stream.write(json.dumps(line, sort_keys=True) + '\n')
+            else:
+                message = kwargs.get('message', event)
+                if sequence is not None:
+                    message = '[{0}] {1}'.format(sequence, message)
+                self.stream.write(message + '\n')
+            self.stream.flush()
+
+    def for_sequence(self, sequence: str,
+                     interval: float = 0.1) -> Callable[[str, bool], None]:
+        """for_sequence will return a progress function for the handoff
+        of a sequence
+
+        Arguments:
+            sequence {str} -- Sequence tracking code
+
+            interval {float} -- Minimum time between two lines of the same
+            step (default: {0.1})
+
+        Returns:
+            Callable[[str, bool], None] -- Progress function
+        """
+        def fn_report(p: progress):
+            self.emit('progress', sequence, message=p.message, step=p.step,
+                      rate=round(p.rate(), 3))
+        return progress(fn_report, interval=interval).update
@@ -2,22 +2,77 @@
 # Copyright (C) Foundry 2020
 #
 
-from typing import Dict
+import time
+from typing import Dict, Tuple
 
-import shotgun_api3
+
+class entity_cache:
+    """entity_cache is a time to live cache of Shotgun entities, keyed by
+    entity type and tracking codes"""
+
+    def __init__(self, ttl: int = 600):
+        self.ttl = ttl
+        self.entities = {}
+
+    def get(self, key: Tuple) -> Dict:
+        """get will return a cached entity if it has not expired
+
+        Arguments:
+            key {Tuple} -- Entity type followed by its tracking codes
+
+        Returns:
+            Dict -- Entity from Shotgun
+        """
+        entry = self.entities.get(key)
+        if entry is None:
+            return None
+        expiry, entity = entry
+        if time.monotonic() > expiry:
+            del self.entities[key]
+            return None
+        return entity
+
+    def set(self, key: Tuple, entity: Dict) -> Dict:
+        """set will cache an entity, None is never cached
+
+        Arguments:
+            key {Tuple} -- Entity type followed by its tracking codes
+
+            entity {Dict} -- Entity from Shotgun
+
+        Returns:
+            Dict -- Entity from Shotgun
+        """
+        if entity is not None:
+            self.entities[key] = (time.monotonic() + self.ttl, entity)
+        return entity
+
+    def clear(self):
+        """clear will remove all the cached entities
+        """
+        self.entities = {}
 
 
 class shotgun:
     """shotgun will handle the login and expose functions to get, create
-    projects etc."""
+    projects etc.
+    The connection is kept for the lifetime of the object and resolved
+    projects, sequences, shots and versions are cached"""
 
-    def __init__(self, hostname: str, login: str, password: str):
+    def __init__(self, hostname: str, login: str, password: str,
+                 cache_ttl: int = 600, sg: object = None):
         self.hostname = hostname
         self.login = login
         self.password = password
-        self.sg = shotgun_api3.Shotgun(self.hostname,
-                                       login=self.login,
-                                       password=self.password)
+        self.cache = entity_cache(cache_ttl)
+        # sg can be given to use another implementation of the Shotgun API
+        if sg is None:
+            # Only imported once a Shotgun export starts
+            import shotgun_api3
+            sg = shotgun_api3.Shotgun(self.hostname,
+                                      login=self.login,
+                                      password=self.password)
+        self.sg = sg
 
     def get_project(self, project_name: str) -> Dict:
         """get_project will try to retrieve a project by name.
@@ -28,11 +83,15 @@ class shotgun:
         Returns:
             Dict -- Project from Shotgun
         """
+        key = ('Project', project_name)
+        project = self.cache.get(key)
+        if project is not None:
+            return project
         project = self.sg.find_one('Project',
                                    [['name', 'is', project_name]],
                                    ['id', 'name'])
         if project:
-            return project
+            return self.cache.set(key, project)
         print('Could not find {0} Project in SG'.format(project_name))
         return None
 
@@ -48,7 +107,8 @@ class shotgun:
         data = {
             'name': project_name,
         }
-        return self.sg.create('Project', data)
+        return self.cache.set(('Project', project_name),
+                              self.sg.create('Project', data))
 
     def get_sequence(self, project: Dict, seq_name: str) -> Dict:
         """get_sequence will retrieve a sequence.
@@ -61,11 +121,15 @@ class shotgun:
         Returns:
             Dict -- Sequence from Shotgun
         """
+        key = ('Sequence', project['id'], seq_name)
+        sgSeq = self.cache.get(key)
+        if sgSeq is not None:
+            return sgSeq
         sFilters = [['project', 'is', project], ['code', 'is', seq_name]]
         sFields = ['id', 'code']
         sgSeq = self.sg.find_one('Sequence', sFilters, sFields)
         if sgSeq:
-            return sgSeq
+            return self.cache.set(key, sgSeq)
         else:
             print('Could not find {0} Sequence in SG'.format(seq_name))
         return None
@@ -86,7 +150,8 @@ class shotgun:
             'code': seq_name,
             'sg_status_list': "ip"
         }
-        return self.sg.create('Sequence', data)
+        return self.cache.set(('Sequence', project['id'], seq_name),
+                              self.sg.create('Sequence', data))
 
     def get_shot(self, project: Dict, seq: Dict, shot_name: str) -> Dict:
         """get_shot will retrieve a shot from Shotgun.
@@ -101,6 +166,10 @@ class shotgun:
         Returns:
             Dict -- Shot from Shotgun
         """
+        key = ('Shot', project['id'], seq['id'], shot_name)
+        sgSeq = self.cache.get(key)
+        if sgSeq is not None:
+            return sgSeq
         sFilters = [
             ['project', 'is', project],
             ['sg_sequence', 'is', seq],
@@ -109,7 +178,7 @@ class shotgun:
         sFields = ['id', 'code']
         sgSeq = self.sg.find_one('Shot', sFilters, sFields)
         if sgSeq:
-            return sgSeq
+            return self.cache.set(key, sgSeq)
         print('Could not find {0} Shot in SG'.format(shot_name))
         return None
 
@@ -132,7 +201,8 @@ class shotgun:
             'sg_sequence': {'type': 'Sequence', 'id': seq['id']},
             'sg_status_list': 'ip'
         }
-        return self.sg.create('Shot', data)
+        return self.cache.set(('Shot', project['id'], seq['id'], shot_name),
+                              self.sg.create('Shot', data))
 
     def get_version(self, project: Dict, shot: Dict) -> Dict:
         """get_version will retrieve a version.
@@ -145,13 +215,17 @@ class shotgun:
         Returns:
             Dict -- Version from Shotgun
         """
+        key = ('Version', project['id'], shot['id'])
+        sgSeq = self.cache.get(key)
+        if sgSeq is not None:
+            return sgSeq
         sFilters = [
             ['project', 'is', project],
             ['entity', 'is', {'type': 'Shot', 'id': shot['id']}]]
         sFields = ['id', 'code']
         sgSeq = self.sg.find_one('Version', sFilters, sFields)
         if sgSeq:
-            return sgSeq
+            return self.cache.set(key, sgSeq)
         print('Could not find {0} Version in SG'.format(shot['code']))
         return None
 
@@ -174,7 +248,8 @@ class shotgun:
                 'sg_status_list': 'rev',
                 'entity': {'type': 'Shot', 'id': shot['id']}
                 }
-        return self.sg.create('Version', data)
+        return self.cache.set(('Version', project['id'], shot['id']),
+                              self.sg.create('Version', data))
 
     def upload_movie(self, version: Dict, movie_path: str) -> Dict:
         """upload_movie will upload a movie to Shotgun.
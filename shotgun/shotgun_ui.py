@@ -3,21 +3,16 @@
 #
 
 import os
-import re
 import sys
-import tempfile
-import time
-from collections import OrderedDict
 from typing import Callable, Dict, List, Tuple
 
-from PySide2.QtCore import QCoreApplication, QSize, Qt, Signal
-from PySide2.QtGui import QPixmap
+from PySide2.QtCore import Signal
 from PySide2.QtWidgets import (QApplication, QComboBox, QDialog, QErrorMessage,
                                QFileDialog, QHBoxLayout, QInputDialog, QLabel,
-                               QLineEdit, QMessageBox, QProgressDialog,
-                               QPushButton, QSizePolicy, QVBoxLayout, QWidget)
+                               QLineEdit, QMessageBox, QPushButton, QSizePolicy,
+                               QVBoxLayout, QWidget)
 
-import flix_ui as flix_widget
+import handoff
 import shotgun as shotgun_api
 
 
@@ -26,6 +21,7 @@ class shotgun_ui(QWidget):
     e_local_export = Signal()
     e_shotgun_export = Signal(str)
     export_path = None
+    shotgun = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -95,61 +91,6 @@ class shotgun_ui(QWidget):
         """
         return self.shotgun
 
-    def create_folders(
-            self,
-            show_tc: str,
-            seq_tc: str,
-            seq_rev_nbr: int,
-            episode_tc: str = None) -> str:
-        """create_folders will create the structure of folders from
-        shows to sequence revision
-
-        Arguments:
-            show_tc {str} -- Show tracking code
-
-            seq_tc {str} -- Sequence tracking code
-
-            seq_rev_nbr {int} -- Sequence revision number
-
-            episode_tc {str} -- Episode tracking code (default: {None})
-
-        Returns:
-            str -- Sequence revision path
-        """
-        show_path = os.path.join(self.export_path.text(), show_tc)
-        self.__create_folder(show_path)
-        sequence_path = os.path.join(show_path, seq_tc)
-        if episode_tc is not None:
-            episode_path = os.path.join(show_path, episode_tc)
-            self.__create_folder(episode_path)
-            sequence_path = os.path.join(episode_path, seq_tc)
-        self.__create_folder(sequence_path)
-        sequence_revision_path = os.path.join(
-            sequence_path, 'v{0}'.format(seq_rev_nbr))
-        self.__create_folder(sequence_revision_path)
-        return sequence_revision_path
-
-    def get_shot_download_paths(
-            self, export_path: str, shot: str) -> Tuple[str, str, str]:
-        """get_shot_download_paths will create folders for show, artwork and thumbnails
-        and return those paths
-
-        Arguments:
-            export_path {str} -- Base export path
-
-            shot {str} -- Shot name
-
-        Returns:
-            Tuple[str, str, str] -- show_path, artwork_path, thumb_path
-        """
-        show_folder_path = os.path.join(export_path, shot)
-        self.__create_folder(show_folder_path)
-        artwork_folder_path = os.path.join(show_folder_path, 'artwork')
-        self.__create_folder(artwork_folder_path)
-        thumb_folder_path = os.path.join(show_folder_path, 'thumbnail')
-        self.__create_folder(thumb_folder_path)
-        return show_folder_path, artwork_folder_path, thumb_folder_path
-
     def export_to_version(
             self,
             shots: List,
@@ -176,37 +117,8 @@ class shotgun_ui(QWidget):
         Returns:
             Dict -- Mapping of shot to quicktime info with his corresponding shotgun version
         """
-        fn_progress('get or create shotgun project')
-        sg_show = self.shotgun.get_project(show_tc)
-        if sg_show is None:
-            sg_show = self.shotgun.create_project(show_tc)
-        fn_progress('get or create shotgun sequence')
-        sg_seq = self.shotgun.get_sequence(sg_show, seq_tc)
-        if sg_seq is None:
-            sg_seq = self.shotgun.create_seq(sg_show, seq_tc)
-
-        shot_to_file = {}
-        for shot_name in shots:
-            fn_progress(
-                'get or create shotgun shot for shot {0}'.format(shot_name))
-            sg_shot = self.shotgun.get_shot(sg_show, sg_seq, shot_name)
-            if sg_shot is None:
-                sg_shot = self.shotgun.create_shot(sg_show, sg_seq, shot_name)
-            fn_progress(
-                'get or create shotgun version for shot {0}'.format(shot_name))
-            version = self.shotgun.get_version(sg_show, sg_shot)
-            if version is None:
-                new_version = 1
-            else:
-                ver = re.search('(.*)v([0-9]+)', version['code'])
-                new_version = int(ver.group(2)) + 1
-            version = self.shotgun.create_version(
-                sg_show, sg_shot, new_version)
-            mov_name = '{0}_v{1}_{2}.mov'.format(
-                seq_tc, seq_rev_nbr, shot_name)
-            shot_to_file[shot_name] = {
-                'mov_name': mov_name, 'version': version}
-        return shot_to_file
+        return handoff.handoff(None, self.shotgun).export_to_version(
+            shots, show_tc, seq_rev_nbr, seq_tc, fn_progress)
 
     def init_local_export(self) -> bool:
         """init_local_export will initialise the export
@@ -223,7 +135,8 @@ class shotgun_ui(QWidget):
         return True
 
     def init_shotgun_export(self) -> bool:
-        """init_shotgun_export will init the shotgun export
+        """init_shotgun_export will init the shotgun export, the shotgun
+        connection is reused as long as the hostname and login do not change
 
         Returns:
             bool -- Can login to shotgun
@@ -231,6 +144,10 @@ class shotgun_ui(QWidget):
         if self.sg_login.text() == '' or self.sg_hostname.text() == '':
             self.__info('You need to enter your shotgun info')
             return '', False
+        if (self.shotgun is not None and
+                self.shotgun.hostname == self.sg_hostname.text() and
+                self.shotgun.login == self.sg_login.text()):
+            return self.shotgun.password, True
         sg_password, ok = QInputDialog().getText(self,
                                                  'Shotgun password',
                                                  'Shotgun password:',
@@ -358,15 +275,6 @@ class shotgun_ui(QWidget):
             self.export_path_button.hide()
         self.selected_handoff_type = handoff_type
 
-    def __create_folder(self, path: str):
-        """__create_folder will create a folder if it does not exist
-
-        Arguments:
-            path {str} -- Path to create the folder
-        """
-        if not os.path.exists(path):
-            os.makedirs(path)
-
 
 class main_dialogue(QDialog):
     def __init__(self, parent=None):